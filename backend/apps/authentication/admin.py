@@ -4,7 +4,7 @@ Admin interface for authentication models.
 
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import AdminUser
+from .models import AdminUser, PartnerAPIKey
 
 
 @admin.register(AdminUser)
@@ -25,3 +25,22 @@ class AdminUserAdmin(UserAdmin):
     add_fieldsets = UserAdmin.add_fieldsets + (
         ('ShieldHer Info', {'fields': ('role',)}),
     )
+
+
+
+@admin.register(PartnerAPIKey)
+class PartnerAPIKeyAdmin(admin.ModelAdmin):
+    """
+    Admin interface for partner API keys.
+    Keys are created with: python manage.py create_partner_key <name>
+    Here they can only be renamed or revoked (untick is_active).
+    """
+    list_display = ['name', 'prefix', 'is_active', 'last_used_at', 'created_at']
+    list_filter = ['is_active']
+    search_fields = ['name', 'prefix']
+    readonly_fields = ['prefix', 'last_used_at', 'created_at', 'updated_at']
+    fields = ['name', 'is_active', 'prefix', 'last_used_at', 'created_at', 'updated_at']
+    
+    def has_add_permission(self, request):
+        # The plaintext key must be shown once, so keys come from the command
+        return False
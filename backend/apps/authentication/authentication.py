@@ -0,0 +1,40 @@
+"""
+API key authentication for partner intake kiosks.
+"""
+
+from rest_framework import authentication, exceptions
+from .models import PartnerAPIKey
+
+
+class PartnerAPIKeyAuthentication(authentication.BaseAuthentication):
+    """
+    Authenticate partner requests with an API key header:
+        
+        Authorization: Api-Key <key>
+    
+    The matched PartnerAPIKey is both request.user and request.auth.
+    """
+    keyword = 'Api-Key'
+    
+    def authenticate(self, request):
+        header = authentication.get_authorization_header(request).split()
+        if not header or header[0].lower() != self.keyword.lower().encode():
+            return None
+        
+        if len(header) != 2:
+            raise exceptions.AuthenticationFailed('Invalid API key header.')
+        
+        try:
+            key = header[1].decode('ascii')
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed('Invalid API key.')
+        
+        api_key = PartnerAPIKey.get_for_key(key)
+        if api_key is None:
+            raise exceptions.AuthenticationFailed('Invalid API key.')
+        
+        api_key.touch()
+        return api_key, api_key
+    
+    def authenticate_header(self, request):
+        return self.keyword
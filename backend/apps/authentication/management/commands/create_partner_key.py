@@ -0,0 +1,25 @@
+"""
+Create an API key for a partner intake kiosk.
+
+Usage:
+    python manage.py create_partner_key "Women's Desk - Quezon City"
+
+The key is printed once and cannot be recovered; revoke it in the admin
+and create a new one if it is lost.
+"""
+
+from django.core.management.base import BaseCommand
+from apps.authentication.models import PartnerAPIKey
+
+
+class Command(BaseCommand):
+    help = 'Create a partner API key for bulk report intake'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('name', help='Partner organisation or kiosk name')
+    
+    def handle(self, *args, **options):
+        api_key, key = PartnerAPIKey.generate(options['name'])
+        self.stdout.write(self.style.SUCCESS(f"Created API key for {api_key.name}"))
+        self.stdout.write(key)
+        self.stdout.write("Store this key now; it will not be shown again.")
@@ -0,0 +1,83 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("authentication", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PartnerAPIKey",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, help_text="Timestamp when record was created"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="Timestamp when record was last updated",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Partner organisation or kiosk name", max_length=100
+                    ),
+                ),
+                (
+                    "prefix",
+                    models.CharField(
+                        editable=False,
+                        help_text="Public key prefix",
+                        max_length=16,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "key_hash",
+                    models.CharField(
+                        editable=False,
+                        help_text="SHA-256 hash of the key",
+                        max_length=64,
+                    ),
+                ),
+                (
+                    "is_active",
+                    models.BooleanField(
+                        default=True, help_text="Whether the key is accepted"
+                    ),
+                ),
+                (
+                    "last_used_at",
+                    models.DateTimeField(
+                        blank=True,
+                        editable=False,
+                        help_text="When the key was last used",
+                        null=True,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Partner API Key",
+                "verbose_name_plural": "Partner API Keys",
+                "db_table": "partner_api_keys",
+                "ordering": ["name"],
+            },
+        ),
+    ]
@@ -2,8 +2,14 @@
 Authentication models for ShieldHer platform.
 """
 
+import hashlib
+import hmac
+import secrets
+from datetime import timedelta
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
+from apps.core.models import TimeStampedModel
 
 
 class AdminUser(AbstractUser):
@@ -42,3 +48,111 @@ class AdminUser(AbstractUser):
     def is_moderator(self):
         """Check if user is a moderator"""
         return self.role == 'moderator'
+
+
+class PartnerAPIKey(TimeStampedModel):
+    """
+    API key for a partner organisation's intake kiosk.
+    Partners submit reports in bulk; they never see or list reports.
+    
+    Only a SHA-256 hash of the key is stored. Keys are long random
+    strings, so a fast hash is enough; the plaintext is shown once,
+    when the key is created.
+    
+    A key doubles as the authenticated principal for partner requests
+    (request.user), so throttles can tell partners from anonymous users.
+    
+    Fields:
+        name: Partner organisation or kiosk name
+        prefix: Public part of the key, used to look it up
+        key_hash: SHA-256 hex digest of the full key
+        is_active: Revoked keys are kept for the record but rejected
+        last_used_at: When the key last authenticated a request
+    """
+    # How often last_used_at is written; avoids a write per request
+    LAST_USED_RESOLUTION = timedelta(minutes=1)
+    
+    name = models.CharField(
+        max_length=100,
+        help_text="Partner organisation or kiosk name"
+    )
+    prefix = models.CharField(
+        max_length=16,
+        unique=True,
+        editable=False,
+        help_text="Public key prefix"
+    )
+    key_hash = models.CharField(
+        max_length=64,
+        editable=False,
+        help_text="SHA-256 hash of the key"
+    )
+    is_active = models.BooleanField(
+        default=True,
+        help_text="Whether the key is accepted"
+    )
+    last_used_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="When the key was last used"
+    )
+    
+    # Lets DRF permissions and throttles treat a key as a principal
+    is_authenticated = True
+    is_partner = True
+    
+    class Meta:
+        verbose_name = "Partner API Key"
+        verbose_name_plural = "Partner API Keys"
+        db_table = "partner_api_keys"
+        ordering = ['name']
+    
+    def __str__(self):
+        return f"{self.name} ({self.prefix})"
+    
+    @staticmethod
+    def hash_key(key):
+        """Get the stored hash for a plaintext key."""
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+    
+    @classmethod
+    def generate(cls, name):
+        """
+        Create a new key for a partner.
+        
+        Args:
+            name (str): Partner organisation or kiosk name
+            
+        Returns:
+            tuple: (PartnerAPIKey, plaintext key) - the plaintext is not
+                stored anywhere and cannot be recovered later
+        """
+        prefix = secrets.token_hex(4)
+        key = f"{prefix}.{secrets.token_urlsafe(32)}"
+        api_key = cls.objects.create(name=name, prefix=prefix, key_hash=cls.hash_key(key))
+        return api_key, key
+    
+    @classmethod
+    def get_for_key(cls, key):
+        """
+        Look up the active key matching a plaintext key.
+        
+        Returns:
+            PartnerAPIKey or None
+        """
+        prefix, sep, _ = key.partition('.')
+        if not sep or not prefix:
+            return None
+        api_key = cls.objects.filter(prefix=prefix, is_active=True).first()
+        if api_key is None or not hmac.compare_digest(api_key.key_hash, cls.hash_key(key)):
+            return None
+        return api_key
+    
+    def touch(self):
+        """Record use of the key, at most once per LAST_USED_RESOLUTION."""
+        now = timezone.now()
+        if self.last_used_at and now - self.last_used_at < self.LAST_USED_RESOLUTION:
+            return
+        self.last_used_at = now
+        type(self).objects.filter(pk=self.pk).update(last_used_at=now)
@@ -3,11 +3,12 @@ Admin interface for core models.
 """
 
 from django.contrib import admin
+from .admin_mixins import LargeTableAdminMixin
 from .models import AuditLog
 
 
 @admin.register(AuditLog)
-class AuditLogAdmin(admin.ModelAdmin):
+class AuditLogAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """
     Admin interface for audit logs.
     Read-only to preserve audit trail integrity.
@@ -17,6 +18,8 @@ class AuditLogAdmin(admin.ModelAdmin):
     search_fields = ['admin_user__username', 'resource_type', 'resource_id']
     readonly_fields = ['created_at', 'updated_at', 'admin_user', 'action', 'resource_type', 'resource_id', 'details', 'success']
     date_hierarchy = 'created_at'
+    list_select_related = ['admin_user']
+    list_defer = ['details']
     
     def has_add_permission(self, request):
         """Audit logs cannot be manually created"""
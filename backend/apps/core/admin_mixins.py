@@ -0,0 +1,237 @@
+"""
+Admin changelists that stay fast on very large tables.
+
+A stock ModelAdmin changelist runs a COUNT(*) of the filtered rows and
+another of the whole table, pages with OFFSET, scans for the distinct
+dates of its date_hierarchy and fetches every column of every row.
+LargeTableAdminMixin replaces each of these:
+
+  * Counts are estimates on PostgreSQL - pg_class statistics for the
+    whole table, the planner's estimate when filtered - and exact below
+    EstimatedCountPaginator.exact_count_threshold rows.
+  * The default ordering pages by keyset on (keyset_field, pk), with
+    Newer/Older links, so deep pages cost the same as the first. Sorting
+    by a column falls back to numbered pages.
+  * The date hierarchy links come from the calendar between the first
+    and last dates (two index lookups), not from the dates in the table.
+  * Columns in list_defer (e.g. encrypted blobs) are not fetched for
+    list rows.
+
+Usage:
+    @admin.register(AuditLog)
+    class AuditLogAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+        list_defer = ['details']
+"""
+
+import calendar
+import datetime
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.core.paginator import Paginator
+from django.db import connections, models
+from django.utils import formats, timezone
+from django.utils.functional import cached_property
+from django.utils.text import capfirst
+from django.utils.translation import gettext as _
+from .pagination import (
+    decode_keyset_cursor, encode_keyset_cursor, estimate_count, estimate_table_rows, keyset_page
+)
+
+CURSOR_VAR = 'cursor'
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator whose count is an estimate on large PostgreSQL tables.
+    """
+    # Below this many estimated rows, an exact COUNT(*) is cheap enough
+    exact_count_threshold = 10000
+    
+    is_estimate = False
+    
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        estimate = None
+        if not queryset.query.where:
+            estimate = estimate_table_rows(queryset.model, queryset.db)
+        elif connections[queryset.db].vendor == 'postgresql':
+            estimate = estimate_count(queryset)
+        
+        if estimate is None or estimate < self.exact_count_threshold:
+            return queryset.count()
+        self.is_estimate = True
+        return estimate
+
+
+class LargeTableChangeList(ChangeList):
+    """
+    ChangeList with keyset paging, deferred columns and a date hierarchy
+    that does not scan the table. See LargeTableAdminMixin.
+    """
+    
+    def __init__(self, request, *args, **kwargs):
+        # Read before ChangeList.__init__, which fetches the results
+        self.cursor = request.GET.get(CURSOR_VAR)
+        self.keyset = False
+        self.result_count_is_estimate = False
+        self.newer_url = self.older_url = None
+        super().__init__(request, *args, **kwargs)
+    
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+    
+    def get_query_string(self, new_params=None, remove=None):
+        # A cursor points into one listing; links to another start at its top
+        if not new_params or CURSOR_VAR not in new_params:
+            remove = [*(remove or []), CURSOR_VAR]
+        return super().get_query_string(new_params, remove)
+    
+    def get_queryset(self, request, *args, **kwargs):
+        queryset = super().get_queryset(request, *args, **kwargs)
+        if self.model_admin.list_defer:
+            queryset = queryset.defer(*self.model_admin.list_defer)
+        return queryset
+    
+    def get_results(self, request):
+        field = self.model_admin.keyset_field
+        self.keyset = bool(field) and ORDER_VAR not in self.params and not self.show_all
+        if not self.keyset:
+            super().get_results(request)
+            self.result_count_is_estimate = self.paginator.is_estimate
+            return
+        
+        try:
+            cursor = decode_keyset_cursor(self.cursor) if self.cursor else None
+        except ValueError:
+            raise IncorrectLookupParameters
+        
+        reverse = cursor is not None and cursor[2]
+        rows, has_more = keyset_page(self.queryset, field, cursor, self.list_per_page)
+        
+        paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+        self.result_count = paginator.count
+        self.result_count_is_estimate = paginator.is_estimate
+        self.show_full_result_count = self.model_admin.show_full_result_count
+        self.full_result_count = self.root_queryset.count() if self.show_full_result_count else None
+        self.show_admin_actions = not self.show_full_result_count or bool(self.full_result_count)
+        self.result_list = rows
+        self.can_show_all = False
+        self.multi_page = has_more or cursor is not None
+        self.paginator = paginator
+        
+        if rows and (has_more if reverse else cursor is not None):
+            first = rows[0]
+            self.newer_url = self.get_query_string({
+                CURSOR_VAR: encode_keyset_cursor(getattr(first, field), first.pk, True)
+            })
+        if rows and (cursor is not None if reverse else has_more):
+            last = rows[-1]
+            self.older_url = self.get_query_string({
+                CURSOR_VAR: encode_keyset_cursor(getattr(last, field), last.pk, False)
+            })
+    
+    def lazy_date_hierarchy(self):
+        """
+        Build the date hierarchy links, in the shape the admin's
+        date_hierarchy.html expects.
+        
+        Years run from the first to the last date in the table, months
+        and days are every month of the year and day of the month (up to
+        today), so some links may lead to empty pages. Only the first and
+        last dates are queried.
+        """
+        field_name = self.date_hierarchy
+        year_field = f'{field_name}__year'
+        month_field = f'{field_name}__month'
+        day_field = f'{field_name}__day'
+        year = self.params.get(year_field)
+        month = self.params.get(month_field)
+        day = self.params.get(day_field)
+        
+        def link(filters):
+            return self.get_query_string(filters, [f'{field_name}__'])
+        
+        if not (year or month or day):
+            date_range = self.root_queryset.aggregate(
+                first=models.Min(field_name), last=models.Max(field_name)
+            )
+            first, last = date_range['first'], date_range['last']
+            if first is None:
+                return {'show': False}
+            if isinstance(first, datetime.datetime) and timezone.is_aware(first):
+                first, last = timezone.localtime(first), timezone.localtime(last)
+            if first.year != last.year:
+                return {
+                    'show': True,
+                    'choices': [
+                        {'link': link({year_field: str(each)}), 'title': str(each)}
+                        for each in range(first.year, last.year + 1)
+                    ],
+                }
+            year = first.year
+            if first.month == last.month:
+                month = first.month
+        
+        year = int(year)
+        today = timezone.localdate()
+        if month and day:
+            date = datetime.date(year, int(month), int(day))
+            return {
+                'show': True,
+                'back': {
+                    'link': link({year_field: str(year), month_field: str(date.month)}),
+                    'title': capfirst(formats.date_format(date, 'YEAR_MONTH_FORMAT')),
+                },
+                'choices': [{'title': capfirst(formats.date_format(date, 'MONTH_DAY_FORMAT'))}],
+            }
+        if month:
+            month = int(month)
+            days = calendar.monthrange(year, month)[1]
+            if (year, month) == (today.year, today.month):
+                days = today.day
+            return {
+                'show': True,
+                'back': {'link': link({year_field: str(year)}), 'title': str(year)},
+                'choices': [
+                    {
+                        'link': link({year_field: str(year), month_field: str(month), day_field: str(each)}),
+                        'title': capfirst(formats.date_format(datetime.date(year, month, each), 'MONTH_DAY_FORMAT')),
+                    }
+                    for each in range(1, days + 1)
+                ],
+            }
+        months = today.month if year == today.year else 12
+        return {
+            'show': True,
+            'back': {'link': link({}), 'title': _('All dates')},
+            'choices': [
+                {
+                    'link': link({year_field: str(year), month_field: str(each)}),
+                    'title': capfirst(formats.date_format(datetime.date(year, each, 1), 'YEAR_MONTH_FORMAT')),
+                }
+                for each in range(1, months + 1)
+            ],
+        }
+
+
+class LargeTableAdminMixin:
+    """
+    ModelAdmin mixin for tables with millions of rows.
+    
+    Attributes:
+        keyset_field: DateTimeField the default listing pages by, newest
+            first (None for numbered pages)
+        list_defer: Fields not fetched for list rows; list_display must
+            not use them
+    """
+    keyset_field = 'created_at'
+    list_defer = ()
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    change_list_template = 'admin/large_table_change_list.html'
+    
+    def get_changelist(self, request, **kwargs):
+        return LargeTableChangeList
@@ -1,7 +1,33 @@
 from django.apps import AppConfig
 
 
+def _create_cache_tables(using='default', verbosity=1, **kwargs):
+    """Create the DatabaseCache tables in CACHES, if they are missing."""
+    from django.core.management import call_command
+    call_command('createcachetable', database=using, verbosity=verbosity)
+
+
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
     verbose_name = 'Core'
+
+    def ready(self):
+        # Build the encryption key ring once at startup so a malformed
+        # ENCRYPTION_KEY fails fast instead of on the first report.
+        # A missing key is still allowed here so build steps such as
+        # collectstatic can run without secrets.
+        from django.conf import settings
+        from .utils import get_key_ring
+        if settings.ENCRYPTION_KEY:
+            get_key_ring()
+
+        # Write buffered audit log entries that are due after each request
+        from django.core.signals import request_finished
+        from .audit import flush_due_audit_entries
+        request_finished.connect(flush_due_audit_entries, dispatch_uid='core:flush_audit_log')
+
+        # Create the cache table whenever migrate runs, so no deployment
+        # needs a separate createcachetable step
+        from django.db.models.signals import post_migrate
+        post_migrate.connect(_create_cache_tables, sender=self, dispatch_uid='core:create_cache_tables')
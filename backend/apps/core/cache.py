@@ -0,0 +1,139 @@
+"""
+Cached aggregate statistics for the admin dashboard.
+
+Each StatsCache stores one computed value under a versioned key. Saving
+or deleting a watched model bumps the version once the transaction
+commits, so the next read recomputes; a short TTL bounds staleness if an
+invalidation is ever missed (e.g. a queryset.update()).
+
+Concurrent misses are coalesced: within a process, threads wait on a
+lock while one of them recomputes, and across processes a short-lived
+cache lock lets one process recompute while the others poll for its
+result. A burst of dashboard loads therefore runs the query once.
+
+Versions, values and locks live in the default cache, which settings
+configure as shared by all processes (DatabaseCache, or Redis with
+REDIS_URL). A save in the queue worker therefore invalidates the stats
+every web worker reads. With a per-process cache such as LocMemCache,
+invalidation and the lock only reach the process that saved.
+"""
+
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+
+class StatsCache:
+    """
+    Versioned, coalescing cache for one set of dashboard statistics.
+    
+    Args:
+        name (str): Key namespace, e.g. 'reports'
+        ttl (int): Seconds a computed value is kept (defaults to
+            settings.STATS_CACHE_TTL)
+        lock_timeout (int): Seconds a process may hold the recompute lock
+    """
+    
+    # How often a waiting process checks for another process's result
+    POLL_INTERVAL = 0.05
+    
+    def __init__(self, name, ttl=None, lock_timeout=10):
+        self.name = name
+        self._ttl = ttl
+        self.lock_timeout = lock_timeout
+        self._local_lock = threading.Lock()
+    
+    @property
+    def ttl(self):
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, 'STATS_CACHE_TTL', 60)
+    
+    @property
+    def version_key(self):
+        return f'stats:{self.name}:version'
+    
+    def get_version(self):
+        """Get the current version, starting at 1."""
+        cache.add(self.version_key, 1, timeout=None)
+        return cache.get(self.version_key, 1)
+    
+    def invalidate(self):
+        """Bump the version so the next read recomputes."""
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            # Key was evicted; any new version differs from cached values
+            cache.set(self.version_key, int(time.time()), timeout=None)
+    
+    def invalidate_on_commit(self, **kwargs):
+        """
+        Signal receiver: invalidate once the current transaction commits,
+        so a concurrent recompute can't cache pre-commit data under the
+        new version.
+        """
+        transaction.on_commit(self.invalidate)
+    
+    def watch(self, *models):
+        """Invalidate when any of these models is saved or deleted."""
+        for model in models:
+            post_save.connect(
+                self.invalidate_on_commit,
+                sender=model,
+                dispatch_uid=f'stats_cache:{self.name}:save:{model._meta.label}'
+            )
+            post_delete.connect(
+                self.invalidate_on_commit,
+                sender=model,
+                dispatch_uid=f'stats_cache:{self.name}:delete:{model._meta.label}'
+            )
+    
+    def get_or_compute(self, compute):
+        """
+        Get the cached value, computing it at most once per version.
+        
+        Args:
+            compute (callable): Returns the value to cache
+        
+        Returns:
+            The cached or freshly computed value
+        """
+        key = f'stats:{self.name}:v{self.get_version()}'
+        value = cache.get(key)
+        if value is not None:
+            return value
+        
+        with self._local_lock:
+            # Another thread may have filled it while we waited
+            value = cache.get(key)
+            if value is not None:
+                return value
+            return self._compute_once(key, compute)
+    
+    def _compute_once(self, key, compute):
+        """Compute under a cross-process lock, or wait for the holder."""
+        lock_key = f'{key}:lock'
+        if not cache.add(lock_key, 1, timeout=self.lock_timeout):
+            deadline = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                time.sleep(self.POLL_INTERVAL)
+                value = cache.get(key)
+                if value is not None:
+                    return value
+                if cache.add(lock_key, 1, timeout=self.lock_timeout):
+                    break
+            else:
+                # Holder died or is slow; compute without the lock
+                return self._store(key, compute())
+        
+        try:
+            return self._store(key, compute())
+        finally:
+            cache.delete(lock_key)
+    
+    def _store(self, key, value):
+        cache.set(key, value, timeout=self.ttl)
+        return value
@@ -0,0 +1,185 @@
+"""
+Collision-free confirmation codes.
+
+Codes keep the PREFIX-YEAR-XXXXXX format (six uppercase hex digits), but
+the digits are no longer random - random codes start colliding long
+before a prefix's 16.7M codes per year run out. Instead:
+
+  * Each prefix and year has a counter row (CodeSequence). A worker
+    reserves a block of counter values in one short transaction and
+    hands them out from memory.
+  * Each counter value is mapped through a keyed Feistel network on 24
+    bits. A Feistel network is a permutation, so distinct counter values
+    always give distinct codes, and without the key (derived from
+    SECRET_KEY) consecutive codes look unrelated and cannot be guessed.
+
+So inserts never need a collision retry. Codes already in use - from the
+old random generator, or from before a SECRET_KEY change - are skipped
+when a block is reserved, with one query per block.
+"""
+
+import hashlib
+import hmac
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+CODE_BITS = 24
+CODE_SPACE = 1 << CODE_BITS
+FEISTEL_ROUNDS = 8
+
+_HALF_BITS = CODE_BITS // 2
+_HALF_MASK = (1 << _HALF_BITS) - 1
+
+
+class CodeSpaceExhausted(Exception):
+    """Every code for a prefix and year has been handed out."""
+
+
+def feistel_permute(value, key, rounds=FEISTEL_ROUNDS):
+    """
+    Map a 24-bit value to another, one to one, under a key.
+    
+    Args:
+        value (int): 0 <= value < CODE_SPACE
+        key (bytes): Permutation key (at most 64 bytes)
+        rounds (int): Feistel rounds
+    
+    Returns:
+        int: Permuted value, 0 <= result < CODE_SPACE
+    """
+    left, right = value >> _HALF_BITS, value & _HALF_MASK
+    for round_number in range(rounds):
+        digest = hashlib.blake2b(
+            bytes([round_number]) + right.to_bytes(2, 'big'),
+            key=key,
+            digest_size=2
+        ).digest()
+        left, right = right, left ^ (int.from_bytes(digest, 'big') & _HALF_MASK)
+    return (left << _HALF_BITS) | right
+
+
+class ConfirmationCodeAllocator:
+    """
+    Hands out unique confirmation codes for one prefix, in blocks.
+    
+    Args:
+        prefix (str): Code prefix (e.g. 'SH')
+        models (tuple): Labels of models whose confirmation_code column
+            shares this prefix (e.g. 'reports.Report'); codes already
+            stored there are skipped
+        block_size (int): Counter values reserved per database round trip
+    """
+    
+    def __init__(self, prefix, models=(), block_size=100):
+        self.prefix = prefix
+        self.models = tuple(models)
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._year = None
+        self._codes = []
+    
+    def format(self, year, value):
+        """Format a permuted value as a code, e.g. 'SH-2025-A7B9C2'."""
+        return f"{self.prefix}-{year}-{value:06X}"
+    
+    def _key(self, year):
+        return hmac.new(
+            settings.SECRET_KEY.encode('utf-8'),
+            f'confirmation-code:{self.prefix}:{year}'.encode('utf-8'),
+            hashlib.sha256
+        ).digest()
+    
+    def allocate(self):
+        """
+        Get a new confirmation code.
+        
+        Returns:
+            str: A code no other caller has been or will be given
+        
+        Raises:
+            CodeSpaceExhausted: If the prefix has no codes left this year
+        """
+        return self.allocate_many(1)[0]
+    
+    def allocate_many(self, count):
+        """
+        Get several new confirmation codes.
+        
+        Args:
+            count (int): Number of codes
+        
+        Returns:
+            list: Distinct codes
+        
+        Raises:
+            CodeSpaceExhausted: If the prefix runs out of codes this year
+        """
+        year = timezone.now().year
+        codes = []
+        with self._lock:
+            if self._year != year:
+                # Unused codes of last year's block are dropped
+                self._year, self._codes = year, []
+            while len(codes) < count:
+                # A block can come back empty if all its codes are taken
+                while not self._codes:
+                    self._codes = self._reserve(year, max(self.block_size, count - len(codes)))
+                    self._codes.reverse()
+                codes.append(self._codes.pop())
+        return codes
+    
+    def _reserve(self, year, size):
+        """
+        Reserve a block of codes.
+        
+        The reservation must commit on its own: if it were rolled back
+        with an outer transaction, another worker could reserve the same
+        block while this one still hands it out. So inside an atomic
+        block it runs on a separate connection. SQLite allows only one
+        writer, so there it runs inline.
+        """
+        if connection.in_atomic_block and connection.vendor != 'sqlite':
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                return pool.submit(self._reserve_on_own_connection, year, size).result()
+        return self._reserve_block(year, size)
+    
+    def _reserve_on_own_connection(self, year, size):
+        try:
+            return self._reserve_block(year, size)
+        finally:
+            connections.close_all()
+    
+    def _reserve_block(self, year, size):
+        from .models import CodeSequence
+        
+        with transaction.atomic():
+            sequence, _ = (
+                CodeSequence.objects.select_for_update()
+                .get_or_create(prefix=self.prefix, year=year)
+            )
+            start = sequence.next_value
+            end = min(start + size, CODE_SPACE)
+            if start >= end:
+                raise CodeSpaceExhausted(f"No {self.prefix} confirmation codes left for {year}")
+            sequence.next_value = end
+            sequence.save(update_fields=['next_value'])
+        
+        key = self._key(year)
+        codes = [self.format(year, feistel_permute(value, key)) for value in range(start, end)]
+        taken = self._taken(codes)
+        return [code for code in codes if code not in taken] if taken else codes
+    
+    def _taken(self, codes):
+        """Get the codes that are already stored in one of self.models."""
+        taken = set()
+        for label in self.models:
+            model = apps.get_model(label)
+            taken.update(
+                model.objects.filter(confirmation_code__in=codes)
+                .values_list('confirmation_code', flat=True)
+            )
+        return taken
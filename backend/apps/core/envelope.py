@@ -0,0 +1,391 @@
+"""
+Envelope encryption for ShieldHer.
+
+Values are encrypted with a per-bucket data key, and data keys are stored
+wrapped (encrypted) under the master key ring. Rotating the master key only
+re-wraps the data_keys table; encrypted records are left untouched.
+
+If the master key changes without the old one in ENCRYPTION_KEY_FALLBACKS,
+the current bucket's key can no longer be unwrapped. A new version of it is
+then created, so new values can still be written; values under the lost
+version stay unreadable.
+
+Two token formats are supported:
+
+Text (version 1): "ek1:<data key id>:<Fernet token>"
+
+Binary (version 1), stored in BinaryField columns:
+    byte  0      format version (0x01)
+    byte  1      flags: bit 0 = zlib-compressed, bits 4-7 = AEAD algorithm id
+    bytes 2-5    data key id (unsigned, big endian)
+    bytes 6-17   nonce
+    bytes 18-    AEAD ciphertext and 16-byte tag
+The 6 header bytes are authenticated as associated data.
+"""
+
+import base64
+import functools
+import logging
+import os
+import struct
+import threading
+import zlib
+
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .utils import get_key_ring
+
+logger = logging.getLogger(__name__)
+
+ENVELOPE_PREFIX = 'ek1:'
+
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct('>BBI')
+NONCE_SIZE = 12
+FLAG_COMPRESSED = 0x01
+
+# AEAD algorithms by id (stored in the token) and by name (ENCRYPTION_AEAD)
+AEAD_ALGORITHMS = {
+    1: ('aes-gcm', AESGCM),
+    2: ('chacha20-poly1305', ChaCha20Poly1305),
+}
+AEAD_IDS = {name: algorithm_id for algorithm_id, (name, _) in AEAD_ALGORITHMS.items()}
+
+# Values shorter than this are not worth trying to compress
+COMPRESS_MIN_SIZE = 64
+
+# Unwrapped data keys by id, and the current key id per (purpose, bucket)
+_data_keys = {}
+_current_key_ids = {}
+_lock = threading.Lock()
+
+
+def is_envelope_token(value):
+    """Check whether a value is an envelope-encrypted token."""
+    if isinstance(value, bytes):
+        return value.startswith(ENVELOPE_PREFIX.encode())
+    return isinstance(value, str) and value.startswith(ENVELOPE_PREFIX)
+
+
+def is_binary_token(value):
+    """Check whether a value is a binary envelope token."""
+    return isinstance(value, (bytes, bytearray)) and len(value) > 0 and value[0] == BINARY_VERSION
+
+
+def token_key_id(value):
+    """
+    Get the data key id an encrypted value needs.
+    
+    Returns:
+        int: DataKey id, or None for master-key Fernet tokens
+    
+    Raises:
+        ValueError: If an envelope token is malformed
+    """
+    if is_binary_token(value):
+        if len(value) < BINARY_HEADER.size + NONCE_SIZE:
+            raise ValueError("Truncated binary token")
+        return BINARY_HEADER.unpack_from(value)[2]
+    if is_envelope_token(value):
+        return split_envelope_token(value)[0]
+    return None
+
+
+def split_envelope_token(value):
+    """
+    Split an envelope token into its data key id and Fernet token.
+    
+    Returns:
+        tuple: (data_key_id, token_bytes)
+    """
+    if isinstance(value, bytes):
+        value = value.decode('utf-8')
+    key_id, token = value[len(ENVELOPE_PREFIX):].split(':', 1)
+    return int(key_id), token.encode('utf-8')
+
+
+def current_bucket(when=None):
+    """Get the monthly bucket name for a datetime (default: now)."""
+    return (when or timezone.now()).strftime('%Y-%m')
+
+
+@functools.lru_cache(maxsize=256)
+def data_key_cipher(raw_key):
+    """Get a cached Fernet instance for a raw 32-byte data key."""
+    return Fernet(base64.urlsafe_b64encode(raw_key))
+
+
+@functools.lru_cache(maxsize=256)
+def data_key_aead(algorithm_id, raw_key):
+    """Get a cached AEAD instance for a raw 32-byte data key."""
+    if algorithm_id not in AEAD_ALGORITHMS:
+        raise ValueError(f"Unknown AEAD algorithm id {algorithm_id}")
+    return AEAD_ALGORITHMS[algorithm_id][1](raw_key)
+
+
+def encode_binary(data, key_id, raw_key, algorithm='aes-gcm', compress=True):
+    """
+    Encrypt bytes into a binary token with a given data key.
+    
+    Compression is applied only when it makes the payload smaller.
+    
+    Args:
+        data (bytes): Plaintext
+        key_id (int): DataKey id recorded in the header
+        raw_key (bytes): The 32-byte data key
+        algorithm (str): AEAD name, 'aes-gcm' or 'chacha20-poly1305'
+        compress (bool): Whether to try zlib before encrypting
+    
+    Returns:
+        bytes: Binary token
+    """
+    flags = AEAD_IDS[algorithm] << 4
+    if compress and len(data) >= COMPRESS_MIN_SIZE:
+        compressed = zlib.compress(data)
+        if len(compressed) < len(data):
+            data = compressed
+            flags |= FLAG_COMPRESSED
+    
+    header = BINARY_HEADER.pack(BINARY_VERSION, flags, key_id)
+    nonce = os.urandom(NONCE_SIZE)
+    ciphertext = data_key_aead(flags >> 4, raw_key).encrypt(nonce, data, header)
+    return header + nonce + ciphertext
+
+
+def decode_binary(token, raw_key):
+    """
+    Decrypt a binary token with its data key.
+    
+    Returns:
+        bytes: Plaintext
+    """
+    token = bytes(token)
+    header = token[:BINARY_HEADER.size]
+    _, flags, _ = BINARY_HEADER.unpack(header)
+    nonce = token[BINARY_HEADER.size:BINARY_HEADER.size + NONCE_SIZE]
+    ciphertext = token[BINARY_HEADER.size + NONCE_SIZE:]
+    data = data_key_aead(flags >> 4, raw_key).decrypt(nonce, ciphertext, header)
+    if flags & FLAG_COMPRESSED:
+        data = zlib.decompress(data)
+    return data
+
+
+def _unwrap(data_key):
+    """Decrypt a DataKey row's wrapped key with the master key ring."""
+    return get_key_ring().decrypt(data_key.wrapped_key.encode('utf-8'))
+
+
+def _unreadable(data_key):
+    """Explain why a DataKey row cannot be unwrapped."""
+    return (
+        f"Data key {data_key.id} ({data_key.purpose}/{data_key.bucket} v{data_key.version}) "
+        f"cannot be unwrapped with ENCRYPTION_KEY or ENCRYPTION_KEY_FALLBACKS; "
+        f"add the master key it was wrapped with to ENCRYPTION_KEY_FALLBACKS"
+    )
+
+
+def load_data_keys(key_ids, skip_unreadable=False):
+    """
+    Get unwrapped data keys, fetching any that are not cached in one query.
+    
+    Args:
+        key_ids (iterable): DataKey ids
+        skip_unreadable (bool): Leave out keys that the master key ring
+            cannot unwrap instead of raising, so bulk callers can fail
+            only the rows encrypted under them
+    
+    Returns:
+        dict: Raw data key bytes by id
+    
+    Raises:
+        ImproperlyConfigured: If a key cannot be unwrapped and
+            skip_unreadable is False
+    """
+    from .models import DataKey
+    
+    key_ids = set(key_ids)
+    missing = key_ids - _data_keys.keys()
+    if missing:
+        for data_key in DataKey.objects.filter(id__in=missing):
+            try:
+                _data_keys[data_key.id] = _unwrap(data_key)
+            except InvalidToken:
+                if not skip_unreadable:
+                    raise ImproperlyConfigured(_unreadable(data_key))
+                logger.error(_unreadable(data_key))
+    return {key_id: _data_keys[key_id] for key_id in key_ids if key_id in _data_keys}
+
+
+def _create_data_key(purpose, bucket, version):
+    """
+    Create a data key version, or use the one another worker just created.
+    
+    Returns:
+        tuple: (data_key_id, raw_key_bytes)
+    """
+    from .models import DataKey
+    
+    while True:
+        raw_key = os.urandom(32)
+        wrapped = get_key_ring().encrypt(raw_key).decode('utf-8')
+        try:
+            with transaction.atomic():
+                data_key = DataKey.objects.create(
+                    purpose=purpose,
+                    bucket=bucket,
+                    version=version,
+                    wrapped_key=wrapped
+                )
+            logger.info(f"Created data key for {purpose}/{bucket} v{version}")
+            return data_key.id, raw_key
+        except IntegrityError:
+            # Another worker created it first
+            data_key = DataKey.objects.get(purpose=purpose, bucket=bucket, version=version)
+        try:
+            return data_key.id, _unwrap(data_key)
+        except InvalidToken:
+            logger.error(_unreadable(data_key))
+            version += 1
+
+
+def get_data_key(purpose, bucket=None):
+    """
+    Get the data key for a purpose and bucket, creating it if needed.
+    
+    The newest version of the bucket's key is used. If the master key
+    ring cannot unwrap it, a new version is created and an error logged,
+    so values can still be encrypted.
+    
+    Args:
+        purpose (str): What the key encrypts (e.g. 'reports')
+        bucket (str): Time bucket (default: current month)
+    
+    Returns:
+        tuple: (data_key_id, raw_key_bytes)
+    """
+    from .models import DataKey
+    
+    bucket = bucket or current_bucket()
+    key_id = _current_key_ids.get((purpose, bucket))
+    if key_id is not None:
+        return key_id, _data_keys[key_id]
+    
+    with _lock:
+        data_key = DataKey.objects.filter(purpose=purpose, bucket=bucket).order_by('-version').first()
+        if data_key is None:
+            key_id, raw_key = _create_data_key(purpose, bucket, 1)
+        else:
+            try:
+                key_id, raw_key = data_key.id, _unwrap(data_key)
+            except InvalidToken:
+                logger.error(f"{_unreadable(data_key)}. Creating a new version for new values.")
+                key_id, raw_key = _create_data_key(purpose, bucket, data_key.version + 1)
+        
+        _data_keys[key_id] = raw_key
+        _current_key_ids[(purpose, bucket)] = key_id
+        return key_id, raw_key
+
+
+def envelope_encrypt(value, purpose, bucket=None):
+    """
+    Encrypt a value with the data key for a purpose and bucket.
+    
+    Args:
+        value (str): The value to encrypt
+        purpose (str): What the value is (e.g. 'reports')
+        bucket (str): Time bucket (default: current month)
+    
+    Returns:
+        str: Envelope token
+    """
+    if not value:
+        return value
+    
+    key_id, raw_key = get_data_key(purpose, bucket)
+    token = data_key_cipher(raw_key).encrypt(value.encode('utf-8'))
+    return f"{ENVELOPE_PREFIX}{key_id}:{token.decode('utf-8')}"
+
+
+def binary_encrypt(value, purpose, bucket=None):
+    """
+    Encrypt a value into a compact binary token.
+    Uses the ENCRYPTION_AEAD algorithm and the data key for a purpose and bucket.
+    
+    Args:
+        value (str): The value to encrypt
+        purpose (str): What the value is (e.g. 'reports')
+        bucket (str): Time bucket (default: current month)
+    
+    Returns:
+        bytes: Binary token
+    """
+    if not value:
+        return value
+    
+    key_id, raw_key = get_data_key(purpose, bucket)
+    if key_id > 0xFFFFFFFF:
+        raise ValueError("Data key id does not fit in a binary token header")
+    return encode_binary(value.encode('utf-8'), key_id, raw_key, settings.ENCRYPTION_AEAD)
+
+
+def decrypt_with_data_key(value, raw_key):
+    """
+    Decrypt a text or binary envelope token with an already unwrapped key.
+    
+    Returns:
+        str: The decrypted value
+    """
+    if is_binary_token(value):
+        return decode_binary(value, raw_key).decode('utf-8')
+    _, token = split_envelope_token(value)
+    return data_key_cipher(raw_key).decrypt(token).decode('utf-8')
+
+
+def envelope_decrypt(value, data_keys=None):
+    """
+    Decrypt a text or binary envelope token.
+    
+    Args:
+        value (str or bytes): Envelope token
+        data_keys (dict): Optional preloaded raw data keys by id
+    
+    Returns:
+        str: The decrypted value
+    """
+    key_id = token_key_id(value)
+    if data_keys is None or key_id not in data_keys:
+        data_keys = load_data_keys([key_id])
+    return decrypt_with_data_key(value, data_keys[key_id])
+
+
+def rewrap_data_keys():
+    """
+    Re-encrypt every wrapped data key under the primary master key.
+    Run after moving the old ENCRYPTION_KEY into ENCRYPTION_KEY_FALLBACKS.
+    
+    Keys no master key can unwrap (superseded by a newer version) are
+    left as they are and logged.
+    
+    Returns:
+        int: Number of data keys re-wrapped
+    """
+    from .models import DataKey
+    
+    key_ring = get_key_ring()
+    count = 0
+    with transaction.atomic():
+        for data_key in DataKey.objects.select_for_update().order_by('id'):
+            try:
+                wrapped = key_ring.rotate(data_key.wrapped_key.encode('utf-8'))
+            except InvalidToken:
+                logger.error(_unreadable(data_key))
+                continue
+            data_key.wrapped_key = wrapped.decode('utf-8')
+            data_key.save(update_fields=['wrapped_key', 'updated_at'])
+            count += 1
+    return count
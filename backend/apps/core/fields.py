@@ -0,0 +1,192 @@
+"""
+Custom model fields for ShieldHer.
+"""
+
+import base64
+
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+
+class Ciphertext:
+    """
+    An encrypted value as stored in the database, not yet decrypted.
+    Assigning one to an encrypted field stores the token unchanged.
+    """
+    __slots__ = ('token',)
+    
+    def __init__(self, token):
+        self.token = token
+    
+    def __eq__(self, other):
+        return isinstance(other, Ciphertext) and other.token == self.token
+    
+    def __hash__(self):
+        return hash(self.token)
+    
+    def __repr__(self):
+        # Never show token contents in logs or tracebacks
+        return '<Ciphertext>'
+
+
+class EncryptedAttribute(DeferredAttribute):
+    """
+    Descriptor that decrypts an encrypted field on first access.
+    The plaintext replaces the ciphertext on the instance, so each
+    instance decrypts at most once.
+    """
+    
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if isinstance(value, Ciphertext):
+            value = self.field.decrypt(value.token)
+            instance.__dict__[self.field.attname] = value
+        return value
+    
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+
+class EncryptedFieldMixin:
+    """
+    Shared behaviour for encrypted model fields.
+    
+    Values are encrypted in get_prep_value, so save(), create(),
+    bulk_create() and bulk_update() all encrypt. Loading a row never
+    decrypts; the value is decrypted lazily on first attribute access.
+    Use get_ciphertext() to read the stored token without decrypting.
+    """
+    descriptor_class = EncryptedAttribute
+    
+    def encrypt(self, value):
+        """Encrypt a plaintext value for storage."""
+        raise NotImplementedError
+    
+    def decrypt(self, token):
+        """Decrypt a stored token."""
+        from .utils import decrypt_field
+        return decrypt_field(token)
+    
+    def from_db_value(self, value, expression, connection):
+        if not value:
+            return value
+        return Ciphertext(value)
+    
+    def get_prep_value(self, value):
+        if isinstance(value, Ciphertext):
+            return value.token
+        value = super().get_prep_value(value)
+        if not value:
+            return value
+        return self.encrypt(value)
+    
+    def pre_save(self, model_instance, add):
+        # Read the stored value directly so saving does not decrypt
+        return model_instance.__dict__.get(self.attname)
+    
+    def value_to_string(self, obj):
+        # Serialized dumps carry the ciphertext, never the plaintext
+        value = obj.__dict__.get(self.attname)
+        if isinstance(value, Ciphertext):
+            return value.token
+        return self.get_prep_value(value)
+    
+    def get_ciphertext(self, instance):
+        """
+        Get the stored token for an instance without decrypting it.
+        
+        Returns:
+            The token, or None if the value has already been
+            decrypted or has not been saved yet
+        """
+        value = instance.__dict__.get(self.attname)
+        if isinstance(value, Ciphertext):
+            return value.token
+        return None
+    
+    def set_decrypted(self, instance, value):
+        """Cache an already decrypted value on an instance."""
+        instance.__dict__[self.attname] = value
+
+
+class EncryptedTextField(EncryptedFieldMixin, models.TextField):
+    """
+    Text field that is encrypted at rest as a Fernet or envelope token.
+    
+    Args:
+        purpose (str): Envelope encryption purpose. Values are encrypted
+            with that purpose's monthly data key. Without a purpose the
+            master key ring is used directly.
+    """
+    
+    def __init__(self, *args, purpose=None, **kwargs):
+        self.purpose = purpose
+        super().__init__(*args, **kwargs)
+    
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.purpose is not None:
+            kwargs['purpose'] = self.purpose
+        return name, path, args, kwargs
+    
+    def encrypt(self, value):
+        from .envelope import envelope_encrypt
+        from .utils import encrypt_field
+        
+        if self.purpose:
+            return envelope_encrypt(value, self.purpose)
+        return encrypt_field(value)
+    
+    def to_python(self, value):
+        if isinstance(value, Ciphertext):
+            return value
+        return super().to_python(value)
+
+
+class EncryptedBinaryField(EncryptedFieldMixin, models.BinaryField):
+    """
+    Binary field that stores text encrypted in the compact binary
+    envelope format: AEAD with the purpose's monthly data key,
+    zlib-compressed first when that makes it smaller.
+    
+    Rows written in older text formats (Fernet or "ek1:" tokens) are
+    still read, so a TextField can be altered to this field in place.
+    
+    Args:
+        purpose (str): Envelope encryption purpose (required)
+    """
+    
+    def __init__(self, *args, purpose=None, **kwargs):
+        self.purpose = purpose
+        kwargs.setdefault('editable', True)
+        super().__init__(*args, **kwargs)
+    
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['purpose'] = self.purpose
+        kwargs.pop('editable', None)
+        if not self.editable:
+            kwargs['editable'] = False
+        return name, path, args, kwargs
+    
+    def encrypt(self, value):
+        from .envelope import binary_encrypt
+        return binary_encrypt(value, self.purpose)
+    
+    def from_db_value(self, value, expression, connection):
+        if not value:
+            return value
+        # memoryview on PostgreSQL; legacy text tokens may come back as str
+        if isinstance(value, str):
+            value = value.encode('utf-8')
+        return Ciphertext(bytes(value))
+    
+    def to_python(self, value):
+        # Plaintext is assigned as str; don't treat it as base64
+        return value
+    
+    def value_to_string(self, obj):
+        value = super().value_to_string(obj)
+        return base64.b64encode(value).decode('ascii') if value else value
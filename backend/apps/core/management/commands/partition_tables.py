@@ -0,0 +1,76 @@
+"""
+Partition the append-only tables (reports, audit_logs) by month.
+
+Usage:
+    python manage.py partition_tables --convert   # once, in a maintenance window
+    python manage.py partition_tables             # monthly, e.g. from cron
+
+--convert rewrites each ordinary table as a partitioned one while holding
+an exclusive lock on it. The primary key becomes (id, created_at), and
+single-column unique constraints (reports.confirmation_code) are kept
+unique by a guard table and trigger. Without it, the command only creates
+partitions for the current and the next --months months of tables already
+partitioned. Running it again is safe. On databases other than
+PostgreSQL it does nothing.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from apps.core.partitioning import (
+    PartitioningError,
+    add_months,
+    convert_table,
+    ensure_partitions,
+    is_partitioned,
+    month_start,
+    partitioned_tables,
+    partitioning_supported
+)
+
+
+class Command(BaseCommand):
+    help = 'Partition reports and audit_logs by month and create future partitions (PostgreSQL)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months',
+            type=int,
+            default=3,
+            help='Future months to create partitions for'
+        )
+        parser.add_argument(
+            '--convert',
+            action='store_true',
+            help='Convert tables that are not partitioned yet'
+        )
+    
+    def handle(self, *args, **options):
+        if not partitioning_supported():
+            self.stdout.write(
+                f"Partitioning needs PostgreSQL; {connection.vendor} tables stay unpartitioned."
+            )
+            return
+        
+        first = month_start(timezone.now())
+        last = add_months(first, options['months'])
+        for table in partitioned_tables():
+            with connection.cursor() as cursor:
+                partitioned = is_partitioned(cursor, table)
+            
+            if not partitioned:
+                if not options['convert']:
+                    self.stdout.write(f"{table} is not partitioned; run with --convert to convert it")
+                    continue
+                try:
+                    convert_table(table, options['months'])
+                except PartitioningError as e:
+                    raise CommandError(str(e))
+                self.stdout.write(self.style.SUCCESS(f"Converted {table} to monthly partitions"))
+                continue
+            
+            created = ensure_partitions(table, first, last)
+            if created:
+                self.stdout.write(self.style.SUCCESS(f"Created {', '.join(created)}"))
+            else:
+                self.stdout.write(f"{table}: partitions up to date")
@@ -0,0 +1,22 @@
+"""
+Re-wrap all data keys under the current master encryption key.
+
+Rotation steps:
+    1. Set ENCRYPTION_KEY to a new key and move the old key to
+       ENCRYPTION_KEY_FALLBACKS, then deploy.
+    2. Run: python manage.py rotate_data_keys
+    3. Remove the old key from ENCRYPTION_KEY_FALLBACKS.
+
+Only the data_keys table is rewritten; encrypted records are not touched.
+"""
+
+from django.core.management.base import BaseCommand
+from apps.core.envelope import rewrap_data_keys
+
+
+class Command(BaseCommand):
+    help = 'Re-wrap all envelope data keys under the primary ENCRYPTION_KEY'
+    
+    def handle(self, *args, **options):
+        count = rewrap_data_keys()
+        self.stdout.write(self.style.SUCCESS(f"Re-wrapped {count} data keys"))
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DataKey",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, help_text="Timestamp when record was created"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="Timestamp when record was last updated",
+                    ),
+                ),
+                (
+                    "purpose",
+                    models.CharField(help_text="What this key encrypts", max_length=50),
+                ),
+                (
+                    "bucket",
+                    models.CharField(
+                        help_text="Time bucket covered by this key", max_length=20
+                    ),
+                ),
+                (
+                    "wrapped_key",
+                    models.TextField(
+                        help_text="Data key encrypted under the master key"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Data Key",
+                "verbose_name_plural": "Data Keys",
+                "db_table": "data_keys",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="datakey",
+            constraint=models.UniqueConstraint(
+                fields=("purpose", "bucket"), name="unique_data_key_bucket"
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0002_data_key"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="auditlog",
+            name="action",
+            field=models.CharField(
+                choices=[
+                    ("create", "Create"),
+                    ("update", "Update"),
+                    ("delete", "Delete"),
+                    ("view", "View"),
+                    ("export", "Export"),
+                ],
+                help_text="Type of action performed",
+                max_length=20,
+            ),
+        ),
+    ]
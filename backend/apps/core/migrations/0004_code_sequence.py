@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0003_audit_log_export_action"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CodeSequence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "prefix",
+                    models.CharField(
+                        help_text="Confirmation code prefix", max_length=10
+                    ),
+                ),
+                (
+                    "year",
+                    models.PositiveIntegerField(help_text="Year shown in the codes"),
+                ),
+                (
+                    "next_value",
+                    models.PositiveIntegerField(
+                        default=0, help_text="First counter value not yet reserved"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Code Sequence",
+                "verbose_name_plural": "Code Sequences",
+                "db_table": "code_sequences",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="codesequence",
+            constraint=models.UniqueConstraint(
+                fields=("prefix", "year"), name="unique_code_sequence"
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:54
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0004_code_sequence"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="auditlog",
+            name="created_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                editable=False,
+                help_text="Timestamp when the action was logged",
+            ),
+        ),
+    ]
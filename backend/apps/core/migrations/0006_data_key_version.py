@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0005_audit_log_logged_at"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="datakey",
+            name="unique_data_key_bucket",
+        ),
+        migrations.AddField(
+            model_name="datakey",
+            name="version",
+            field=models.PositiveIntegerField(
+                default=1, help_text="Key version within the purpose and bucket"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="datakey",
+            constraint=models.UniqueConstraint(
+                fields=("purpose", "bucket", "version"), name="unique_data_key_version"
+            ),
+        ),
+    ]
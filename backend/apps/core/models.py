@@ -42,7 +42,7 @@ class AuditLog(TimeStampedModel):
     
     Fields:
         admin_user: The admin who performed the action
-        action: Type of action (create, update, delete, view)
+        action: Type of action (create, update, delete, view, export)
         resource_type: Type of resource affected
         resource_id: ID of the affected resource
         details: Additional details about the action (JSON)
@@ -53,8 +53,15 @@ class AuditLog(TimeStampedModel):
         ('update', 'Update'),
         ('delete', 'Delete'),
         ('view', 'View'),
+        ('export', 'Export'),
     ]
     
+    # Set when the action is logged, not when the buffered row is written
+    created_at = models.DateTimeField(
+        default=timezone.now,
+        editable=False,
+        help_text="Timestamp when the action was logged"
+    )
     admin_user = models.ForeignKey(
         'authentication.AdminUser',
         on_delete=models.SET_NULL,
@@ -100,22 +107,117 @@ class AuditLog(TimeStampedModel):
         return f"{self.action} on {self.resource_type} by {self.admin_user}"
 
 
-def log_admin_action(admin_user, action, resource_type, resource_id, details=None, success=True):
+class DataKey(TimeStampedModel):
+    """
+    Data encryption key for envelope encryption.
+    Each time bucket of records is encrypted with its own data key, and only
+    the wrapped data key is encrypted with the master ENCRYPTION_KEY.
+    Rotating the master key re-wraps these few rows instead of every record.
+    
+    New values of a bucket are encrypted with its newest version. A new
+    version is created when the master key ring cannot unwrap the newest
+    one (e.g. ENCRYPTION_KEY changed without a fallback), so writes keep
+    working; values under the old version stay unreadable.
+    
+    Fields:
+        purpose: What the key encrypts (e.g. 'reports')
+        bucket: Time bucket the key covers (e.g. '2025-11')
+        version: Version of the key within its purpose and bucket
+        wrapped_key: The data key, encrypted under the master key ring
+    """
+    purpose = models.CharField(
+        max_length=50,
+        help_text="What this key encrypts"
+    )
+    bucket = models.CharField(
+        max_length=20,
+        help_text="Time bucket covered by this key"
+    )
+    version = models.PositiveIntegerField(
+        default=1,
+        help_text="Key version within the purpose and bucket"
+    )
+    wrapped_key = models.TextField(
+        help_text="Data key encrypted under the master key"
+    )
+    
+    class Meta:
+        db_table = 'data_keys'
+        verbose_name = 'Data Key'
+        verbose_name_plural = 'Data Keys'
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['purpose', 'bucket', 'version'], name='unique_data_key_version'),
+        ]
+    
+    def __str__(self):
+        return f"Data key {self.purpose}/{self.bucket} v{self.version}"
+
+
+class CodeSequence(models.Model):
+    """
+    Counter behind the confirmation codes of one prefix and year.
+    Workers reserve blocks of counter values from it; see
+    apps.core.codes.ConfirmationCodeAllocator.
+    
+    Fields:
+        prefix: Code prefix (e.g. 'SH')
+        year: Year shown in the codes
+        next_value: First counter value not yet reserved
+    """
+    prefix = models.CharField(
+        max_length=10,
+        help_text="Confirmation code prefix"
+    )
+    year = models.PositiveIntegerField(
+        help_text="Year shown in the codes"
+    )
+    next_value = models.PositiveIntegerField(
+        default=0,
+        help_text="First counter value not yet reserved"
+    )
+    
+    class Meta:
+        db_table = 'code_sequences'
+        verbose_name = 'Code Sequence'
+        verbose_name_plural = 'Code Sequences'
+        constraints = [
+            models.UniqueConstraint(fields=['prefix', 'year'], name='unique_code_sequence'),
+        ]
+    
+    def __str__(self):
+        return f"{self.prefix}-{self.year}: {self.next_value}"
+
+
+def log_admin_action(admin_user, action, resource_type, resource_id, details=None, success=True,
+                     durable=None):
     """
     Utility function to log admin actions.
     
+    Entries are buffered and written in batches (see apps.core.audit).
+    Durable entries are written, with anything buffered before them,
+    before this returns.
+    
     Args:
         admin_user: The AdminUser instance
-        action: Action type ('create', 'update', 'delete', 'view')
+        action: Action type ('create', 'update', 'delete', 'view', 'export')
         resource_type: Type of resource (model name)
         resource_id: ID of the resource
         details: Optional dict with additional details
         success: Whether the action succeeded
-        
+        durable: Write before returning (default: whether the action is
+            in settings.AUDIT_DURABLE_ACTIONS)
+    
     Returns:
-        AuditLog: The created audit log entry
+        AuditLog: The audit log entry (unsaved until flushed, unless durable)
+    
+    Raises:
+        DatabaseError: If a durable entry could not be written
     """
-    return AuditLog.objects.create(
+    from django.conf import settings
+    from .audit import audit_buffer
+    
+    entry = AuditLog(
         admin_user=admin_user,
         action=action,
         resource_type=resource_type,
@@ -123,3 +225,7 @@ def log_admin_action(admin_user, action, resource_type, resource_id, details=Non
         details=details or {},
         success=success
     )
+    if durable is None:
+        durable = action in settings.AUDIT_DURABLE_ACTIONS
+    audit_buffer.add(entry, durable=durable)
+    return entry
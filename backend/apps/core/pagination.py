@@ -2,7 +2,16 @@
 Custom pagination classes for ShieldHer API.
 """
 
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from datetime import datetime
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -13,3 +22,271 @@ class StandardResultsSetPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
+
+
+def estimate_count(queryset):
+    """
+    Estimate the number of rows a queryset returns.
+    
+    On PostgreSQL this reads the planner's row estimate from EXPLAIN, which
+    costs the same on any table size. Other databases fall back to an
+    exact COUNT(*).
+    
+    Args:
+        queryset: QuerySet to estimate
+    
+    Returns:
+        int: Estimated row count
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+    
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def estimate_table_rows(model, using='default'):
+    """
+    Get the row count PostgreSQL's statistics hold for a model's table.
+    
+    Reads pg_class.reltuples, kept up to date by VACUUM and ANALYZE, so it
+    costs the same on any table size. For a partitioned table the
+    partitions are summed.
+    
+    Args:
+        model: Model class
+        using (str): Database alias
+    
+    Returns:
+        int: Estimated row count, or None if not on PostgreSQL or the
+            table has never been analyzed
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT SUM(reltuples) FILTER (WHERE reltuples >= 0) FROM pg_class "
+            "WHERE oid = to_regclass(%s) "
+            "OR oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(%s))",
+            [table, table]
+        )
+        rows = cursor.fetchone()[0]
+    return None if rows is None else int(rows)
+
+
+def encode_keyset_cursor(value, pk, reverse):
+    """
+    Encode a keyset position as an opaque URL-safe cursor.
+    
+    Args:
+        value (datetime): Ordering value of the boundary row
+        pk: Primary key of the boundary row
+        reverse (bool): Whether the cursor pages backwards
+    """
+    payload = json.dumps({
+        'c': value.isoformat(),
+        'i': pk,
+        'r': int(reverse),
+    }, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_keyset_cursor(encoded):
+    """
+    Decode a cursor made by encode_keyset_cursor().
+    
+    Returns:
+        tuple: (value, pk, reverse)
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = encoded + '=' * (-len(encoded) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        value = parse_datetime(payload['c'])
+        if not isinstance(value, datetime):
+            raise ValueError('bad timestamp')
+        return value, int(payload['i']), bool(payload['r'])
+    except (TypeError, ValueError, KeyError, UnicodeError) as exc:
+        raise ValueError('Invalid cursor') from exc
+
+
+def keyset_page(queryset, field, cursor, page_size):
+    """
+    Fetch one page of a queryset in (field, pk) order, newest first.
+    
+    The page is a WHERE on the cursor row's (field, pk) plus a LIMIT, so
+    it reads only page_size rows from a (field, pk) index however deep it
+    is.
+    
+    Args:
+        queryset: QuerySet to page
+        field (str): Ordering field, e.g. 'created_at'
+        cursor (tuple): (value, pk, reverse) from decode_keyset_cursor(),
+            or None for the first page
+        page_size (int): Rows per page
+    
+    Returns:
+        tuple: (rows, has_more) - rows newest first; has_more tells
+            whether rows remain past the page in the cursor's direction
+            (older, or newer for a reverse cursor)
+    """
+    reverse = cursor is not None and cursor[2]
+    if cursor is not None:
+        value, pk, _ = cursor
+        direction = 'gt' if reverse else 'lt'
+        queryset = queryset.filter(
+            Q(**{f'{field}__{direction}': value}) | Q(**{field: value, f'pk__{direction}': pk})
+        )
+    if reverse:
+        queryset = queryset.order_by(field, 'pk')
+    else:
+        queryset = queryset.order_by(f'-{field}', '-pk')
+    
+    # One extra row tells us whether there is another page
+    rows = list(queryset[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if reverse:
+        rows.reverse()
+    return rows, has_more
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on (created_at, id), newest first.
+    
+    Each page is fetched with a WHERE on the last row's (created_at, id)
+    instead of an OFFSET, so it reads only page_size rows from the
+    (created_at, id) index; page 5,000 costs the same as page 1. No
+    COUNT(*) is run unless the client asks for one:
+        
+        ?count=estimate   planner estimate (exact count off PostgreSQL)
+        ?count=exact      exact COUNT(*)
+    
+    Cursors are opaque; clients follow the next/previous links.
+    PageOrKeysetPagination uses this when a request passes ?cursor=.
+    """
+    keyset_field = 'created_at'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.count = self.get_count(queryset, request)
+        
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor[2]
+        rows, has_more = keyset_page(queryset, self.keyset_field, cursor, self.page_size)
+        
+        self.page = rows
+        if reverse:
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+        return rows
+    
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+    
+    def get_count(self, queryset, request):
+        mode = request.query_params.get(self.count_query_param)
+        if mode == 'exact':
+            return queryset.count()
+        if mode == 'estimate':
+            return estimate_count(queryset)
+        return None
+    
+    def encode_cursor(self, row, reverse):
+        cursor = encode_keyset_cursor(getattr(row, self.keyset_field), row.pk, reverse)
+        url = replace_query_param(self.base_url, self.cursor_query_param, cursor)
+        # The count was for the first request; don't repeat it on every page
+        return remove_query_param(url, self.count_query_param)
+    
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            return decode_keyset_cursor(encoded)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+    
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+    
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+    
+    def get_paginated_response(self, data):
+        response = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            response['count'] = self.count
+        return Response(response)
+    
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer', 'example': 123},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class PageOrKeysetPagination(StandardResultsSetPagination):
+    """
+    Page numbers by default, keyset pages when the request asks for them.
+    
+    Without a cursor this is StandardResultsSetPagination (?page=N, with
+    count). With ?cursor= - empty for the first page - the request is
+    paged by KeysetPagination instead: newest first, no COUNT(*) unless
+    ?count= asks for one, and deep pages as cheap as the first. Its
+    next/previous links carry the cursor on.
+    """
+    keyset_class = KeysetPagination
+    keyset = None
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+    
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,322 @@
+"""
+Monthly range partitioning of append-only tables on PostgreSQL.
+
+reports and audit_logs are only ever appended to and are read mostly by
+created_at. On PostgreSQL they can be converted, once, into tables
+partitioned by calendar month (UTC) of created_at:
+
+    python manage.py partition_tables --convert
+
+Run the command without --convert regularly (e.g. monthly from cron) to
+create the partitions for the coming months. Each table then has:
+
+  * one partition per month, named <table>_pYYYY_MM,
+  * a DEFAULT partition for rows outside the created months; its rows
+    are moved into their month's partition when that is created,
+  * a BRIN index on created_at, a few pages per partition.
+
+Each partition has its own small indexes and is vacuumed on its own, and
+queries with a created_at range only touch the months in the range.
+
+PostgreSQL requires unique constraints on a partitioned table to include
+the partition key, so the primary key becomes (id, created_at) and
+unique columns are made unique together with created_at. ids still come
+from a single sequence. Single-column unique constraints such as
+reports.confirmation_code keep a database-level guarantee through a
+guard table, <table>_<column>_guard, whose primary key holds every value
+stored in the column. A trigger on the partitioned table records each
+new value, so a duplicate fails with an IntegrityError as before.
+
+Other databases (SQLite in development) keep ordinary tables; nothing
+here runs on them.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+from django.apps import apps
+from django.db import connection, transaction
+from django.utils import timezone
+
+# Append-only models whose tables may be partitioned
+PARTITIONED_MODELS = ('reports.Report', 'core.AuditLog')
+
+PARTITION_KEY = 'created_at'
+
+
+class PartitioningError(Exception):
+    """A table cannot be partitioned as requested."""
+
+
+def partitioning_supported():
+    """Whether the default database can partition tables."""
+    return connection.vendor == 'postgresql'
+
+
+def month_start(when):
+    """Get the first instant (UTC) of the month containing `when`."""
+    when = when.astimezone(dt_timezone.utc)
+    return datetime(when.year, when.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(start, months):
+    """Move a month start forwards by a number of months."""
+    month_index = start.year * 12 + start.month - 1 + months
+    return start.replace(year=month_index // 12, month=month_index % 12 + 1)
+
+
+def partition_name(table, start):
+    """Get the partition name for a table and month, e.g. 'reports_p2025_11'."""
+    return f"{table}_p{start:%Y_%m}"
+
+
+def with_partition_key(definition):
+    """
+    Add the partition key to the column list of a PRIMARY KEY or UNIQUE
+    constraint, or of a CREATE UNIQUE INDEX statement.
+    
+    Args:
+        definition (str): e.g. 'UNIQUE (confirmation_code)'
+    
+    Returns:
+        str: e.g. 'UNIQUE (confirmation_code, created_at)'
+    """
+    head, sep, rest = definition.partition(')')
+    columns = [column.strip().strip('"') for column in head.rsplit('(', 1)[1].split(',')]
+    if PARTITION_KEY in columns:
+        return definition
+    return f"{head}, {PARTITION_KEY}{sep}{rest}"
+
+
+def partitioned_tables():
+    """Get the db_table of each model in PARTITIONED_MODELS."""
+    return [apps.get_model(label)._meta.db_table for label in PARTITIONED_MODELS]
+
+
+def is_partitioned(cursor, table):
+    """Whether a table exists and is partitioned."""
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [table])
+    row = cursor.fetchone()
+    return row is not None and row[0] == 'p'
+
+
+def _table_exists(cursor, table):
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [table])
+    return cursor.fetchone()[0]
+
+
+def _bounds(start):
+    """Partition bound literals for a month; values are generated, not user input."""
+    return f"'{start.isoformat()}'", f"'{add_months(start, 1).isoformat()}'"
+
+
+def guard_table_name(table, column):
+    """Get the name of the table that keeps `column` of `table` unique."""
+    return f"{table}_{column}_guard"
+
+
+def create_unique_guard(cursor, table, column):
+    """
+    Keep a column of a partitioned table unique across all partitions.
+    
+    Creates a guard table with the column's values as its primary key,
+    fills it from the table, and adds a trigger that records every new
+    or changed value, failing the statement on a duplicate.
+    
+    Args:
+        cursor: Cursor inside the conversion transaction
+        table (str): Partitioned table
+        column (str): Column that must stay unique
+    """
+    qn = connection.ops.quote_name
+    guard = guard_table_name(table, column)
+    cursor.execute(
+        "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+        "WHERE attrelid = to_regclass(%s) AND attname = %s",
+        [table, column]
+    )
+    column_type = cursor.fetchone()[0]
+    
+    cursor.execute(f"CREATE TABLE {qn(guard)} (value {column_type} PRIMARY KEY)")
+    cursor.execute(
+        f"INSERT INTO {qn(guard)} (value) SELECT {qn(column)} FROM {qn(table)} "
+        f"WHERE {qn(column)} IS NOT NULL"
+    )
+    # A value already in the guard is only accepted while no other row
+    # holds it: an UPDATE that moves a row to another partition fires
+    # the insert trigger again. The row lock serializes such checks.
+    cursor.execute(f"""
+        CREATE FUNCTION {qn(guard + '_insert')}() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF NEW.{qn(column)} IS NULL
+               OR (TG_OP = 'UPDATE' AND NEW.{qn(column)} IS NOT DISTINCT FROM OLD.{qn(column)}) THEN
+                RETURN NULL;
+            END IF;
+            INSERT INTO {qn(guard)} (value) VALUES (NEW.{qn(column)}) ON CONFLICT (value) DO NOTHING;
+            IF NOT FOUND THEN
+                PERFORM 1 FROM {qn(guard)} WHERE value = NEW.{qn(column)} FOR UPDATE;
+                IF (SELECT count(*) FROM {qn(table)} WHERE {qn(column)} = NEW.{qn(column)}) > 1 THEN
+                    RAISE EXCEPTION USING
+                        ERRCODE = 'unique_violation',
+                        MESSAGE = 'duplicate key value violates unique constraint "{guard}_pkey"',
+                        DETAIL = format('Key ({column})=(%s) already exists.', NEW.{qn(column)});
+                END IF;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    cursor.execute(
+        f"CREATE TRIGGER {qn(guard + '_insert')} AFTER INSERT OR UPDATE OF {qn(column)} "
+        f"ON {qn(table)} FOR EACH ROW EXECUTE FUNCTION {qn(guard + '_insert')}()"
+    )
+
+
+def _single_column(definition):
+    """Get the column of a one-column UNIQUE definition, or None."""
+    columns = definition.partition(')')[0].rsplit('(', 1)[1].split(',')
+    return columns[0].strip().strip('"') if len(columns) == 1 else None
+
+
+def ensure_partitions(table, first, last):
+    """
+    Create the monthly partitions of a table from `first` to `last`.
+    
+    Rows for a new month that landed in the DEFAULT partition are moved
+    into the new partition in the same transaction.
+    
+    Args:
+        table (str): Partitioned table
+        first (datetime): Month start of the first partition
+        last (datetime): Month start of the last partition
+    
+    Returns:
+        list: Names of the partitions created
+    """
+    qn = connection.ops.quote_name
+    default = qn(f"{table}_default")
+    created = []
+    start = first
+    with connection.cursor() as cursor:
+        while start <= last:
+            name = partition_name(table, start)
+            lower, upper = _bounds(start)
+            if not _table_exists(cursor, name):
+                with transaction.atomic():
+                    cursor.execute(
+                        f"SELECT EXISTS (SELECT 1 FROM {default} "
+                        f"WHERE {PARTITION_KEY} >= {lower} AND {PARTITION_KEY} < {upper})"
+                    )
+                    if cursor.fetchone()[0]:
+                        cursor.execute(
+                            f"CREATE TABLE {qn(name)} "
+                            f"(LIKE {qn(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+                        )
+                        cursor.execute(
+                            f"WITH moved AS (DELETE FROM {default} "
+                            f"WHERE {PARTITION_KEY} >= {lower} AND {PARTITION_KEY} < {upper} "
+                            f"RETURNING *) INSERT INTO {qn(name)} SELECT * FROM moved"
+                        )
+                        cursor.execute(
+                            f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} "
+                            f"FOR VALUES FROM ({lower}) TO ({upper})"
+                        )
+                    else:
+                        cursor.execute(
+                            f"CREATE TABLE {qn(name)} PARTITION OF {qn(table)} "
+                            f"FOR VALUES FROM ({lower}) TO ({upper})"
+                        )
+                created.append(name)
+            start = add_months(start, 1)
+    return created
+
+
+def convert_table(table, months_ahead):
+    """
+    Rewrite an ordinary table as a monthly partitioned table.
+    
+    Runs in one transaction holding an ACCESS EXCLUSIVE lock on the
+    table, so reads and writes wait until it commits. Constraints and
+    indexes are recreated under their original names, and single-column
+    unique constraints get a guard table (create_unique_guard).
+    
+    Args:
+        table (str): Table to convert
+        months_ahead (int): Future months to create partitions for
+    
+    Raises:
+        PartitioningError: If another table has a foreign key to it
+    """
+    qn = connection.ops.quote_name
+    old = f"{table}_unpartitioned"
+    
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {qn(table)} IN ACCESS EXCLUSIVE MODE")
+        
+        cursor.execute(
+            "SELECT conname FROM pg_constraint WHERE confrelid = to_regclass(%s)",
+            [table]
+        )
+        referencing = [row[0] for row in cursor.fetchall()]
+        if referencing:
+            raise PartitioningError(
+                f"{table} is referenced by foreign keys ({', '.join(referencing)})"
+            )
+        
+        cursor.execute(
+            "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'u', 'f')",
+            [table]
+        )
+        constraints = cursor.fetchall()
+        constraint_names = {name for name, _, _ in constraints}
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE schemaname = current_schema() AND tablename = %s",
+            [table]
+        )
+        indexes = [
+            (name, definition) for name, definition in cursor.fetchall()
+            if name not in constraint_names
+        ]
+        cursor.execute(f"SELECT MIN({PARTITION_KEY}) FROM {qn(table)}")
+        oldest = cursor.fetchone()[0] or timezone.now()
+        
+        cursor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(old)}")
+        # No INCLUDING DEFAULTS/IDENTITY: the id sequence is recreated below
+        cursor.execute(
+            f"CREATE TABLE {qn(table)} "
+            f"(LIKE {qn(old)} INCLUDING CONSTRAINTS INCLUDING STORAGE INCLUDING COMMENTS) "
+            f"PARTITION BY RANGE ({PARTITION_KEY})"
+        )
+        cursor.execute(f"CREATE TABLE {qn(table + '_default')} PARTITION OF {qn(table)} DEFAULT")
+        ensure_partitions(table, month_start(oldest), add_months(month_start(timezone.now()), months_ahead))
+        
+        cursor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(old)}")
+        # Also drops the old identity sequence and frees the index names
+        cursor.execute(f"DROP TABLE {qn(old)}")
+        
+        sequence = f"{table}_id_seq"
+        cursor.execute(f"CREATE SEQUENCE {qn(sequence)} OWNED BY {qn(table)}.id")
+        cursor.execute(f"ALTER TABLE {qn(table)} ALTER COLUMN id SET DEFAULT nextval('{sequence}')")
+        cursor.execute(
+            f"SELECT setval('{sequence}', COALESCE((SELECT MAX(id) FROM {qn(table)}), 0) + 1, false)"
+        )
+        
+        guarded = []
+        for name, contype, definition in constraints:
+            if contype == 'u' and _single_column(definition):
+                guarded.append(_single_column(definition))
+            if contype in ('p', 'u'):
+                definition = with_partition_key(definition)
+            cursor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}")
+        for name, definition in indexes:
+            if definition.startswith('CREATE UNIQUE INDEX'):
+                if _single_column(definition):
+                    guarded.append(_single_column(definition))
+                definition = with_partition_key(definition)
+            cursor.execute(definition)
+        for column in guarded:
+            create_unique_guard(cursor, table, column)
+        cursor.execute(
+            f"CREATE INDEX {qn(table + '_created_at_brin')} ON {qn(table)} USING brin ({PARTITION_KEY})"
+        )
+        cursor.execute(f"ANALYZE {qn(table)}")
@@ -43,3 +43,20 @@ class IsAdminOrReadOnly(permissions.BasePermission):
             hasattr(request.user, 'role') and
             request.user.role in ['admin', 'moderator']
         )
+
+
+class IsPartner(permissions.BasePermission):
+    """
+    Permission class that allows only requests authenticated with a
+    partner API key. Used for partner intake endpoints.
+    """
+    
+    def has_permission(self, request, view):
+        """
+        Check if the request was authenticated as a partner.
+        """
+        return bool(
+            request.user and
+            request.user.is_authenticated and
+            getattr(request.user, 'is_partner', False)
+        )
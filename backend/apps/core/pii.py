@@ -0,0 +1,273 @@
+"""
+Single-pass PII detection and redaction engine for ShieldHer.
+
+All PII patterns are combined into one alternation with a named group
+per PII type. One scan over the text returns typed spans, and those same
+spans drive detection, redaction and the redaction_applied flag.
+Reports, donations and log filtering share it.
+
+Most descriptions contain no digits and no "@", so cheap prefilters
+first rule out the patterns that cannot match, and the scan uses a
+combined regex of only the remaining patterns (compiled once per
+combination and cached).
+
+Patterns are written so that every scan runs in linear time: runs of
+characters are only consumed from their first character, and all other
+repetitions are bounded or cannot overlap.
+"""
+
+import re
+from collections import namedtuple
+
+# One detected piece of PII: its type and [start, end) offsets in the text
+PIISpan = namedtuple('PIISpan', ['type', 'start', 'end'])
+
+# Words that follow "my name is", "I am" or "called" in ordinary
+# sentences ("i am so scared", "called the police"). Names are matched
+# in any case, so a name whose first or last word is one of these is
+# not redacted.
+NAME_STOPWORDS = (
+    # articles, pronouns and determiners
+    'a', 'an', 'the', 'this', 'that', 'these', 'those', 'it', 'its', 'me',
+    'my', 'mine', 'myself', 'you', 'your', 'he', 'him', 'his', 'she', 'her',
+    'we', 'us', 'our', 'they', 'them', 'their', 'someone', 'somebody',
+    'something', 'anyone', 'everyone', 'nobody', 'no', 'not', 'all', 'some',
+    'any', 'every', 'each', 'both', 'one', 'two', 'many', 'much', 'more',
+    'most', 'other', 'another', 'same', 'new', 'last', 'next', 'first',
+    # prepositions and conjunctions
+    'in', 'on', 'at', 'to', 'of', 'for', 'from', 'with', 'without', 'by',
+    'about', 'after', 'before', 'into', 'out', 'up', 'down', 'over', 'under',
+    'back', 'and', 'or', 'but', 'so', 'because', 'if', 'when', 'while', 'as',
+    'than', 'then', 'since', 'until',
+    # adverbs
+    'very', 'really', 'too', 'just', 'still', 'also', 'now', 'here', 'there',
+    'always', 'never', 'often', 'again', 'already', 'currently', 'almost',
+    'only', 'even', 'quite', 'constantly', 'literally', 'honestly', 'today',
+    'yesterday', 'tonight', 'twice', 'once', 'home', 'alone',
+    # verbs and adjectives (not modals: Will and May are also names)
+    'is', 'are', 'was', 'were', 'be', 'been', 'being', 'am', 'have', 'has',
+    'had', 'do', 'does', 'did', 'going', 'getting', 'trying', 'writing',
+    'reporting', 'sending', 'living', 'staying', 'working', 'asking',
+    'looking', 'feeling', 'receiving', 'afraid', 'scared', 'terrified',
+    'frightened', 'worried', 'nervous', 'sure', 'sorry', 'tired', 'sick',
+    'safe', 'unsafe', 'okay', 'ok', 'fine', 'upset', 'angry', 'sad',
+    'desperate', 'pregnant', 'married', 'stuck', 'lost', 'unable', 'able',
+    'harassed', 'stalked', 'threatened', 'followed', 'blocked', 'ignored',
+    'names', 'police', 'help', 'hotline',
+)
+
+_NOT_NAME_STOPWORD = r'(?!(?:' + '|'.join(NAME_STOPWORDS) + r')\b)'
+
+# Ordered (type, pattern) pairs. Earlier patterns win when two could
+# match at the same position. A "<type>_value" group, if present, limits
+# the redacted span to part of the match.
+PII_PATTERNS = [
+    ('email', (
+        r'(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+'
+        r'@(?:[A-Za-z0-9-]+\.)+[A-Za-z]{2,}\b'
+    )),
+    ('ssn', r'\b\d{3}-\d{2}-\d{4}\b'),
+    ('credit_card', r'\b(?:\d{4}[-\s]?){3}\d{4}\b|\b\d{13,19}\b'),
+    ('phone', (
+        r'\(\d{3}\)\s?\d{3}[-.\s]?\d{4}\b'
+        r'|\b(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b'
+        r'|\+\d{1,3}[-.\s]?\d{6,14}\b'
+    )),
+    ('address', (
+        r'\b\d+\s+[A-Za-z]+\s+'
+        r'(?i:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Lane|Ln|Drive|Dr)\b'
+    )),
+    ('full_name', (
+        r"\b(?i:my name is|i am|i'm|called)\s+"
+        r'(?P<full_name_value>(?i:'
+        + _NOT_NAME_STOPWORD + r'[a-z]{2,}\s+' + _NOT_NAME_STOPWORD + r'[a-z]{2,}'
+        r'))\b'
+    )),
+]
+
+# Extra patterns only applied to log records
+LOG_PII_PATTERNS = PII_PATTERNS + [
+    ('ip_address', r'\b(?:\d{1,3}\.){3}\d{1,3}\b'),
+]
+
+# Text every match of a pattern must contain. Patterns without an entry
+# are always scanned for.
+_DIGIT = re.compile(r'\d')
+PII_PREFILTERS = {
+    'email': re.compile('@'),
+    'ssn': _DIGIT,
+    'credit_card': _DIGIT,
+    'phone': _DIGIT,
+    'address': _DIGIT,
+    'ip_address': _DIGIT,
+}
+
+REDACTION_LABELS = {
+    'email': '[EMAIL_REDACTED]',
+    'ssn': '[SSN_REDACTED]',
+    'credit_card': '[CREDIT_CARD_REDACTED]',
+    'phone': '[PHONE_REDACTED]',
+    'address': '[ADDRESS_REDACTED]',
+    'full_name': '[NAME_REDACTED]',
+    'ip_address': '[IP_REDACTED]',
+}
+
+
+class PIIEngine:
+    """
+    Detects and redacts PII with a single combined regular expression.
+    
+    Args:
+        patterns (list): Ordered (type, pattern) pairs
+        prefilters (dict): Optional type -> compiled regex that must match
+            somewhere in the text for that type to be scanned for
+    """
+    
+    def __init__(self, patterns, prefilters=None):
+        self.patterns = list(patterns)
+        self.types = [pii_type for pii_type, _ in self.patterns]
+        self.prefilters = {
+            pii_type: prefilter
+            for pii_type, prefilter in (prefilters or {}).items()
+            if pii_type in self.types
+        }
+        self._regexes = {}
+        self.regex = self._compile(tuple(self.types))
+        self._value_groups = {
+            pii_type: f'{pii_type}_value'
+            for pii_type in self.types
+            if f'{pii_type}_value' in self.regex.groupindex
+        }
+    
+    def _compile(self, types):
+        """Get the combined regex for a subset of types, in pattern order."""
+        regex = self._regexes.get(types)
+        if regex is None:
+            regex = re.compile('|'.join(
+                f'(?P<{pii_type}>{pattern})'
+                for pii_type, pattern in self.patterns
+                if pii_type in types
+            ))
+            self._regexes[types] = regex
+        return regex
+    
+    def _regex_for(self, text):
+        """Get the combined regex of the types text could contain."""
+        if not self.prefilters:
+            return self.regex
+        
+        # Prefilters shared between types are only run once
+        results = {}
+        types = []
+        for pii_type in self.types:
+            prefilter = self.prefilters.get(pii_type)
+            if prefilter is not None:
+                if prefilter not in results:
+                    results[prefilter] = prefilter.search(text) is not None
+                if not results[prefilter]:
+                    continue
+            types.append(pii_type)
+        
+        if not types:
+            return None
+        return self._compile(tuple(types))
+    
+    def scan(self, text):
+        """
+        Find all PII in text in one pass.
+        
+        Args:
+            text (str): Text to scan
+        
+        Returns:
+            list: PIISpan for each match, in order of position
+        """
+        if not text:
+            return []
+        
+        regex = self._regex_for(text)
+        if regex is None:
+            return []
+        
+        spans = []
+        for match in regex.finditer(text):
+            pii_type = match.lastgroup
+            start, end = match.span(self._value_groups.get(pii_type, pii_type))
+            spans.append(PIISpan(pii_type, start, end))
+        return spans
+    
+    def detect(self, text, spans=None):
+        """
+        Get the PII types present in text.
+        
+        Returns:
+            list: Detected types in pattern order, e.g. ['email', 'phone']
+        """
+        if spans is None:
+            spans = self.scan(text)
+        found = {span.type for span in spans}
+        return [pii_type for pii_type in self.types if pii_type in found]
+    
+    def redact(self, text, spans=None):
+        """
+        Replace each PII span with its redaction label.
+        
+        Returns:
+            str: Redacted text
+        """
+        if spans is None:
+            spans = self.scan(text)
+        if not spans:
+            return text
+        
+        parts = []
+        position = 0
+        for span in spans:
+            parts.append(text[position:span.start])
+            parts.append(REDACTION_LABELS[span.type])
+            position = span.end
+        parts.append(text[position:])
+        return ''.join(parts)
+    
+    def process(self, text):
+        """
+        Scan once and return both the redacted text and the spans.
+        
+        Returns:
+            tuple: (redacted_text, spans)
+        """
+        spans = self.scan(text)
+        return self.redact(text, spans), spans
+
+
+# Shared engines
+pii_engine = PIIEngine(PII_PATTERNS, PII_PREFILTERS)
+log_pii_engine = PIIEngine(LOG_PII_PATTERNS, PII_PREFILTERS)
+
+
+def detect_pii(text):
+    """
+    Detect potential PII (Personally Identifiable Information) in text.
+    
+    Args:
+        text (str): The text to check for PII
+    
+    Returns:
+        list: List of detected PII types, empty if none found
+    """
+    return pii_engine.detect(text)
+
+
+def redact_pii(text):
+    """
+    Redact potential PII from text by replacing it with a redaction label.
+    
+    Args:
+        text (str): The text to redact PII from
+    
+    Returns:
+        str: Text with PII redacted
+    """
+    if not text:
+        return text
+    return pii_engine.redact(text)
@@ -0,0 +1,15 @@
+"""
+Custom throttles for ShieldHer API.
+"""
+
+from rest_framework.throttling import UserRateThrottle
+
+
+class PartnerIntakeThrottle(UserRateThrottle):
+    """
+    Rate limit for partner intake, per API key.
+    Partner requests are authenticated, so the anonymous throttle does
+    not apply; this one ('partner_intake' in DEFAULT_THROTTLE_RATES)
+    does instead.
+    """
+    scope = 'partner_intake'
@@ -3,34 +3,105 @@ Core utilities for ShieldHer platform.
 Provides encryption, validation, and helper functions.
 """
 
-import os
-from cryptography.fernet import Fernet
+import functools
+import multiprocessing
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from cryptography.fernet import Fernet, MultiFernet
 from django.conf import settings
-import base64
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from .pii import detect_pii, redact_pii  # noqa: F401 (re-exported)
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-def get_encryption_key():
+class KeyRing:
     """
-    Get the encryption key from settings.
-    Ensures the key is properly formatted for Fernet.
+    Ordered set of Fernet keys, validated once and shared per process.
+    
+    The first key encrypts new values. Every key is tried on decryption,
+    so values written under a previous key stay readable after rotation.
+    
+    Args:
+        keys (list): Fernet keys (str or bytes), primary key first
+    
+    Raises:
+        ImproperlyConfigured: If no keys are given or a key is malformed
     """
-    key = settings.ENCRYPTION_KEY
     
-    # If key is not already base64 encoded, encode it
-    if not key:
-        raise ValueError("ENCRYPTION_KEY not set in settings")
+    def __init__(self, keys):
+        if not keys:
+            raise ImproperlyConfigured("ENCRYPTION_KEY not set in settings")
+        
+        fernets = []
+        for index, key in enumerate(keys):
+            if isinstance(key, str):
+                key = key.encode()
+            try:
+                fernets.append(Fernet(key))
+            except (TypeError, ValueError) as e:
+                # Never include the key itself in the message
+                raise ImproperlyConfigured(
+                    f"Encryption key #{index} is not a valid Fernet key"
+                ) from e
+        
+        self.keys = [key.encode() if isinstance(key, str) else key for key in keys]
+        self.primary_key = self.keys[0]
+        self._cipher = MultiFernet(fernets)
     
-    try:
-        # Try to use it as-is first
-        Fernet(key.encode() if isinstance(key, str) else key)
-        return key.encode() if isinstance(key, str) else key
-    except Exception:
-        # If that fails, generate a proper key
-        logger.warning("Invalid encryption key format, generating new key")
-        return Fernet.generate_key()
+    def encrypt(self, data):
+        """Encrypt bytes with the primary key."""
+        return self._cipher.encrypt(data)
+    
+    def decrypt(self, token):
+        """Decrypt a token with whichever key in the ring produced it."""
+        return self._cipher.decrypt(token)
+    
+    def rotate(self, token):
+        """Re-encrypt a token under the primary key."""
+        return self._cipher.rotate(token)
+
+
+@functools.lru_cache(maxsize=None)
+def get_key_ring():
+    """
+    Get the process-wide key ring built from settings.
+    
+    ENCRYPTION_KEY is the primary key and ENCRYPTION_KEY_FALLBACKS lists
+    retired keys that may still be needed to read older values.
+    
+    Returns:
+        KeyRing: The cached key ring
+    """
+    keys = [settings.ENCRYPTION_KEY] if settings.ENCRYPTION_KEY else []
+    keys.extend(getattr(settings, 'ENCRYPTION_KEY_FALLBACKS', []))
+    return KeyRing(keys)
+
+
+@receiver(setting_changed)
+def _reset_key_ring(sender, setting, **kwargs):
+    """Drop the cached key ring when encryption settings are overridden."""
+    global _decrypt_pool
+    if setting in ('ENCRYPTION_KEY', 'ENCRYPTION_KEY_FALLBACKS', 'DECRYPTION_POOL'):
+        get_key_ring.cache_clear()
+        with _decrypt_pool_lock:
+            if _decrypt_pool is not None:
+                _decrypt_pool.shutdown(wait=False)
+                _decrypt_pool = None
+
+
+def get_encryption_key():
+    """
+    Get the primary encryption key from settings.
+    
+    Raises:
+        ImproperlyConfigured: If the key is missing or malformed
+    """
+    return get_key_ring().primary_key
 
 
 def encrypt_field(value):
@@ -39,7 +110,7 @@ def encrypt_field(value):
     
     Args:
         value (str): The value to encrypt
-        
+    
     Returns:
         str: The encrypted value as a string
     """
@@ -47,15 +118,12 @@ def encrypt_field(value):
         return value
     
     try:
-        key = get_encryption_key()
-        f = Fernet(key)
-        
         # Convert to bytes if string
         if isinstance(value, str):
             value = value.encode('utf-8')
         
         # Encrypt and return as string
-        encrypted = f.encrypt(value)
+        encrypted = get_key_ring().encrypt(value)
         return encrypted.decode('utf-8')
     except Exception as e:
         logger.error(f"Encryption error: {e}")
@@ -65,158 +133,214 @@ def encrypt_field(value):
 def decrypt_field(encrypted_value):
     """
     Decrypt a field value using Fernet symmetric encryption.
+    Handles master-key tokens and text or binary envelope tokens.
     
     Args:
         encrypted_value (str): The encrypted value
-        
+    
     Returns:
         str: The decrypted value as a string
     """
+    from .envelope import envelope_decrypt, token_key_id
+    
     if not encrypted_value:
         return encrypted_value
     
     try:
-        key = get_encryption_key()
-        f = Fernet(key)
+        if token_key_id(encrypted_value) is not None:
+            return envelope_decrypt(encrypted_value)
         
         # Convert to bytes if string
         if isinstance(encrypted_value, str):
             encrypted_value = encrypted_value.encode('utf-8')
         
         # Decrypt and return as string
-        decrypted = f.decrypt(encrypted_value)
+        decrypted = get_key_ring().decrypt(encrypted_value)
         return decrypted.decode('utf-8')
     except Exception as e:
         logger.error(f"Decryption error: {e}")
         raise
 
 
-def generate_confirmation_code(prefix="SH"):
+# Result of decrypting one value in decrypt_many()
+DecryptResult = namedtuple('DecryptResult', ['value', 'ok'])
+
+# Batches smaller than this are decrypted inline; a pool round trip costs more
+DECRYPT_INLINE_THRESHOLD = 32
+
+_decrypt_pool = None
+_decrypt_pool_lock = threading.Lock()
+_worker_key_ring = None
+
+
+def _init_decrypt_worker(keys):
+    """Build the key ring once in each decryption worker process."""
+    global _worker_key_ring
+    _worker_key_ring = KeyRing(keys)
+
+
+def _get_decrypt_pool():
     """
-    Generate a unique, non-identifying confirmation code.
+    Get the shared, bounded pool used by decrypt_many() and
+    redact_and_encrypt_many().
     
-    Args:
-        prefix (str): Prefix for the code (default: "SH")
-        
-    Returns:
-        str: A confirmation code like "SH-2025-A7B9C2"
+    DECRYPTION_POOL selects 'thread' (default) or 'process'. Process
+    workers decrypt in true parallel on multi-core hosts at the cost of
+    sending ciphertexts between processes.
     """
-    import uuid
-    from django.utils import timezone
-    
-    year = timezone.now().year
-    random_part = uuid.uuid4().hex[:6].upper()
+    global _decrypt_pool
+    if _decrypt_pool is None:
+        with _decrypt_pool_lock:
+            if _decrypt_pool is None:
+                if settings.DECRYPTION_POOL == 'process':
+                    _decrypt_pool = ProcessPoolExecutor(
+                        max_workers=settings.DECRYPTION_MAX_WORKERS,
+                        mp_context=multiprocessing.get_context('spawn'),
+                        initializer=_init_decrypt_worker,
+                        initargs=(get_key_ring().keys,)
+                    )
+                else:
+                    _decrypt_pool = ThreadPoolExecutor(
+                        max_workers=settings.DECRYPTION_MAX_WORKERS,
+                        thread_name_prefix='decrypt'
+                    )
+    return _decrypt_pool
+
+
+def _decrypt_chunk(key_ring, data_keys, encrypted_values):
+    """Decrypt a list of values, flagging failures instead of raising."""
+    from .envelope import decrypt_with_data_key, token_key_id
     
-    return f"{prefix}-{year}-{random_part}"
+    results = []
+    for encrypted_value in encrypted_values:
+        if not encrypted_value:
+            results.append(DecryptResult(encrypted_value, True))
+            continue
+        try:
+            key_id = token_key_id(encrypted_value)
+            if key_id is not None:
+                decrypted = decrypt_with_data_key(encrypted_value, data_keys[key_id])
+            else:
+                if isinstance(encrypted_value, str):
+                    encrypted_value = encrypted_value.encode('utf-8')
+                decrypted = key_ring.decrypt(encrypted_value).decode('utf-8')
+            results.append(DecryptResult(decrypted, True))
+        except Exception:
+            results.append(DecryptResult(None, False))
+    return results
 
 
-def detect_pii(text):
+def _decrypt_chunk_in_worker(data_keys, encrypted_values):
+    """Decrypt a chunk inside a worker process."""
+    return _decrypt_chunk(_worker_key_ring, data_keys, encrypted_values)
+
+
+def decrypt_many(encrypted_values, chunk_size=64):
     """
-    Detect potential PII (Personally Identifiable Information) in text.
+    Decrypt many field values in a bounded worker pool.
     
-    This is a basic implementation that checks for common PII patterns:
-    - Email addresses
-    - Phone numbers
-    - Social security numbers
-    - Credit card numbers
+    Results are returned in input order. A value that cannot be decrypted
+    yields DecryptResult(None, False) rather than raising, so one bad row
+    does not break a whole admin page or export.
     
     Args:
-        text (str): The text to check for PII
-        
+        encrypted_values (iterable): Encrypted values (str or bytes)
+        chunk_size (int): Number of values each worker task decrypts
+    
     Returns:
-        list: List of detected PII types, empty if none found
+        list: DecryptResult(value, ok) for each input value
     """
-    import re
+    from .envelope import load_data_keys, token_key_id
     
-    if not text:
-        return []
+    encrypted_values = list(encrypted_values)
+    key_ring = get_key_ring()
     
-    detected = []
+    # Unwrap every data key the batch needs up front, in this thread,
+    # so workers never touch the database
+    key_ids = set()
+    for value in encrypted_values:
+        try:
+            key_ids.add(token_key_id(value))
+        except ValueError:
+            pass  # Reported as a failure for that row below
+    key_ids.discard(None)
+    data_keys = load_data_keys(key_ids, skip_unreadable=True)
     
-    # Email pattern
-    if re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text):
-        detected.append('email')
+    if len(encrypted_values) < DECRYPT_INLINE_THRESHOLD:
+        results = _decrypt_chunk(key_ring, data_keys, encrypted_values)
+    else:
+        chunks = [
+            encrypted_values[i:i + chunk_size]
+            for i in range(0, len(encrypted_values), chunk_size)
+        ]
+        pool = _get_decrypt_pool()
+        if isinstance(pool, ProcessPoolExecutor):
+            chunk_results = pool.map(functools.partial(_decrypt_chunk_in_worker, data_keys), chunks)
+        else:
+            chunk_results = pool.map(functools.partial(_decrypt_chunk, key_ring, data_keys), chunks)
+        results = []
+        for chunk in chunk_results:
+            results.extend(chunk)
     
-    # Phone number patterns (various formats)
-    phone_patterns = [
-        r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',  # 123-456-7890 or 1234567890
-        r'\(\d{3}\)\s*\d{3}[-.]?\d{4}',     # (123) 456-7890
-        r'\+\d{1,3}\s?\d{1,14}',            # International format
-    ]
-    for pattern in phone_patterns:
-        if re.search(pattern, text):
-            detected.append('phone')
-            break
+    failures = sum(1 for result in results if not result.ok)
+    if failures:
+        logger.error(f"Decryption failed for {failures} of {len(results)} values")
     
-    # SSN pattern (123-45-6789)
-    if re.search(r'\b\d{3}-\d{2}-\d{4}\b', text):
-        detected.append('ssn')
-    
-    # Credit card pattern (basic check for 13-19 digit sequences)
-    if re.search(r'\b\d{13,19}\b', text):
-        detected.append('credit_card')
-    
-    # Address patterns (basic - street numbers)
-    if re.search(r'\b\d+\s+[A-Za-z]+\s+(Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Lane|Ln|Drive|Dr)\b', text, re.IGNORECASE):
-        detected.append('address')
-    
-    return list(set(detected))  # Remove duplicates
+    return results
+
 
+# Result of redacting and encrypting one text in redact_and_encrypt_many()
+ProtectedText = namedtuple('ProtectedText', ['token', 'pii_types', 'redacted'])
 
 
-def redact_pii(text):
+def _redact_encrypt_chunk(key_id, raw_key, algorithm, texts):
+    """Redact and encrypt a list of texts with one data key."""
+    from .envelope import encode_binary
+    from .pii import pii_engine
+    
+    results = []
+    for text in texts:
+        if not text:
+            results.append(ProtectedText(text, [], text))
+            continue
+        redacted, spans = pii_engine.process(text)
+        token = encode_binary(redacted.encode('utf-8'), key_id, raw_key, algorithm)
+        results.append(ProtectedText(token, pii_engine.detect(text, spans) if spans else [], redacted))
+    return results
+
+
+def redact_and_encrypt_many(texts, purpose, chunk_size=64):
     """
-    Redact potential PII from text by replacing it with [REDACTED].
+    Redact PII from many texts and encrypt them, in the bulk worker pool.
+    
+    Each text is scanned once; the redacted text is encrypted into a
+    binary token (as EncryptedBinaryField would) with the purpose's
+    current data key. With DECRYPTION_POOL = 'process' the scanning and
+    encryption run in parallel across cores.
     
     Args:
-        text (str): The text to redact PII from
-        
+        texts (iterable): Plaintexts
+        purpose (str): Data key purpose (e.g. 'reports')
+        chunk_size (int): Number of texts each worker task handles
+    
     Returns:
-        str: Text with PII redacted
-    """
-    import re
-    
-    if not text:
-        return text
-    
-    redacted_text = text
-    
-    # Redact email addresses
-    redacted_text = re.sub(
-        r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-        '[EMAIL REDACTED]',
-        redacted_text
-    )
-    
-    # Redact phone numbers
-    phone_patterns = [
-        r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',
-        r'\(\d{3}\)\s*\d{3}[-.]?\d{4}',
-        r'\+\d{1,3}\s?\d{1,14}',
-    ]
-    for pattern in phone_patterns:
-        redacted_text = re.sub(pattern, '[PHONE REDACTED]', redacted_text)
-    
-    # Redact SSN
-    redacted_text = re.sub(
-        r'\b\d{3}-\d{2}-\d{4}\b',
-        '[SSN REDACTED]',
-        redacted_text
-    )
-    
-    # Redact potential credit card numbers
-    redacted_text = re.sub(
-        r'\b\d{13,19}\b',
-        '[NUMBER REDACTED]',
-        redacted_text
-    )
-    
-    # Redact addresses
-    redacted_text = re.sub(
-        r'\b\d+\s+[A-Za-z]+\s+(Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Lane|Ln|Drive|Dr)\b',
-        '[ADDRESS REDACTED]',
-        redacted_text,
-        flags=re.IGNORECASE
-    )
-    
-    return redacted_text
+        list: ProtectedText(token, pii_types, redacted) for each text,
+            in order; pii_types is empty when nothing was redacted
+    """
+    from .envelope import get_data_key
+    
+    texts = list(texts)
+    key_id, raw_key = get_data_key(purpose)
+    if key_id > 0xFFFFFFFF:
+        raise ValueError("Data key id does not fit in a binary token header")
+    encrypt_chunk = functools.partial(_redact_encrypt_chunk, key_id, raw_key, settings.ENCRYPTION_AEAD)
+    
+    if len(texts) < DECRYPT_INLINE_THRESHOLD:
+        return encrypt_chunk(texts)
+    
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    results = []
+    for chunk in _get_decrypt_pool().map(encrypt_chunk, chunks):
+        results.extend(chunk)
+    return results
+
@@ -3,11 +3,12 @@ Admin interface for donations.
 """
 
 from django.contrib import admin
+from apps.core.admin_mixins import LargeTableAdminMixin
 from .models import Donation
 
 
 @admin.register(Donation)
-class DonationAdmin(admin.ModelAdmin):
+class DonationAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """
     Admin interface for managing donations.
     Sensitive payment details are never displayed.
@@ -23,6 +24,7 @@ class DonationAdmin(admin.ModelAdmin):
     ]
     list_filter = ['status', 'is_anonymous', 'currency', 'created_at']
     search_fields = ['confirmation_code', 'payment_intent_id']
+    list_defer = ['message']
     readonly_fields = [
         'confirmation_code',
         'payment_intent_id',
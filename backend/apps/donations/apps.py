@@ -5,3 +5,9 @@ class DonationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.donations'
     verbose_name = 'Donations'
+
+    def ready(self):
+        # Drop cached dashboard stats whenever a donation changes
+        from .models import Donation
+        from .stats import donation_stats_cache
+        donation_stats_cache.watch(Donation)
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("donations", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="donation",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="donations_created_617964_idx"
+            ),
+        ),
+    ]
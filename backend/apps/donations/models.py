@@ -5,7 +5,10 @@ PRIVACY-FIRST: Minimal donor information, optional anonymity.
 
 from django.db import models
 from apps.core.models import TimeStampedModel
-from apps.core.utils import generate_confirmation_code, detect_pii
+from apps.core.pii import detect_pii
+from apps.core.codes import ConfirmationCodeAllocator
+
+confirmation_codes = ConfirmationCodeAllocator('DON', models=('donations.Donation',))
 
 
 class Donation(TimeStampedModel):
@@ -86,6 +89,8 @@ class Donation(TimeStampedModel):
             models.Index(fields=['status', '-created_at']),
             models.Index(fields=['confirmation_code']),
             models.Index(fields=['payment_intent_id']),
+            # Keyset pagination order
+            models.Index(fields=['-created_at', '-id']),
         ]
     
     def save(self, *args, **kwargs):
@@ -93,7 +98,7 @@ class Donation(TimeStampedModel):
         Override save to generate confirmation code and check for PII in message.
         """
         if not self.confirmation_code:
-            self.confirmation_code = generate_confirmation_code(prefix="DON")
+            self.confirmation_code = confirmation_codes.allocate()
         
         # Detect PII in message if present
         if self.message:
@@ -4,7 +4,7 @@ Serializers for donations API.
 
 from rest_framework import serializers
 from .models import Donation
-from apps.core.utils import detect_pii, redact_pii
+from apps.core.pii import detect_pii
 
 
 class DonationSerializer(serializers.ModelSerializer):
@@ -0,0 +1,41 @@
+"""
+Aggregated donation statistics for the admin dashboard.
+"""
+
+from django.db.models import Avg, Count, Sum
+from apps.core.cache import StatsCache
+from .models import Donation
+
+# Invalidated whenever a donation is saved or deleted (see DonationsConfig.ready)
+donation_stats_cache = StatsCache('donations')
+
+
+def compute_donation_stats():
+    """
+    Compute totals over completed donations.
+    
+    Returns:
+        dict: total_amount, total_count, average_amount and currency
+    """
+    total_donations = Donation.objects.filter(status='completed').aggregate(
+        total_amount=Sum('amount'),
+        count=Count('id'),
+        average=Avg('amount')
+    )
+    
+    return {
+        'total_amount': float(total_donations['total_amount'] or 0),
+        'total_count': total_donations['count'],
+        'average_amount': float(total_donations['average'] or 0),
+        'currency': 'USD'
+    }
+
+
+def get_donation_stats():
+    """
+    Get donation statistics, from the stats cache when possible.
+    
+    Returns:
+        dict: Same shape as compute_donation_stats()
+    """
+    return donation_stats_cache.get_or_compute(compute_donation_stats)
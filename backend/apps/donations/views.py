@@ -6,6 +6,7 @@ from rest_framework import viewsets, status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from apps.core.pagination import PageOrKeysetPagination
 from apps.core.permissions import IsAdminUser
 from .models import Donation
 from .serializers import (
@@ -14,6 +15,7 @@ from .serializers import (
     DonationAdminSerializer
 )
 from .payment import process_payment
+from .stats import get_donation_stats
 
 
 class DonationViewSet(viewsets.ModelViewSet):
@@ -25,10 +27,11 @@ class DonationViewSet(viewsets.ModelViewSet):
     - retrieve: GET /api/donations/{confirmation_code}/
     
     Admin endpoints (JWT required):
-    - list: GET /api/donations/
+    - list: GET /api/donations/?page=2, or ?cursor= for keyset pages
     """
     queryset = Donation.objects.all()
     lookup_field = 'confirmation_code'
+    pagination_class = PageOrKeysetPagination
     
     def get_permissions(self):
         """
@@ -130,19 +133,7 @@ class DonationViewSet(viewsets.ModelViewSet):
     def stats(self, request):
         """
         Get donation statistics (admin only).
+        Cached until a donation changes.
         GET /api/donations/stats/
         """
-        from django.db.models import Sum, Count, Avg
-        
-        total_donations = Donation.objects.filter(status='completed').aggregate(
-            total_amount=Sum('amount'),
-            count=Count('id'),
-            average=Avg('amount')
-        )
-        
-        return Response({
-            'total_amount': float(total_donations['total_amount'] or 0),
-            'total_count': total_donations['count'],
-            'average_amount': float(total_donations['average'] or 0),
-            'currency': 'USD'
-        })
+        return Response(get_donation_stats())
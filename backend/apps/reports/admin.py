@@ -4,14 +4,17 @@ READ-ONLY to preserve evidence integrity.
 """
 
 from django.contrib import admin
-from .models import Report
+from apps.core.admin_mixins import LargeTableAdminMixin
+from .models import PendingReport, Report
 
 
 @admin.register(Report)
-class ReportAdmin(admin.ModelAdmin):
+class ReportAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """
     Admin interface for viewing reports.
     READ-ONLY to preserve evidence integrity.
+    
+    The description previews of a list page are decrypted in one batch.
     """
     list_display = [
         'confirmation_code',
@@ -19,14 +22,17 @@ class ReportAdmin(admin.ModelAdmin):
         'timestamp',
         'redaction_applied',
         'consent_for_followup',
+        'description_preview',
         'created_at'
     ]
     list_filter = ['incident_type', 'redaction_applied', 'consent_for_followup', 'created_at']
+    # Descriptions are searched through the blind keyword index
     search_fields = ['confirmation_code', 'location_free_text']
+    search_help_text = "Searches confirmation codes, locations and description keywords."
     readonly_fields = [
         'confirmation_code',
         'incident_type',
-        'description',
+        'encrypted_description_display',
         'timestamp',
         'location_free_text',
         'evidence_links',
@@ -43,7 +49,7 @@ class ReportAdmin(admin.ModelAdmin):
             'fields': ('confirmation_code', 'incident_type', 'timestamp')
         }),
         ('Content (Encrypted)', {
-            'fields': ('description',),
+            'fields': ('encrypted_description_display',),
             'description': 'This field is encrypted. Use the decrypted view below.'
         }),
         ('Content (Decrypted)', {
@@ -62,6 +68,42 @@ class ReportAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Also match descriptions, through the blind keyword index.
+        Keyword hits come from the queryset passed in, so active filters
+        and the date hierarchy still apply to them.
+        """
+        from .search import search_report_ids
+        
+        filtered = queryset
+        queryset, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            queryset |= filtered.filter(id__in=search_report_ids(search_term))
+        return queryset, may_have_duplicates
+    
+    def get_changelist_instance(self, request):
+        """Decrypt the previews for the whole page in one batch"""
+        changelist = super().get_changelist_instance(request)
+        Report.decrypt_descriptions(changelist.result_list)
+        return changelist
+    
+    def description_preview(self, obj):
+        """Display the start of the decrypted description"""
+        description = obj.get_decrypted_description()
+        if len(description) > 80:
+            return description[:80] + '…'
+        return description
+    description_preview.short_description = 'Description'
+    
+    def encrypted_description_display(self, obj):
+        """Display the size of the stored ciphertext without decrypting it"""
+        token = Report._meta.get_field('description').get_ciphertext(obj)
+        if not token:
+            return '-'
+        return f"{len(token)} bytes encrypted"
+    encrypted_description_display.short_description = 'Description'
+    
     def decrypted_description_display(self, obj):
         """Display decrypted description for admin viewing"""
         return obj.get_decrypted_description()
@@ -78,3 +120,25 @@ class ReportAdmin(admin.ModelAdmin):
     def has_change_permission(self, request, obj=None):
         """Reports cannot be modified to preserve evidence"""
         return False
+
+
+
+@admin.register(PendingReport)
+class PendingReportAdmin(admin.ModelAdmin):
+    """
+    Admin interface for the async report queue.
+    Shows queue depth and failed rows only - payloads stay encrypted.
+    """
+    list_display = ['confirmation_code', 'received_at', 'attempts', 'last_error', 'next_attempt_at']
+    list_filter = ['attempts']
+    search_fields = ['confirmation_code']
+    fields = ['confirmation_code', 'received_at', 'attempts', 'last_error', 'next_attempt_at']
+    readonly_fields = fields
+    
+    def has_add_permission(self, request):
+        """Pending reports can only be created through API"""
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        """Pending reports are processed by the queue worker"""
+        return False
@@ -5,3 +5,9 @@ class ReportsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.reports'
     verbose_name = 'Reports'
+
+    def ready(self):
+        # Drop cached dashboard stats whenever a report changes
+        from .models import Report
+        from .stats import report_stats_cache
+        report_stats_cache.watch(Report)
@@ -0,0 +1,170 @@
+"""
+Streaming export of reports for admins.
+
+Rows are read with a server-side cursor (QuerySet.iterator) one chunk at
+a time and written out as CSV or NDJSON as they are read, so memory use
+does not grow with the size of the export. Descriptions, when included,
+are decrypted a chunk at a time in the bulk decryption pool.
+"""
+
+import csv
+import io
+import json
+from itertools import islice
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+from .models import Report
+
+# Columns in export order; never includes anything identifying
+EXPORT_FIELDS = [
+    'id',
+    'confirmation_code',
+    'incident_type',
+    'timestamp',
+    'location_free_text',
+    'evidence_links',
+    'consent_for_followup',
+    'redaction_applied',
+    'created_at',
+]
+
+# Rows fetched, decrypted and written per chunk
+EXPORT_CHUNK_SIZE = 500
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+# Spreadsheet apps run cells starting with these as formulas
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class _ExportRenderer(BaseRenderer):
+    """
+    Lets ?format=csv|ndjson pass DRF content negotiation. The export
+    itself is a StreamingHttpResponse; only error responses are
+    rendered here, as JSON.
+    """
+    charset = 'utf-8'
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return json.dumps(data).encode(self.charset)
+
+
+class CSVExportRenderer(_ExportRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class NDJSONExportRenderer(_ExportRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+
+def _serialize(report, include_description):
+    """Get one report's export values as JSON-compatible types."""
+    row = {}
+    for name in EXPORT_FIELDS:
+        value = getattr(report, name)
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        row[name] = value
+    if include_description:
+        row['description'] = report.get_decrypted_description()
+    return row
+
+
+def iter_report_chunks(queryset, include_description=False, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield lists of serialized reports, one chunk at a time.
+    
+    Args:
+        queryset: Reports to export
+        include_description (bool): Decrypt and include descriptions
+        chunk_size (int): Rows per chunk
+    
+    Yields:
+        list: Row dicts
+    """
+    if not include_description:
+        queryset = queryset.defer('description')
+    reports = queryset.order_by('id').iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(reports, chunk_size))
+        if not chunk:
+            return
+        if include_description:
+            Report.decrypt_descriptions(chunk)
+        yield [_serialize(report, include_description) for report in chunk]
+
+
+def _csv_cell(value):
+    if isinstance(value, (list, dict)):
+        value = json.dumps(value)
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        value = "'" + value
+    return value
+
+
+def iter_csv(queryset, include_description=False, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the export as CSV text, one chunk of rows at a time."""
+    columns = EXPORT_FIELDS + (['description'] if include_description else [])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    
+    for rows in iter_report_chunks(queryset, include_description, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_cell(row[column]) for column in columns] for row in rows)
+        yield buffer.getvalue()
+
+
+def iter_ndjson(queryset, include_description=False, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the export as newline-delimited JSON, one chunk at a time."""
+    for rows in iter_report_chunks(queryset, include_description, chunk_size):
+        yield ''.join(json.dumps(row) + '\n' for row in rows)
+
+
+async def _aiter_sync(iterator):
+    """Pull each chunk of a sync iterator in the sync thread (for ASGI)."""
+    sentinel = object()
+    get_next = sync_to_async(next)
+    while True:
+        chunk = await get_next(iterator, sentinel)
+        if chunk is sentinel:
+            return
+        yield chunk
+
+
+def export_response(request, chunks, export_format, filename):
+    """
+    Build the streaming response for an export.
+    
+    Under ASGI, Django buffers sync iterators in full before sending, so
+    the chunks are wrapped in an async iterator that fetches each one in
+    the sync thread (where the database connection lives).
+    
+    Args:
+        request: The DRF or Django request
+        chunks: Sync iterator of text chunks
+        export_format (str): 'csv' or 'ndjson'
+        filename (str): Download filename
+    
+    Returns:
+        StreamingHttpResponse
+    """
+    django_request = getattr(request, '_request', request)
+    if isinstance(django_request, ASGIRequest):
+        chunks = _aiter_sync(iter(chunks))
+    response = StreamingHttpResponse(chunks, content_type=EXPORT_FORMATS[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Cache-Control'] = 'no-store'
+    response['X-Accel-Buffering'] = 'no'
+    return response
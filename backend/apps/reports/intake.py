@@ -0,0 +1,122 @@
+"""
+Bulk report intake for partner kiosks.
+
+A partner kiosk collects reports offline and syncs them in batches. Each
+batch is validated item by item, then the valid descriptions are redacted
+and encrypted together in the bulk worker pool and all the reports are
+inserted with one bulk_create. Invalid items are reported back by index
+and do not stop the rest of the batch.
+
+bulk_create skips Report.save() and model signals, so create_reports()
+does what they would: it updates the daily rollup, the keyword and
+link indexes and the similarity buckets, and invalidates the dashboard
+stats. The async report queue (apps.reports.processing) stores its
+reports the same way.
+"""
+
+from collections import Counter
+from django.db import transaction
+from apps.core.fields import Ciphertext
+from apps.core.utils import redact_and_encrypt_many
+from .links import index_report_links
+from .models import Report, ReportDailyRollup, confirmation_codes
+from .search import index_reports
+from .similarity import index_similarity
+from .serializers import ReportIntakeSerializer
+from .stats import report_stats_cache
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement
+INTAKE_BATCH_SIZE = 500
+
+
+def create_reports(entries):
+    """
+    Redact, encrypt and insert many validated reports at once.
+    
+    Descriptions are redacted and encrypted together in the bulk worker
+    pool, the reports are inserted with bulk_create, and the daily
+    rollup, the keyword and link indexes and the similarity buckets are
+    updated in the same transaction.
+    
+    Args:
+        entries (list): (validated_data, confirmation_code) pairs
+    
+    Returns:
+        list: The created reports, in order
+    """
+    protected = redact_and_encrypt_many(
+        (data['description'] for data, _ in entries),
+        Report._meta.get_field('description').purpose
+    )
+    
+    reports = []
+    pii_counts = Counter()
+    for (data, code), text in zip(entries, protected):
+        pii_counts.update(text.pii_types)
+        reports.append(Report(
+            **dict(data, description=Ciphertext(text.token)),
+            confirmation_code=code,
+            redaction_applied=bool(text.pii_types)
+        ))
+    
+    with transaction.atomic():
+        Report.objects.bulk_create(reports, batch_size=INTAKE_BATCH_SIZE)
+        
+        buckets = Counter(
+            tuple(sorted(ReportDailyRollup.key_for(report).items()))
+            for report in reports
+        )
+        for key, count in buckets.items():
+            ReportDailyRollup.increment(dict(key), count)
+        redacted = [(report, text.redacted) for report, text in zip(reports, protected)]
+        index_reports(redacted)
+        index_similarity(redacted)
+        index_report_links(reports)
+        transaction.on_commit(report_stats_cache.invalidate)
+    
+    if pii_counts:
+        # Log detection (without revealing content)
+        logger.warning(
+            "PII detected in report submissions. Types: "
+            + ', '.join(f"{pii_type} x{count}" for pii_type, count in sorted(pii_counts.items()))
+        )
+    return reports
+
+
+def ingest_reports(items):
+    """
+    Validate and store a batch of reports.
+    
+    Args:
+        items (list): Report payloads, as accepted by POST /api/reports/
+    
+    Returns:
+        list: One result per item, in order - either
+            {'index', 'confirmation_code', 'redaction_applied'} or
+            {'index', 'errors'}
+    """
+    results = [None] * len(items)
+    valid = []
+    for index, item in enumerate(items):
+        serializer = ReportIntakeSerializer(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results[index] = {'index': index, 'errors': serializer.errors}
+    
+    if not valid:
+        return results
+    
+    codes = confirmation_codes.allocate_many(len(valid))
+    reports = create_reports([(data, code) for (_, data), code in zip(valid, codes)])
+    
+    for (index, _), report in zip(valid, reports):
+        results[index] = {
+            'index': index,
+            'confirmation_code': report.confirmation_code,
+            'redaction_applied': report.redaction_applied,
+        }
+    return results
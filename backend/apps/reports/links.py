@@ -0,0 +1,165 @@
+"""
+Index of evidence links, for finding reports that cite the same URL.
+
+Report.evidence_links is a JSON list, which the database cannot look up.
+When a report is stored, each of its links is canonicalized and hashed
+with HMAC-SHA256 into ReportLink, so "every report citing this profile"
+is one lookup through a B-tree index:
+
+    linked_report_ids('https://www.example.com/fake.profile?utm_source=x')
+
+Canonicalization makes different spellings of one link hash the same:
+
+  * http and https are the same link,
+  * the host is lowercased, IDNA-encoded and loses a leading 'www.',
+    a trailing dot and default ports,
+  * tracking parameters (utm_*, fbclid, ...) and the fragment are dropped,
+    the other query parameters are sorted,
+  * a trailing slash on the path is dropped.
+
+The path keeps its case: many sites have case-sensitive profile names.
+
+Hashes are keyed (derived from SEARCH_INDEX_KEY), so the table cannot be
+matched against a list of known URLs without the key. Changing the key
+requires python manage.py rebuild_report_links.
+"""
+
+import hmac
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from django.db import transaction
+from .search import TOKEN_BYTES, get_index_key
+
+# Query parameters that identify a share or ad click, not the resource
+TRACKING_PARAMS = frozenset([
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'igsh', 'mc_cid', 'mc_eid',
+    'ref', 'ref_src', 'ref_url', 'si', 's', 't', 'feature', 'share_id',
+    '_ga', '_gl', 'yclid', 'twclid', 'ttclid', 'mibextid',
+])
+TRACKING_PARAM_PREFIXES = ('utm_', 'hsa_', 'pk_')
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def _is_tracking_param(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PARAM_PREFIXES)
+
+
+def canonicalize_url(url):
+    """
+    Reduce a URL to the canonical form that is hashed.
+    
+    Args:
+        url (str): e.g. 'HTTP://WWW.Example.com:80/Fake.Profile/?utm_source=x#top'
+    
+    Returns:
+        str: e.g. 'https://example.com/Fake.Profile', or None if the
+            URL is not an http(s) URL with a host
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except (AttributeError, ValueError):
+        return None
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return None
+    
+    host = parts.hostname.rstrip('.')
+    try:
+        host = host.encode('idna').decode('ascii')
+    except UnicodeError:
+        pass
+    host = host.lower()
+    if host.startswith('www.'):
+        host = host[len('www.'):]
+    if port is not None and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+    
+    path = parts.path.rstrip('/')
+    query = urlencode(sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    ))
+    return urlunsplit(('https', host, path, query, ''))
+
+
+def _link_key():
+    return hmac.digest(get_index_key(), b'evidence-links', 'sha256')
+
+
+def link_token(url):
+    """
+    Hash a URL for the index.
+    
+    Returns:
+        str: Hex token, or None if the URL cannot be canonicalized
+    """
+    canonical = canonicalize_url(url)
+    if canonical is None:
+        return None
+    digest = hmac.digest(_link_key(), canonical.encode('utf-8'), 'sha256')
+    return digest[:TOKEN_BYTES].hex()
+
+
+def link_tokens(urls):
+    """Get the distinct tokens of a list of URLs, skipping invalid ones."""
+    tokens = {link_token(url) for url in urls or () if isinstance(url, str)}
+    tokens.discard(None)
+    return tokens
+
+
+def index_report_links(reports):
+    """
+    Replace the link index entries of several reports.
+    
+    Args:
+        reports (iterable): Saved reports
+    """
+    from .models import ReportLink
+    
+    reports = list(reports)
+    rows = [
+        ReportLink(report_id=report.pk, token=token)
+        for report in reports
+        for token in link_tokens(report.evidence_links)
+    ]
+    with transaction.atomic():
+        ReportLink.objects.filter(report_id__in=[report.pk for report in reports]).delete()
+        ReportLink.objects.bulk_create(rows, batch_size=1000)
+
+
+def linked_report_ids(url):
+    """
+    Find the reports that cite a URL.
+    
+    Args:
+        url (str): Evidence link, in any spelling
+    
+    Returns:
+        QuerySet: Matching report ids (a values_list, usable in id__in)
+    """
+    from .models import ReportLink
+    
+    return ReportLink.objects.filter(token=link_token(url)).values_list('report_id', flat=True)
+
+
+def rebuild_link_index(chunk_size=1000):
+    """
+    Re-index the evidence links of every report.
+    
+    Returns:
+        int: Number of reports indexed
+    """
+    from itertools import islice
+    from .models import Report
+    
+    reports = Report.objects.order_by('id').only('id', 'evidence_links').iterator(chunk_size=chunk_size)
+    indexed = 0
+    while True:
+        chunk = list(islice(reports, chunk_size))
+        if not chunk:
+            return indexed
+        index_report_links(chunk)
+        indexed += len(chunk)
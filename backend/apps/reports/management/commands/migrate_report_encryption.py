@@ -0,0 +1,87 @@
+"""
+Re-encrypt report descriptions into the current storage format.
+
+Descriptions still stored in an older format (a master-key Fernet token
+"gAAAAA..." or a text envelope token "ek1:...") are decrypted and
+re-encrypted as compact binary envelope tokens, under the data key for
+the month each report was created in.
+
+Work is done in chunks ordered by id, each in its own transaction, so the
+command can be stopped and re-run at any time; rows already in the binary
+format are skipped.
+
+Usage:
+    python manage.py migrate_report_encryption [--chunk-size 500] [--after-id 0]
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.core.envelope import binary_encrypt, current_bucket, is_binary_token
+from apps.core.fields import Ciphertext
+from apps.core.utils import decrypt_many
+from apps.reports.models import Report
+
+
+class Command(BaseCommand):
+    help = 'Re-encrypt legacy report descriptions into the binary envelope format'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Reports per transaction'
+        )
+        parser.add_argument(
+            '--after-id',
+            type=int,
+            default=0,
+            help='Resume after this report id'
+        )
+    
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        last_id = options['after_id']
+        field = Report._meta.get_field('description')
+        migrated = 0
+        failed = 0
+        
+        while True:
+            with transaction.atomic():
+                reports = list(
+                    Report.objects
+                    .filter(id__gt=last_id)
+                    .order_by('id')
+                    .only('id', 'description', 'created_at')
+                    .select_for_update()[:chunk_size]
+                )
+                if not reports:
+                    break
+                
+                legacy = [
+                    report for report in reports
+                    if field.get_ciphertext(report) and not is_binary_token(field.get_ciphertext(report))
+                ]
+                results = decrypt_many(field.get_ciphertext(report) for report in legacy)
+                updated = []
+                for report, result in zip(legacy, results):
+                    if not result.ok:
+                        failed += 1
+                        continue
+                    # Encrypt under the report's creation month, not the current one
+                    report.description = Ciphertext(binary_encrypt(
+                        result.value,
+                        field.purpose,
+                        bucket=current_bucket(report.created_at)
+                    ))
+                    updated.append(report)
+                
+                Report.objects.bulk_update(updated, ['description'])
+            
+            migrated += len(updated)
+            last_id = reports[-1].id
+            self.stdout.write(f"Migrated {migrated} reports (resume with --after-id {last_id})")
+        
+        if failed:
+            self.stdout.write(self.style.WARNING(f"{failed} reports could not be decrypted and were left unchanged"))
+        self.stdout.write(self.style.SUCCESS(f"Done. Migrated {migrated} reports."))
@@ -0,0 +1,71 @@
+"""
+Process reports accepted with REPORT_PROCESSING = 'async'.
+
+Usage:
+    python manage.py process_report_queue            # run until stopped
+    python manage.py process_report_queue --once     # drain, then exit
+
+Run one or more of these as their own processes, next to the web
+workers and under something that restarts them (see DEPLOYMENT.md). Each
+batch is redacted, encrypted and inserted in one transaction.
+"""
+
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, close_old_connections
+from apps.reports.processing import PROCESS_BATCH_SIZE, process_pending_reports
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Process pending anonymous reports from the async queue'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=PROCESS_BATCH_SIZE,
+            help='Pending reports processed per transaction'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help='Seconds to wait when the queue is empty'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once the queue is empty'
+        )
+    
+    def handle(self, *args, **options):
+        if getattr(settings, 'ENCRYPTION_KEY_DERIVED', False):
+            # The web processes must encrypt under the same key, or every
+            # pending report fails to decrypt
+            raise CommandError(
+                "ENCRYPTION_KEY is not set. Set the same ENCRYPTION_KEY (and "
+                "ENCRYPTION_KEY_FALLBACKS) for the web processes and the queue worker."
+            )
+        
+        processed = 0
+        while True:
+            close_old_connections()
+            try:
+                claimed = process_pending_reports(options['batch_size'])
+            except DatabaseError as exc:
+                # e.g. the database restarting; the batch rolled back and
+                # its rows are claimed again on a later pass
+                logger.error(f"Report queue: batch failed ({type(exc).__name__})")
+                claimed = 0
+            processed += claimed
+            if claimed:
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
+        
+        self.stdout.write(self.style.SUCCESS(f"Queue empty; claimed {processed} pending report rows"))
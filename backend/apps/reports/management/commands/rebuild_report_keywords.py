@@ -0,0 +1,24 @@
+"""
+Rebuild the blind keyword index and the similarity buckets of report
+descriptions.
+
+Run once after deploying the index, to index existing reports, and after
+changing SEARCH_INDEX_KEY. New reports are indexed as they are stored.
+
+Usage:
+    python manage.py rebuild_report_keywords
+"""
+
+from django.core.management.base import BaseCommand
+from apps.reports.search import rebuild_keyword_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the keyword index and similarity buckets of report descriptions'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500)
+    
+    def handle(self, *args, **options):
+        count = rebuild_keyword_index(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Done. Indexed {count} reports."))
@@ -0,0 +1,23 @@
+"""
+Rebuild the index of report evidence links.
+
+Run once after deploying the index, to index existing reports, and after
+changing SEARCH_INDEX_KEY. New reports are indexed as they are stored.
+
+Usage:
+    python manage.py rebuild_report_links
+"""
+
+from django.core.management.base import BaseCommand
+from apps.reports.links import rebuild_link_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the index of report evidence links'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+    
+    def handle(self, *args, **options):
+        count = rebuild_link_index(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Done. Indexed {count} reports."))
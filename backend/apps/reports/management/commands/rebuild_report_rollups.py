@@ -0,0 +1,20 @@
+"""
+Rebuild the report daily rollup table from scratch.
+
+The rollup is kept up to date as reports are saved and deleted; use this
+after bulk changes made outside the ORM, or to repair drift.
+
+Usage:
+    python manage.py rebuild_report_rollups
+"""
+
+from django.core.management.base import BaseCommand
+from apps.reports.stats import rebuild_report_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the report daily rollup table from the reports table'
+    
+    def handle(self, *args, **options):
+        rows = rebuild_report_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Done. Wrote {rows} rollup rows."))
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:20
+
+import apps.core.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="report",
+            name="description",
+            field=apps.core.fields.EncryptedTextField(
+                help_text="Encrypted incident description", purpose="reports"
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:22
+
+import apps.core.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0002_encrypted_description"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="report",
+            name="description",
+            field=apps.core.fields.EncryptedBinaryField(
+                help_text="Encrypted incident description (compact binary format)",
+                purpose="reports",
+            ),
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:32
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def build_rollups(apps, schema_editor):
+    """Fill the rollup table from existing reports."""
+    Report = apps.get_model("reports", "Report")
+    ReportDailyRollup = apps.get_model("reports", "ReportDailyRollup")
+    buckets = (
+        Report.objects.annotate(day=TruncDate("created_at"))
+        .values("day", "incident_type", "redaction_applied", "consent_for_followup")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    ReportDailyRollup.objects.bulk_create(
+        [ReportDailyRollup(**bucket) for bucket in buckets], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0003_binary_description"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "day",
+                    models.DateField(help_text="Local date the reports were created"),
+                ),
+                (
+                    "incident_type",
+                    models.CharField(
+                        choices=[
+                            ("harassment", "Harassment"),
+                            ("stalking", "Stalking"),
+                            ("impersonation", "Impersonation"),
+                            ("threats", "Threats"),
+                            ("other", "Other"),
+                        ],
+                        help_text="Type of incident",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "redaction_applied",
+                    models.BooleanField(help_text="Whether PII redaction was applied"),
+                ),
+                (
+                    "consent_for_followup",
+                    models.BooleanField(help_text="Whether user consents to followup"),
+                ),
+                (
+                    "count",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of reports in this bucket"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Report Daily Rollup",
+                "verbose_name_plural": "Report Daily Rollups",
+                "db_table": "report_daily_rollups",
+                "ordering": ["-day", "incident_type"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="reportdailyrollup",
+            constraint=models.UniqueConstraint(
+                fields=(
+                    "day",
+                    "incident_type",
+                    "redaction_applied",
+                    "consent_for_followup",
+                ),
+                name="unique_report_rollup_bucket",
+            ),
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:41
+
+import apps.core.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0005_keyset_pagination_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingReport",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "confirmation_code",
+                    models.CharField(
+                        help_text="Confirmation code given to the submitter",
+                        max_length=20,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "payload",
+                    apps.core.fields.EncryptedBinaryField(
+                        help_text="Encrypted submission awaiting processing",
+                        purpose="report_staging",
+                    ),
+                ),
+                (
+                    "received_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        db_index=True,
+                        help_text="When the submission was accepted",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0, help_text="Failed processing attempts"
+                    ),
+                ),
+                (
+                    "last_error",
+                    models.CharField(
+                        blank=True,
+                        help_text="Reason the last attempt failed",
+                        max_length=200,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Pending Report",
+                "verbose_name_plural": "Pending Reports",
+                "db_table": "pending_reports",
+                "ordering": ["received_at"],
+            },
+        ),
+    ]
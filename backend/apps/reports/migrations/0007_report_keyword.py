@@ -0,0 +1,54 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0006_pending_report"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportKeyword",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "token",
+                    models.CharField(
+                        help_text="HMAC of a normalized keyword", max_length=32
+                    ),
+                ),
+                (
+                    "report",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        help_text="Report containing the keyword",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="keywords",
+                        to="reports.report",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Report Keyword",
+                "verbose_name_plural": "Report Keywords",
+                "db_table": "report_keywords",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="reportkeyword",
+            constraint=models.UniqueConstraint(
+                fields=("token", "report"), name="unique_report_keyword"
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0007_report_keyword"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportLink",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "token",
+                    models.CharField(
+                        help_text="HMAC of a canonical evidence URL", max_length=32
+                    ),
+                ),
+                (
+                    "report",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        help_text="Report citing the link",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="links",
+                        to="reports.report",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Report Link",
+                "verbose_name_plural": "Report Links",
+                "db_table": "report_links",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="reportlink",
+            constraint=models.UniqueConstraint(
+                fields=("token", "report"), name="unique_report_link"
+            ),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0008_report_link"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportSimilarityBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "bucket",
+                    models.CharField(
+                        help_text="Hash of one band of the MinHash signature",
+                        max_length=32,
+                    ),
+                ),
+                (
+                    "report",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        help_text="Report in the bucket",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similarity_buckets",
+                        to="reports.report",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Report Similarity Bucket",
+                "verbose_name_plural": "Report Similarity Buckets",
+                "db_table": "report_similarity_buckets",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="reportsimilaritybucket",
+            constraint=models.UniqueConstraint(
+                fields=("bucket", "report"), name="unique_report_similarity_bucket"
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:18
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0009_report_similarity_bucket"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pendingreport",
+            name="next_attempt_at",
+            field=models.DateTimeField(
+                db_index=True,
+                default=django.utils.timezone.now,
+                help_text="When the queue worker may next try this row",
+            ),
+        ),
+    ]
@@ -1,14 +1,30 @@
 """
 Models for anonymous incident reports.
 PRIVACY-FIRST: NO PII collected or stored.
+
+The index tables that point at reports (keywords, evidence links,
+similarity buckets) use ForeignKey(db_constraint=False): PostgreSQL
+cannot partition a table that other tables reference with foreign keys
+(see apps.core.partitioning). Django still deletes their rows with the
+report.
 """
 
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
+from apps.core.codes import ConfirmationCodeAllocator
 from apps.core.models import TimeStampedModel
-from apps.core.utils import encrypt_field, generate_confirmation_code
+from apps.core.fields import EncryptedBinaryField
 import uuid
 
+# Reports and queued reports share the SH code space
+confirmation_codes = ConfirmationCodeAllocator(
+    'SH',
+    models=('reports.Report', 'reports.PendingReport')
+)
+
 
 class Report(TimeStampedModel):
     """
@@ -32,6 +48,8 @@ class Report(TimeStampedModel):
         consent_for_followup: Whether user consents to followup
         redaction_applied: Whether PII was detected and redacted
     """
+    DECRYPTION_FAILED = "[Unable to decrypt]"
+    
     INCIDENT_TYPE_CHOICES = [
         ('harassment', 'Harassment'),
         ('stalking', 'Stalking'),
@@ -52,8 +70,9 @@ class Report(TimeStampedModel):
         db_index=True,
         help_text="Type of incident"
     )
-    description = models.TextField(
-        help_text="Encrypted incident description"
+    description = EncryptedBinaryField(
+        purpose='reports',
+        help_text="Encrypted incident description (compact binary format)"
     )
     timestamp = models.DateTimeField(
         help_text="When the incident occurred"
@@ -87,34 +106,400 @@ class Report(TimeStampedModel):
         indexes = [
             models.Index(fields=['incident_type', '-created_at']),
             models.Index(fields=['confirmation_code']),
+            # Keyset pagination order
+            models.Index(fields=['-created_at', '-id']),
         ]
     
     def save(self, *args, **kwargs):
         """
-        Override save to:
-        1. Generate confirmation code if not set
-        2. Encrypt description before saving
+        Override save to generate confirmation code if not set.
+        The description field encrypts itself on write.
+        The daily rollup is updated in the same transaction.
         """
         if not self.confirmation_code:
-            self.confirmation_code = generate_confirmation_code(prefix="SH")
+            self.confirmation_code = confirmation_codes.allocate()
         
-        # Encrypt description if not already encrypted
-        # (Check if it looks like encrypted data)
-        if self.description and not self.description.startswith('gAAAAA'):
-            self.description = encrypt_field(self.description)
+        adding = self._state.adding
+        update_fields = kwargs.get('update_fields')
+        rollup_changed = adding or update_fields is None or bool(
+            set(update_fields) & set(ReportDailyRollup.REPORT_FIELDS)
+        )
+        if not rollup_changed:
+            super().save(*args, **kwargs)
+            return
         
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            previous = None
+            if not adding:
+                previous = (
+                    Report.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values('created_at', *ReportDailyRollup.REPORT_FIELDS)
+                    .first()
+                )
+            
+            super().save(*args, **kwargs)
+            
+            current = ReportDailyRollup.key_for(self)
+            if previous is None:
+                ReportDailyRollup.increment(current)
+            else:
+                old = ReportDailyRollup.key_for_values(previous)
+                if old != current:
+                    ReportDailyRollup.increment(old, -1)
+                    ReportDailyRollup.increment(current)
     
     def get_decrypted_description(self):
         """
         Get decrypted description.
         Only for admin viewing - never expose in public API.
         """
-        from apps.core.utils import decrypt_field
+        if getattr(self, '_description_decrypt_failed', False):
+            return self.DECRYPTION_FAILED
+        
         try:
-            return decrypt_field(self.description)
+            return self.description
         except Exception:
-            return "[Unable to decrypt]"
+            return self.DECRYPTION_FAILED
+    
+    @classmethod
+    def decrypt_descriptions(cls, reports):
+        """
+        Decrypt the descriptions of many reports in one batch.
+        Results are cached on each instance so later access to
+        description does not decrypt again.
+        
+        Args:
+            reports (iterable): Report instances
+        
+        Returns:
+            list: The same reports, in order
+        """
+        from apps.core.utils import decrypt_many
+        field = cls._meta.get_field('description')
+        reports = list(reports)
+        pending = [report for report in reports if field.get_ciphertext(report) is not None]
+        results = decrypt_many(field.get_ciphertext(report) for report in pending)
+        for report, result in zip(pending, results):
+            if result.ok:
+                field.set_decrypted(report, result.value)
+            else:
+                report._description_decrypt_failed = True
+        return reports
     
     def __str__(self):
         return f"Report {self.confirmation_code} ({self.get_incident_type_display()})"
+
+
+class ReportDailyRollup(models.Model):
+    """
+    Daily report counts, maintained as reports are saved and deleted.
+    Holds ONLY counts per bucket - no per-report data.
+    
+    Dashboard statistics read these rows instead of scanning reports.
+    Rebuild from scratch with: python manage.py rebuild_report_rollups
+    
+    Fields:
+        day: Local date the reports were created
+        incident_type: Type of incident
+        redaction_applied: Whether PII was redacted
+        consent_for_followup: Whether followup was consented to
+        count: Number of reports in this bucket
+    """
+    # Report fields that choose a report's bucket (besides its day)
+    REPORT_FIELDS = ('incident_type', 'redaction_applied', 'consent_for_followup')
+    
+    day = models.DateField(
+        help_text="Local date the reports were created"
+    )
+    incident_type = models.CharField(
+        max_length=20,
+        choices=Report.INCIDENT_TYPE_CHOICES,
+        help_text="Type of incident"
+    )
+    redaction_applied = models.BooleanField(
+        help_text="Whether PII redaction was applied"
+    )
+    consent_for_followup = models.BooleanField(
+        help_text="Whether user consents to followup"
+    )
+    count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of reports in this bucket"
+    )
+    
+    class Meta:
+        verbose_name = "Report Daily Rollup"
+        verbose_name_plural = "Report Daily Rollups"
+        db_table = "report_daily_rollups"
+        ordering = ['-day', 'incident_type']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'incident_type', 'redaction_applied', 'consent_for_followup'],
+                name='unique_report_rollup_bucket'
+            ),
+        ]
+    
+    @classmethod
+    def key_for_values(cls, values):
+        """
+        Get the bucket key for a report's field values.
+        
+        Args:
+            values (dict): created_at and REPORT_FIELDS values
+        
+        Returns:
+            dict: Lookup for the bucket row
+        """
+        key = {name: values[name] for name in cls.REPORT_FIELDS}
+        key['day'] = timezone.localdate(values['created_at'])
+        return key
+    
+    @classmethod
+    def key_for(cls, report):
+        """Get the bucket key for a saved report."""
+        return cls.key_for_values({
+            'created_at': report.created_at,
+            **{name: getattr(report, name) for name in cls.REPORT_FIELDS}
+        })
+    
+    @classmethod
+    def increment(cls, key, delta=1):
+        """
+        Atomically add delta to a bucket, creating the row if needed.
+        Call inside the transaction that writes the report.
+        
+        Args:
+            key (dict): Bucket lookup from key_for()
+            delta (int): Amount to add (negative to remove)
+        """
+        rows = cls.objects.filter(**key)
+        if delta < 0:
+            # Never go below zero; a drifted rollup is fixed by a rebuild
+            rows.filter(count__gte=-delta).update(count=F('count') + delta)
+            return
+        if rows.update(count=F('count') + delta):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(count=delta, **key)
+        except IntegrityError:
+            # Created concurrently; apply the delta to that row
+            cls.objects.filter(**key).update(count=F('count') + delta)
+    
+    def __str__(self):
+        return f"{self.day} {self.incident_type}: {self.count}"
+
+
+class ReportKeyword(models.Model):
+    """
+    Blind index entry: a keyed hash of one keyword of a report's
+    description. Holds NO plaintext; see apps.reports.search.
+    
+    Fields:
+        report: The report whose description contains the keyword
+        token: HMAC of the normalized keyword (hex)
+    """
+    report = models.ForeignKey(
+        Report,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name='keywords',
+        help_text="Report containing the keyword"
+    )
+    token = models.CharField(
+        max_length=32,
+        help_text="HMAC of a normalized keyword"
+    )
+    
+    class Meta:
+        verbose_name = "Report Keyword"
+        verbose_name_plural = "Report Keywords"
+        db_table = "report_keywords"
+        constraints = [
+            # Also the B-tree index searches use (token first)
+            models.UniqueConstraint(fields=['token', 'report'], name='unique_report_keyword'),
+        ]
+    
+    def __str__(self):
+        return f"Keyword of report {self.report_id}"
+
+
+class ReportLink(models.Model):
+    """
+    Link index entry: a keyed hash of one canonical evidence URL of a
+    report. See apps.reports.links.
+    
+    Fields:
+        report: The report citing the link
+        token: HMAC of the canonical URL (hex)
+    """
+    report = models.ForeignKey(
+        Report,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name='links',
+        help_text="Report citing the link"
+    )
+    token = models.CharField(
+        max_length=32,
+        help_text="HMAC of a canonical evidence URL"
+    )
+    
+    class Meta:
+        verbose_name = "Report Link"
+        verbose_name_plural = "Report Links"
+        db_table = "report_links"
+        constraints = [
+            # Also the B-tree index lookups use (token first)
+            models.UniqueConstraint(fields=['token', 'report'], name='unique_report_link'),
+        ]
+    
+    def __str__(self):
+        return f"Link of report {self.report_id}"
+
+
+class ReportSimilarityBucket(models.Model):
+    """
+    LSH bucket of a report's description: a keyed hash of one band of
+    its MinHash signature. Holds NO plaintext; see
+    apps.reports.similarity.
+    
+    Fields:
+        report: The report in the bucket
+        bucket: Hash of the band (hex)
+    """
+    report = models.ForeignKey(
+        Report,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name='similarity_buckets',
+        help_text="Report in the bucket"
+    )
+    bucket = models.CharField(
+        max_length=32,
+        help_text="Hash of one band of the MinHash signature"
+    )
+    
+    class Meta:
+        verbose_name = "Report Similarity Bucket"
+        verbose_name_plural = "Report Similarity Buckets"
+        db_table = "report_similarity_buckets"
+        constraints = [
+            # Also the B-tree index lookups use (bucket first)
+            models.UniqueConstraint(fields=['bucket', 'report'], name='unique_report_similarity_bucket'),
+        ]
+    
+    def __str__(self):
+        return f"Similarity bucket of report {self.report_id}"
+
+
+class PendingReport(models.Model):
+    """
+    A report accepted but not yet processed (REPORT_PROCESSING = 'async').
+    
+    The submission is stored as validated, before PII redaction,
+    encrypted under its own 'report_staging' data keys. The queue worker
+    (python manage.py process_report_queue) redacts it, encrypts it as
+    a Report and deletes this row, so unredacted text is only kept until
+    it is processed.
+    
+    Fields:
+        confirmation_code: Code already given to the submitter
+        payload: Encrypted JSON of the validated submission
+        received_at: When the submission was accepted
+        attempts: Failed processing attempts
+        last_error: Why the last attempt failed (never report content)
+        next_attempt_at: When the queue worker may next try the row,
+            pushed back after each failure
+    """
+    # Rows that failed this many times are left for an admin to inspect
+    MAX_ATTEMPTS = 5
+    
+    confirmation_code = models.CharField(
+        max_length=20,
+        unique=True,
+        help_text="Confirmation code given to the submitter"
+    )
+    payload = EncryptedBinaryField(
+        purpose='report_staging',
+        help_text="Encrypted submission awaiting processing"
+    )
+    received_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        help_text="When the submission was accepted"
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Failed processing attempts"
+    )
+    last_error = models.CharField(
+        max_length=200,
+        blank=True,
+        help_text="Reason the last attempt failed"
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        db_index=True,
+        help_text="When the queue worker may next try this row"
+    )
+    
+    class Meta:
+        verbose_name = "Pending Report"
+        verbose_name_plural = "Pending Reports"
+        db_table = "pending_reports"
+        ordering = ['received_at']
+    
+    def __str__(self):
+        return f"Pending report {self.confirmation_code}"
+
+
+@receiver(post_delete, sender=Report)
+def _remove_from_rollup(sender, instance, **kwargs):
+    """
+    Decrement the rollup when a report is deleted.
+    Deletion runs in a transaction, so this commits with it.
+    """
+    ReportDailyRollup.increment(ReportDailyRollup.key_for(instance), -1)
+
+
+@receiver(post_save, sender=Report)
+def _index_keywords(sender, instance, update_fields=None, **kwargs):
+    """
+    Update the blind keyword index when a description is saved.
+    The description is still plaintext on the instance that set it;
+    reports saved without touching it are skipped.
+    """
+    from .search import index_reports
+    
+    if update_fields is not None and 'description' not in update_fields:
+        return
+    description = instance.__dict__.get('description')
+    if isinstance(description, str):
+        index_reports([(instance, description)])
+
+
+@receiver(post_save, sender=Report)
+def _index_similarity(sender, instance, update_fields=None, **kwargs):
+    """
+    Update the similarity buckets when a description is saved, from the
+    plaintext still on the instance, as _index_keywords does.
+    """
+    from .similarity import index_similarity
+    
+    if update_fields is not None and 'description' not in update_fields:
+        return
+    description = instance.__dict__.get('description')
+    if isinstance(description, str):
+        index_similarity([(instance, description)])
+
+
+@receiver(post_save, sender=Report)
+def _index_links(sender, instance, update_fields=None, **kwargs):
+    """Update the evidence link index when the links are saved."""
+    from .links import index_report_links
+    
+    if update_fields is not None and 'evidence_links' not in update_fields:
+        return
+    index_report_links([instance])
@@ -0,0 +1,141 @@
+"""
+Accept-then-process pipeline for anonymous reports.
+
+With REPORT_PROCESSING = 'async', POST /api/reports/ only validates a
+submission, encrypts it under a staging data key and answers with its
+confirmation code. PII redaction, final encryption, the reports INSERT
+and the rollup update happen later, in batches, in the queue worker:
+
+    python manage.py process_report_queue
+
+Workers claim rows with SELECT ... FOR UPDATE SKIP LOCKED (PostgreSQL),
+so several can run side by side. A row that fails is retried after
+RETRY_DELAY, doubled on each failure, until PendingReport.MAX_ATTEMPTS.
+"""
+
+import json
+from datetime import timedelta
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from apps.core.utils import decrypt_many
+from .intake import create_reports
+from .models import PendingReport, confirmation_codes
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Pending reports claimed per worker transaction
+PROCESS_BATCH_SIZE = 100
+
+# Wait before retrying a failed row; doubled on each further failure
+RETRY_DELAY = timedelta(seconds=30)
+
+
+def enqueue_report(validated_data):
+    """
+    Store a validated submission for the queue worker.
+    
+    Args:
+        validated_data (dict): From ReportIntakeSerializer (not redacted)
+    
+    Returns:
+        PendingReport: The queued row, with its confirmation code
+    """
+    return PendingReport.objects.create(
+        confirmation_code=confirmation_codes.allocate(),
+        payload=json.dumps(validated_data, cls=DjangoJSONEncoder)
+    )
+
+
+def _load_payload(text):
+    """Turn a decrypted payload back into validated report data."""
+    data = json.loads(text)
+    timestamp = parse_datetime(data['timestamp'])
+    if timestamp is None:
+        raise ValueError("Invalid timestamp")
+    data['timestamp'] = timestamp
+    return data
+
+
+def _store(rows, entries, failed):
+    """
+    Create the reports for a batch, falling back to one at a time if
+    the batch insert fails, so one bad row cannot block the queue.
+    
+    Returns:
+        list: Rows whose report was created
+    """
+    try:
+        with transaction.atomic():
+            create_reports(entries)
+        return rows
+    except Exception:
+        pass
+    
+    done = []
+    for row, entry in zip(rows, entries):
+        try:
+            with transaction.atomic():
+                create_reports([entry])
+            done.append(row)
+        except IntegrityError:
+            failed.append((row, 'Confirmation code already used by a report'))
+        except Exception as exc:
+            # The message could quote report content; keep only the type
+            failed.append((row, f'{type(exc).__name__} while storing the report'))
+    return done
+
+
+def process_pending_reports(batch_size=PROCESS_BATCH_SIZE):
+    """
+    Process one batch of due pending reports, oldest first.
+    
+    Created reports and the deletion of their pending rows commit
+    together. Rows that fail are kept with attempts incremented and
+    next_attempt_at pushed back, and skipped once they reach
+    PendingReport.MAX_ATTEMPTS. Only rows that are due are claimed.
+    
+    Args:
+        batch_size (int): Maximum rows to process
+    
+    Returns:
+        int: Number of rows claimed (0 when the queue is empty)
+    """
+    field = PendingReport._meta.get_field('payload')
+    
+    with transaction.atomic():
+        rows = list(
+            PendingReport.objects.select_for_update(skip_locked=True)
+            .filter(attempts__lt=PendingReport.MAX_ATTEMPTS, next_attempt_at__lte=timezone.now())
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        if not rows:
+            return 0
+        
+        ready, entries, failed = [], [], []
+        for row, result in zip(rows, decrypt_many(field.get_ciphertext(row) for row in rows)):
+            if not result.ok:
+                failed.append((row, 'Payload could not be decrypted'))
+                continue
+            try:
+                entries.append((_load_payload(result.value), row.confirmation_code))
+            except (ValueError, KeyError, TypeError):
+                failed.append((row, 'Payload could not be read'))
+                continue
+            ready.append(row)
+        
+        done = _store(ready, entries, failed) if entries else []
+        PendingReport.objects.filter(pk__in=[row.pk for row in done]).delete()
+        now = timezone.now()
+        for row, error in failed:
+            PendingReport.objects.filter(pk=row.pk).update(
+                attempts=row.attempts + 1,
+                last_error=error,
+                next_attempt_at=now + RETRY_DELAY * 2 ** row.attempts
+            )
+    
+    if failed:
+        logger.error(f"Report queue: {len(failed)} of {len(rows)} pending reports failed")
+    return len(rows)
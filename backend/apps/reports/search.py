@@ -0,0 +1,194 @@
+"""
+Blind keyword index for searching encrypted report descriptions.
+
+Descriptions are encrypted, so the database cannot search them. Instead,
+when a report is stored, the keywords of its (already redacted)
+description are normalized and hashed with HMAC-SHA256 under
+SEARCH_INDEX_KEY, and the hashes are stored in ReportKeyword. A search
+hashes the query the same way and looks the hashes up through a B-tree
+index, without decrypting any report.
+
+Keywords are single words and pairs of adjacent words, after
+casefolding and dropping stopwords, so a query like "fake account"
+matches that phrase rather than the two words anywhere.
+
+The index stores no plaintext, but equal keywords have equal hashes: an
+attacker with the table can see which reports share a keyword, not what
+it is. Changing SEARCH_INDEX_KEY requires
+python manage.py rebuild_report_keywords.
+"""
+
+import functools
+import hmac
+import re
+import unicodedata
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models import Count
+from django.dispatch import receiver
+
+# Bytes of HMAC-SHA256 kept per keyword (hex-encoded in ReportKeyword.token)
+TOKEN_BYTES = 16
+
+# Words shorter than this are not indexed
+MIN_WORD_LENGTH = 2
+
+# Most keywords a single query may have
+MAX_QUERY_KEYWORDS = 10
+
+STOPWORDS = frozenset("""
+    a about after all also am an and any are as at be been before but by
+    can could did do does for from had has have he her him his how i if in
+    into is it its me my no not of on or our she so than that the their
+    them then there they this to too up us was we were what when where
+    which who will with would you your
+""".split())
+
+_WORD_RE = re.compile(r'[^\W_]+')
+
+
+@functools.lru_cache(maxsize=None)
+def get_index_key():
+    """
+    Get the HMAC key for the index.
+    
+    Uses SEARCH_INDEX_KEY, or a key derived from SECRET_KEY when it is
+    not set (development).
+    """
+    if settings.SEARCH_INDEX_KEY:
+        return settings.SEARCH_INDEX_KEY.encode('utf-8')
+    return hmac.digest(settings.SECRET_KEY.encode('utf-8'), b'report-search-index', 'sha256')
+
+
+@receiver(setting_changed)
+def _reset_index_key(sender, setting, **kwargs):
+    if setting in ('SEARCH_INDEX_KEY', 'SECRET_KEY'):
+        get_index_key.cache_clear()
+
+
+def normalize_words(text):
+    """
+    Split text into normalized words, without stopwords.
+    
+    Returns:
+        list: Words in order, e.g. ['fake', 'account']
+    """
+    text = unicodedata.normalize('NFKC', text).casefold()
+    return [
+        word for word in _WORD_RE.findall(text)
+        if len(word) >= MIN_WORD_LENGTH and word not in STOPWORDS
+    ]
+
+
+def extract_keywords(text):
+    """
+    Get the keywords indexed for a text: each word and each adjacent pair.
+    
+    Returns:
+        set: Keywords, e.g. {'fake', 'account', 'fake account'}
+    """
+    words = normalize_words(text or '')
+    keywords = set(words)
+    keywords.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+    return keywords
+
+
+def blind_token(keyword):
+    """Hash one keyword for the index."""
+    digest = hmac.digest(get_index_key(), keyword.encode('utf-8'), 'sha256')
+    return digest[:TOKEN_BYTES].hex()
+
+
+def query_tokens(query):
+    """
+    Get the tokens a report must have to match a query.
+    
+    A one-word query matches that word; longer queries match each
+    adjacent pair, so phrases match as phrases.
+    
+    Returns:
+        list: Distinct tokens (empty if the query has no keywords)
+    """
+    words = normalize_words(query or '')[:MAX_QUERY_KEYWORDS + 1]
+    if len(words) == 1:
+        keywords = words
+    else:
+        keywords = [f"{first} {second}" for first, second in zip(words, words[1:])]
+    return sorted({blind_token(keyword) for keyword in keywords})
+
+
+def index_reports(entries):
+    """
+    Replace the index entries of several reports.
+    
+    Args:
+        entries (iterable): (report, plaintext description) pairs
+    """
+    from .models import ReportKeyword
+    
+    entries = list(entries)
+    rows = [
+        ReportKeyword(report_id=report.pk, token=blind_token(keyword))
+        for report, text in entries
+        for keyword in extract_keywords(text)
+    ]
+    with transaction.atomic():
+        ReportKeyword.objects.filter(report_id__in=[report.pk for report, _ in entries]).delete()
+        ReportKeyword.objects.bulk_create(rows, batch_size=1000)
+
+
+def search_report_ids(query):
+    """
+    Find the reports whose descriptions match a keyword query.
+    
+    Args:
+        query (str): Words or a phrase, e.g. 'fake account'
+    
+    Returns:
+        QuerySet: Matching report ids (a values_list, usable in id__in)
+    """
+    from .models import ReportKeyword
+    
+    tokens = query_tokens(query)
+    if not tokens:
+        return ReportKeyword.objects.none().values_list('report_id', flat=True)
+    return (
+        ReportKeyword.objects
+        .filter(token__in=tokens)
+        .values('report_id')
+        .annotate(matched=Count('token'))
+        .filter(matched=len(tokens))
+        .values_list('report_id', flat=True)
+    )
+
+
+def rebuild_keyword_index(chunk_size=500):
+    """
+    Re-index every report, decrypting descriptions a chunk at a time.
+    Needed after SEARCH_INDEX_KEY changes, and to index reports stored
+    before the index existed. Also rebuilds the similarity buckets
+    (apps.reports.similarity), which come from the same plaintext.
+    
+    Returns:
+        int: Number of reports indexed
+    """
+    from itertools import islice
+    from .models import Report
+    from .similarity import index_similarity
+    
+    reports = Report.objects.order_by('id').iterator(chunk_size=chunk_size)
+    indexed = 0
+    while True:
+        chunk = list(islice(reports, chunk_size))
+        if not chunk:
+            return indexed
+        Report.decrypt_descriptions(chunk)
+        # Unreadable descriptions get no entries rather than stale ones
+        entries = [
+            (report, '' if getattr(report, '_description_decrypt_failed', False) else report.description)
+            for report in chunk
+        ]
+        index_reports(entries)
+        index_similarity(entries)
+        indexed += len(chunk)
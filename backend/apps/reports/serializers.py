@@ -21,6 +21,11 @@ class ReportCreateSerializer(serializers.ModelSerializer):
     - NO user identifiers
     - Automatic PII detection and redaction
     """
+    # Stored encrypted in a binary column; accepted as plain text
+    description = serializers.CharField()
+    
+    # Bulk intake turns this off and redacts the whole batch in parallel
+    redact_description = True
     
     class Meta:
         model = Report
@@ -44,8 +49,12 @@ class ReportCreateSerializer(serializers.ModelSerializer):
         if len(value) > 5000:
             raise serializers.ValidationError("Description is too long (max 5000 characters)")
         
+        if not self.redact_description:
+            return value
+        
         # Process for PII - will redact if found
         redacted_text, redaction_applied = process_report_text(value)
+        self._redaction_applied = redaction_applied
         
         # Store the redacted version
         return redacted_text
@@ -95,16 +104,21 @@ class ReportCreateSerializer(serializers.ModelSerializer):
         """
         Create report with automatic PII redaction flag.
         """
-        # Check if redaction was applied
-        original_description = self.initial_data.get('description', '')
-        final_description = validated_data.get('description', '')
-        
-        redaction_applied = original_description != final_description
-        validated_data['redaction_applied'] = redaction_applied
+        # Flag comes from the same scan that redacted the description
+        validated_data['redaction_applied'] = getattr(self, '_redaction_applied', False)
         
         return super().create(validated_data)
 
 
+class ReportIntakeSerializer(ReportCreateSerializer):
+    """
+    Validates one report of a partner bulk intake batch.
+    Same rules as ReportCreateSerializer; PII redaction and encryption
+    are done for the whole batch by apps.reports.intake.
+    """
+    redact_description = False
+
+
 class ReportListSerializer(serializers.ModelSerializer):
     """
     Serializer for listing reports (admin only).
@@ -127,6 +141,17 @@ class ReportListSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class ReportDetailListSerializer(serializers.ListSerializer):
+    """
+    Decrypts all descriptions in one batch before serializing
+    many reports, instead of one decrypt per row.
+    """
+    
+    def to_representation(self, data):
+        reports = data.all() if hasattr(data, 'all') else data
+        return super().to_representation(Report.decrypt_descriptions(reports))
+
+
 class ReportDetailSerializer(serializers.ModelSerializer):
     """
     Serializer for report details (admin only).
@@ -136,6 +161,7 @@ class ReportDetailSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Report
+        list_serializer_class = ReportDetailListSerializer
         fields = [
             'id',
             'confirmation_code',
@@ -0,0 +1,226 @@
+"""
+Near-duplicate detection for reports with MinHash and LSH.
+
+Campaigns produce many reports with nearly the same wording, but
+descriptions are encrypted, so comparing them means decrypting every
+pair. Instead, when a report is stored, its redacted description is
+reduced to a MinHash signature:
+
+  * the text is split into shingles (runs of SHINGLE_WORDS words),
+  * each shingle is hashed under a key derived from SEARCH_INDEX_KEY,
+  * for each of NUM_PERMUTATIONS hash functions, the smallest hash of
+    any shingle is kept.
+
+Two signatures agree in a position with probability equal to the
+Jaccard similarity of the shingle sets. The signature is cut into BANDS
+bands of ROWS values, and each band is hashed into a bucket stored in
+ReportSimilarityBucket; the signature itself and the text are not kept.
+Reports sharing a bucket are candidates: with 16 bands of 4 rows, pairs
+with similarity 0.5 share a bucket about 64% of the time, pairs at 0.8
+over 99% and pairs at 0.2 under 3%.
+
+Finding reports similar to one report is an indexed lookup of its
+buckets, and clustering a set of reports reads only the buckets they
+share, instead of comparing every pair.
+"""
+
+import functools
+import hashlib
+import hmac
+import re
+import unicodedata
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models import Count
+from django.dispatch import receiver
+from .search import TOKEN_BYTES, get_index_key
+
+# Words per shingle
+SHINGLE_WORDS = 3
+
+# Signature length, BANDS * ROWS
+BANDS = 16
+ROWS = 4
+NUM_PERMUTATIONS = BANDS * ROWS
+
+# Mersenne prime modulus of the hash functions (a * x + b) % _PRIME
+_PRIME = (1 << 61) - 1
+
+# Default and largest window, in days, of reports clustered at once
+CLUSTER_WINDOW_DAYS = 30
+MAX_CLUSTER_WINDOW_DAYS = 365
+
+# Most clusters, and most reports of each cluster, returned by the
+# clusters endpoint
+MAX_CLUSTERS = 50
+MAX_CLUSTER_MEMBERS = 20
+
+_WORD_RE = re.compile(r'[^\W_]+')
+
+
+@functools.lru_cache(maxsize=None)
+def _keys():
+    """
+    Get the shingle hash key and the (a, b) of each hash function.
+    All are derived from the index key, so buckets reveal nothing
+    without it.
+    """
+    key = hmac.digest(get_index_key(), b'report-similarity', 'sha256')
+    permutations = []
+    for index in range(NUM_PERMUTATIONS):
+        digest = hashlib.blake2b(index.to_bytes(2, 'big'), key=key, digest_size=16).digest()
+        a = int.from_bytes(digest[:8], 'big') % (_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:], 'big') % _PRIME
+        permutations.append((a, b))
+    return key, permutations
+
+
+@receiver(setting_changed)
+def _reset_keys(sender, setting, **kwargs):
+    if setting in ('SEARCH_INDEX_KEY', 'SECRET_KEY'):
+        _keys.cache_clear()
+
+
+def shingles(text):
+    """
+    Split text into overlapping runs of SHINGLE_WORDS words.
+    
+    Returns:
+        set: e.g. {'made a fake', 'a fake account'}; a shorter text is
+            one shingle, an empty one none
+    """
+    words = _WORD_RE.findall(unicodedata.normalize('NFKC', text or '').casefold())
+    if len(words) <= SHINGLE_WORDS:
+        return {' '.join(words)} if words else set()
+    return {
+        ' '.join(words[start:start + SHINGLE_WORDS])
+        for start in range(len(words) - SHINGLE_WORDS + 1)
+    }
+
+
+def minhash_signature(text):
+    """
+    Compute the MinHash signature of a text.
+    
+    Returns:
+        tuple: NUM_PERMUTATIONS ints, or None if the text has no words
+    """
+    key, permutations = _keys()
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), key=key, digest_size=8).digest(), 'big')
+        for shingle in shingles(text)
+    ]
+    if not hashes:
+        return None
+    return tuple(min((a * value + b) % _PRIME for value in hashes) for a, b in permutations)
+
+
+def lsh_buckets(signature):
+    """
+    Hash each band of a signature into a bucket.
+    
+    Returns:
+        list: BANDS hex bucket ids
+    """
+    key, _ = _keys()
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS]
+        data = band.to_bytes(1, 'big') + b''.join(value.to_bytes(8, 'big') for value in rows)
+        buckets.append(hashlib.blake2b(data, key=key, digest_size=TOKEN_BYTES).hexdigest())
+    return buckets
+
+
+def index_similarity(entries):
+    """
+    Replace the similarity buckets of several reports.
+    
+    Args:
+        entries (iterable): (report, plaintext description) pairs
+    """
+    from .models import ReportSimilarityBucket
+    
+    entries = list(entries)
+    rows = []
+    for report, text in entries:
+        signature = minhash_signature(text)
+        if signature is not None:
+            rows.extend(
+                ReportSimilarityBucket(report_id=report.pk, bucket=bucket)
+                for bucket in lsh_buckets(signature)
+            )
+    with transaction.atomic():
+        ReportSimilarityBucket.objects.filter(report_id__in=[report.pk for report, _ in entries]).delete()
+        ReportSimilarityBucket.objects.bulk_create(rows, batch_size=1000)
+
+
+def similar_report_ids(report_id):
+    """
+    Find the reports that share a bucket with a report.
+    
+    Returns:
+        QuerySet: Ids of the other reports (a values_list, usable in id__in)
+    """
+    from .models import ReportSimilarityBucket
+    
+    buckets = ReportSimilarityBucket.objects.filter(report_id=report_id).values('bucket')
+    return (
+        ReportSimilarityBucket.objects
+        .filter(bucket__in=buckets)
+        .exclude(report_id=report_id)
+        .values_list('report_id', flat=True)
+        .distinct()
+    )
+
+
+def find_clusters(reports, min_size=2):
+    """
+    Group reports into clusters of near-duplicates.
+    
+    Reports sharing a bucket are joined, so a cluster can chain reports
+    that each resemble the next. Only buckets shared by two or more of
+    the reports are read.
+    
+    Args:
+        reports (QuerySet): Reports to cluster
+        min_size (int): Smallest cluster returned
+    
+    Returns:
+        list: Clusters as lists of report ids (newest first), largest first
+    """
+    from .models import ReportSimilarityBucket
+    
+    candidates = ReportSimilarityBucket.objects.filter(report__in=reports.values('pk'))
+    shared = (
+        candidates.values('bucket')
+        .annotate(members=Count('report'))
+        .filter(members__gte=2)
+        .values('bucket')
+    )
+    
+    # Union-find over reports sharing a bucket
+    parent = {}
+    
+    def find(report_id):
+        root = report_id
+        while parent[root] != root:
+            root = parent[root]
+        while parent[report_id] != root:
+            parent[report_id], report_id = root, parent[report_id]
+        return root
+    
+    first_in_bucket = {}
+    for bucket, report_id in candidates.filter(bucket__in=shared).values_list('bucket', 'report_id'):
+        parent.setdefault(report_id, report_id)
+        other = first_in_bucket.setdefault(bucket, report_id)
+        if other != report_id:
+            parent[find(report_id)] = find(other)
+    
+    clusters = {}
+    for report_id in parent:
+        clusters.setdefault(find(report_id), []).append(report_id)
+    return sorted(
+        (sorted(members, reverse=True) for members in clusters.values() if len(members) >= min_size),
+        key=lambda members: (-len(members), -members[0])
+    )
+
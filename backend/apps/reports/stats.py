@@ -0,0 +1,147 @@
+"""
+Aggregated report statistics for the admin dashboard.
+Returns ONLY counts and trends, never individual reports.
+"""
+
+from django.db import connection, transaction
+from django.db.models import Case, Count, DateField, Q, Sum, When
+from django.db.models.functions import Coalesce, TruncDate, TruncMonth
+from django.utils import timezone
+from apps.core.cache import StatsCache
+from .models import Report, ReportDailyRollup
+
+# Calendar months shown in reports_by_month, including the current one
+STATS_MONTHS = 12
+
+# Invalidated whenever a report is saved or deleted (see ReportsConfig.ready)
+report_stats_cache = StatsCache('reports')
+
+
+def month_starts(now=None, months=STATS_MONTHS):
+    """
+    Get the first instant of each of the last `months` calendar months.
+    
+    Args:
+        now (datetime): Reference time (defaults to now)
+        months (int): Number of months, including the current one
+    
+    Returns:
+        list: Aware datetimes in the current time zone, newest first
+    """
+    now = timezone.localtime(now or timezone.now())
+    start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    starts = []
+    year, month = start.year, start.month
+    for _ in range(months):
+        starts.append(start.replace(year=year, month=month))
+        month -= 1
+        if month == 0:
+            year, month = year - 1, 12
+    return starts
+
+
+def compute_report_stats(now=None):
+    """
+    Compute dashboard statistics from the daily rollup table.
+    
+    One query over ReportDailyRollup (a few rows per day) replaces a
+    scan of the reports table. Rows are grouped by incident type and
+    calendar month; days older than the month window fall into one
+    NULL-month group per type, so they still count towards the totals.
+    Redacted reports are summed with a conditional aggregate in the
+    same pass.
+    
+    Args:
+        now (datetime): Reference time (defaults to now)
+    
+    Returns:
+        dict: total_reports, reports_by_type, reports_by_month (newest
+            month first, zero-filled) and redaction_rate
+    """
+    starts = month_starts(now)
+    window_start = starts[-1].date()
+    
+    rows = (
+        ReportDailyRollup.objects
+        .annotate(month=Case(
+            When(day__gte=window_start, then=TruncMonth('day')),
+            default=None,
+            output_field=DateField(),
+        ))
+        .values('incident_type', 'month')
+        .annotate(
+            total=Coalesce(Sum('count'), 0),
+            redacted=Coalesce(Sum('count', filter=Q(redaction_applied=True)), 0),
+        )
+        .order_by()
+    )
+    
+    total_reports = 0
+    redacted_count = 0
+    reports_by_type = {}
+    reports_by_month = {start.strftime('%Y-%m'): 0 for start in starts}
+    
+    for row in rows:
+        if not row['total']:
+            continue
+        total_reports += row['total']
+        redacted_count += row['redacted']
+        reports_by_type[row['incident_type']] = (
+            reports_by_type.get(row['incident_type'], 0) + row['total']
+        )
+        if row['month'] is not None:
+            month_key = row['month'].strftime('%Y-%m')
+            if month_key in reports_by_month:
+                reports_by_month[month_key] += row['total']
+    
+    redaction_rate = (redacted_count / total_reports * 100) if total_reports > 0 else 0
+    
+    return {
+        'total_reports': total_reports,
+        'reports_by_type': reports_by_type,
+        'reports_by_month': reports_by_month,
+        'redaction_rate': round(redaction_rate, 2)
+    }
+
+
+def get_report_stats():
+    """
+    Get dashboard statistics, from the stats cache when possible.
+    
+    Returns:
+        dict: Same shape as compute_report_stats()
+    """
+    return report_stats_cache.get_or_compute(compute_report_stats)
+
+
+def rebuild_report_rollups():
+    """
+    Rebuild the daily rollup table from the reports table.
+    
+    Runs in one transaction. On PostgreSQL the reports table is locked
+    against writes meanwhile, so reports saved during the rebuild are
+    neither lost nor counted twice.
+    
+    Returns:
+        int: Number of rollup rows written
+    """
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                table = connection.ops.quote_name(Report._meta.db_table)
+                cursor.execute(f'LOCK TABLE {table} IN SHARE MODE')
+        
+        buckets = (
+            Report.objects
+            .annotate(day=TruncDate('created_at'))
+            .values('day', *ReportDailyRollup.REPORT_FIELDS)
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+        ReportDailyRollup.objects.all().delete()
+        rollups = ReportDailyRollup.objects.bulk_create(
+            [ReportDailyRollup(**bucket) for bucket in buckets],
+            batch_size=1000
+        )
+    report_stats_cache.invalidate()
+    return len(rollups)
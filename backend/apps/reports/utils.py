@@ -1,89 +1,20 @@
 """
 PII detection and redaction utilities for reports.
 Protects user privacy by detecting and removing personally identifiable information.
+
+All scanning is done by the shared single-pass engine in apps.core.pii.
 """
 
-import re
 import logging
+from apps.core.pii import detect_pii, pii_engine, redact_pii  # noqa: F401 (re-exported)
 
 logger = logging.getLogger(__name__)
 
-# PII detection patterns
-PII_PATTERNS = {
-    'email': re.compile(
-        r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-        re.IGNORECASE
-    ),
-    'phone': re.compile(
-        r'\b(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b'
-    ),
-    'ssn': re.compile(
-        r'\b\d{3}-\d{2}-\d{4}\b'
-    ),
-    'credit_card': re.compile(
-        r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b'
-    ),
-    # Common name patterns (basic detection)
-    'full_name': re.compile(
-        r'\b(my name is|i am|i\'m|called)\s+([A-Z][a-z]+\s+[A-Z][a-z]+)\b',
-        re.IGNORECASE
-    ),
-}
-
-
-def detect_pii(text):
-    """
-    Detect PII patterns in text.
-    
-    Args:
-        text (str): Text to scan for PII
-        
-    Returns:
-        list: List of PII types detected (e.g., ['email', 'phone'])
-    """
-    if not text:
-        return []
-    
-    detected = []
-    
-    for pii_type, pattern in PII_PATTERNS.items():
-        if pattern.search(text):
-            detected.append(pii_type)
-            logger.warning(f"PII detected in report: {pii_type}")
-    
-    return detected
-
-
-def redact_pii(text):
-    """
-    Redact PII from text by replacing with [REDACTED].
-    
-    Args:
-        text (str): Text to redact
-        
-    Returns:
-        str: Text with PII redacted
-    """
-    if not text:
-        return text
-    
-    redacted = text
-    
-    # Redact each PII type
-    for pii_type, pattern in PII_PATTERNS.items():
-        if pii_type == 'full_name':
-            # Special handling for name patterns - redact the captured name
-            redacted = pattern.sub(r'\1 [NAME_REDACTED]', redacted)
-        else:
-            redacted = pattern.sub(f'[{pii_type.upper()}_REDACTED]', redacted)
-    
-    return redacted
-
 
 def process_report_text(text):
     """
     Process report text for PII.
-    Detects PII and returns redacted text with flag.
+    Scans once; the same spans drive detection, redaction and the flag.
     
     Args:
         text (str): Report text to process
@@ -96,18 +27,13 @@ def process_report_text(text):
     if not text:
         return text, False
     
-    # Detect PII
-    pii_detected = detect_pii(text)
+    redacted_text, spans = pii_engine.process(text)
     
-    if pii_detected:
+    if spans:
         # Log detection (without revealing content)
         logger.warning(
-            f"PII detected in report submission. Types: {', '.join(pii_detected)}"
+            f"PII detected in report submission. Types: {', '.join(pii_engine.detect(text, spans))}"
         )
-        
-        # Redact PII
-        redacted_text = redact_pii(text)
-        
         return redacted_text, True
     
     return text, False
@@ -6,15 +6,26 @@ PRIVACY-FIRST: NO IP logging, NO user tracking.
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.permissions import AllowAny
+from django.conf import settings
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count
-from django.utils import timezone
-from datetime import timedelta
-from apps.core.permissions import IsAdminUser
+from apps.authentication.authentication import PartnerAPIKeyAuthentication
+from apps.core.pagination import PageOrKeysetPagination
+from apps.core.permissions import IsAdminUser, IsPartner
+from apps.core.throttling import PartnerIntakeThrottle
 from .models import Report
+from .export import (
+    CSVExportRenderer,
+    NDJSONExportRenderer,
+    export_response,
+    iter_csv,
+    iter_ndjson
+)
+from .stats import get_report_stats
 from .serializers import (
     ReportCreateSerializer,
+    ReportIntakeSerializer,
     ReportListSerializer,
     ReportDetailSerializer,
     ReportStatsSerializer
@@ -31,10 +42,18 @@ class ReportViewSet(viewsets.ModelViewSet):
     PUBLIC endpoint (no auth):
     - create: POST /api/reports/
     
+    PARTNER endpoint (API key required):
+    - bulk: POST /api/reports/bulk/
+    
     ADMIN endpoints (JWT required):
-    - list: GET /api/reports/
+    - list: GET /api/reports/?page=2, or ?cursor= for keyset pages
     - retrieve: GET /api/reports/{id}/
     - stats: GET /api/reports/stats/
+    - search: GET /api/reports/search/?q=...
+    - linked: GET /api/reports/linked/?url=...
+    - similar: GET /api/reports/{id}/similar/
+    - clusters: GET /api/reports/clusters/?days=30
+    - export: GET /api/reports/export/?format=csv|ndjson
     
     PRIVACY PROTECTION:
     - NO IP logging
@@ -43,16 +62,20 @@ class ReportViewSet(viewsets.ModelViewSet):
     - Rate limited to prevent abuse
     """
     queryset = Report.objects.all()
+    pagination_class = PageOrKeysetPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['incident_type', 'redaction_applied']
     
     def get_permissions(self):
         """
         Public can create reports anonymously.
+        Partner kiosks can submit reports in bulk.
         Only admins can list and view reports.
         """
         if self.action == 'create':
             return [AllowAny()]
+        if self.action == 'bulk':
+            return [IsPartner()]
         return [IsAdminUser()]
     
     def get_serializer_class(self):
@@ -77,7 +100,13 @@ class ReportViewSet(viewsets.ModelViewSet):
         - NO session cookies set
         - Automatic PII detection and redaction
         - Rate limited (configured in middleware)
+        
+        With REPORT_PROCESSING = 'async' the report is queued and
+        acknowledged with 202; redaction happens in the queue worker.
         """
+        if settings.REPORT_PROCESSING == 'async':
+            return self._queue_report(request)
+        
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
@@ -104,6 +133,83 @@ class ReportViewSet(viewsets.ModelViewSet):
             status=status.HTTP_201_CREATED
         )
     
+    def _queue_report(self, request):
+        """
+        Validate a report and queue it for processing.
+        The submission is encrypted under a staging key before it is stored.
+        """
+        from .processing import enqueue_report
+        
+        serializer = ReportIntakeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        pending = enqueue_report(serializer.validated_data)
+        
+        # Log queueing (NO identifying info)
+        logger.info(f"Anonymous report queued: {pending.confirmation_code}")
+        
+        return Response(
+            {
+                'confirmation_code': pending.confirmation_code,
+                'message': 'Your report has been received securely and anonymously. '
+                          'Save this confirmation code for your records.',
+                'status': 'queued',
+                # Known once processed; any PII found will be removed
+                'redaction_applied': None,
+                'redaction_message': None
+            },
+            status=status.HTTP_202_ACCEPTED
+        )
+    
+    @action(
+        detail=False,
+        methods=['post'],
+        authentication_classes=[PartnerAPIKeyAuthentication],
+        throttle_classes=[PartnerIntakeThrottle]
+    )
+    def bulk(self, request):
+        """
+        Submit a batch of reports from a partner intake kiosk.
+        Each report gets the same validation, PII redaction and
+        encryption as an anonymous submission.
+        
+        POST /api/reports/bulk/
+        Authorization: Api-Key <key>
+        {"reports": [{...report...}, ...]}
+        
+        Returns one result per report, in order: its confirmation code,
+        or its validation errors. Valid reports are stored even when
+        others in the batch are rejected.
+        """
+        from .intake import ingest_reports
+        
+        items = request.data.get('reports') if isinstance(request.data, dict) else None
+        max_reports = settings.PARTNER_INTAKE_MAX_REPORTS
+        if not isinstance(items, list) or not items:
+            return Response(
+                {'error': 'reports must be a non-empty list'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > max_reports:
+            return Response(
+                {'error': f'At most {max_reports} reports per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        results = ingest_reports(items)
+        accepted = sum(1 for result in results if 'confirmation_code' in result)
+        
+        # Log intake (counts only, NO report content)
+        logger.info(
+            f"Partner bulk intake by {request.user.name}: "
+            f"{accepted} accepted, {len(results) - accepted} rejected"
+        )
+        
+        return Response({
+            'accepted': accepted,
+            'rejected': len(results) - accepted,
+            'results': results,
+        })
+    
     def list(self, request, *args, **kwargs):
         """
         List reports (admin only).
@@ -145,48 +251,243 @@ class ReportViewSet(viewsets.ModelViewSet):
         """
         Get aggregated report statistics (admin only).
         Returns ONLY aggregated data, NO individual reports.
+        Read from the daily rollup and cached until a report changes.
         
         GET /api/reports/stats/
         """
-        # Total reports
-        total_reports = Report.objects.count()
+        stats_data = get_report_stats()
+        
+        serializer = self.get_serializer(stats_data)
+        return Response(serializer.data)
+    
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Search report descriptions by keyword (admin only).
+        Uses the blind keyword index; nothing is decrypted.
         
-        # Reports by type
-        reports_by_type = dict(
-            Report.objects.values('incident_type')
-            .annotate(count=Count('id'))
-            .values_list('incident_type', 'count')
+        GET /api/reports/search/?q=fake account
+        
+        A phrase matches as a phrase. Paginated like list, and accepts
+        the same filters.
+        """
+        from apps.core.models import log_admin_action
+        from .search import query_tokens, search_report_ids
+        
+        query = request.query_params.get('q', '')
+        if not query_tokens(query):
+            return Response(
+                {'error': 'q must contain at least one searchable word'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Log the search, not the query text
+        log_admin_action(
+            admin_user=request.user,
+            action='view',
+            resource_type='Report',
+            resource_id='*',
+            details={'search': True}
         )
         
-        # Reports by month (last 12 months)
-        twelve_months_ago = timezone.now() - timedelta(days=365)
-        reports_by_month = {}
-        
-        for i in range(12):
-            month_start = timezone.now() - timedelta(days=30 * i)
-            month_end = timezone.now() - timedelta(days=30 * (i - 1))
-            month_key = month_start.strftime('%Y-%m')
-            
-            count = Report.objects.filter(
-                created_at__gte=month_start,
-                created_at__lt=month_end
-            ).count()
-            
-            reports_by_month[month_key] = count
-        
-        # Redaction rate
-        redacted_count = Report.objects.filter(redaction_applied=True).count()
-        redaction_rate = (redacted_count / total_reports * 100) if total_reports > 0 else 0
-        
-        stats_data = {
-            'total_reports': total_reports,
-            'reports_by_type': reports_by_type,
-            'reports_by_month': reports_by_month,
-            'redaction_rate': round(redaction_rate, 2)
+        queryset = self.filter_queryset(self.get_queryset()).filter(id__in=search_report_ids(query))
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+    
+    @action(detail=False, methods=['get'])
+    def linked(self, request):
+        """
+        Find the reports citing an evidence link (admin only).
+        
+        GET /api/reports/linked/?url=https://example.com/fake.profile
+        
+        The link matches however it is spelled (http or https, www.,
+        tracking parameters). Paginated like list, and accepts the same
+        filters.
+        """
+        from apps.core.models import log_admin_action
+        from .links import canonicalize_url, linked_report_ids
+        
+        url = request.query_params.get('url', '')
+        if canonicalize_url(url) is None:
+            return Response(
+                {'error': 'url must be an http(s) URL'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Log the lookup, not the URL
+        log_admin_action(
+            admin_user=request.user,
+            action='view',
+            resource_type='Report',
+            resource_id='*',
+            details={'linked': True}
+        )
+        
+        queryset = self.filter_queryset(self.get_queryset()).filter(id__in=linked_report_ids(url))
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+    
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """
+        List reports whose descriptions are near-duplicates of this one
+        (admin only), from the similarity buckets; nothing is decrypted.
+        
+        GET /api/reports/{id}/similar/
+        """
+        from .similarity import similar_report_ids
+        
+        report = self.get_object()
+        queryset = self.filter_queryset(self.get_queryset()).filter(id__in=similar_report_ids(report.pk))
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+    
+    @action(detail=False, methods=['get'])
+    def clusters(self, request):
+        """
+        Group recent reports into clusters of near-duplicates (admin only).
+        
+        GET /api/reports/clusters/?days=30&min_size=2
+        
+        Query params:
+            days: Cluster reports created in the last N days (default 30)
+            min_size: Smallest cluster returned (default 2)
+            incident_type, redaction_applied: same filters as list
+        
+        Returns the largest clusters first, at most MAX_CLUSTERS. Each
+        cluster has its member_count and its newest MAX_CLUSTER_MEMBERS
+        reports; 'similar' links to the paginated list of reports similar
+        to the newest one.
+        """
+        from datetime import timedelta
+        from django.utils import timezone
+        from apps.core.models import log_admin_action
+        from .similarity import (
+            CLUSTER_WINDOW_DAYS, MAX_CLUSTER_MEMBERS, MAX_CLUSTER_WINDOW_DAYS, MAX_CLUSTERS,
+            find_clusters
+        )
+        
+        try:
+            days = int(request.query_params.get('days', CLUSTER_WINDOW_DAYS))
+            min_size = int(request.query_params.get('min_size', 2))
+        except ValueError:
+            return Response(
+                {'error': 'days and min_size must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not 1 <= days <= MAX_CLUSTER_WINDOW_DAYS or min_size < 2:
+            return Response(
+                {'error': f'days must be 1-{MAX_CLUSTER_WINDOW_DAYS} and min_size at least 2'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            created_at__gte=timezone.now() - timedelta(days=days)
+        )
+        clusters = find_clusters(queryset, min_size=min_size)
+        
+        log_admin_action(
+            admin_user=request.user,
+            action='view',
+            resource_type='Report',
+            resource_id='*',
+            details={'clusters': len(clusters), 'days': days}
+        )
+        
+        shown = [(len(cluster), cluster[:MAX_CLUSTER_MEMBERS]) for cluster in clusters[:MAX_CLUSTERS]]
+        reports = Report.objects.in_bulk([report_id for _, members in shown for report_id in members])
+        return Response({
+            'count': len(clusters),
+            'clusters': [
+                {
+                    'member_count': member_count,
+                    'similar': reverse(
+                        'reports:report-similar', args=[members[0]], request=request
+                    ),
+                    'reports': self.get_serializer(
+                        [reports[report_id] for report_id in members if report_id in reports],
+                        many=True
+                    ).data,
+                }
+                for member_count, members in shown
+            ],
+        })
+    
+    @action(
+        detail=False,
+        methods=['get'],
+        renderer_classes=[CSVExportRenderer, NDJSONExportRenderer]
+    )
+    def export(self, request):
+        """
+        Stream reports as CSV or NDJSON (admin only).
+        Logged once in the audit trail.
+        
+        GET /api/reports/export/?format=csv|ndjson
+        
+        Query params:
+            include_description: 'true' to add decrypted descriptions
+            incident_type, redaction_applied: same filters as list
+            created_after, created_before: YYYY-MM-DD bounds on created_at
+                (after is inclusive, before is exclusive)
+        """
+        from datetime import datetime, time
+        from django.utils.dateparse import parse_date
+        from django.utils.timezone import make_aware
+        from apps.core.models import log_admin_action
+        
+        export_format = request.accepted_renderer.format
+        include_description = request.query_params.get('include_description', '').lower() in ('1', 'true')
+        queryset = self.filter_queryset(self.get_queryset())
+        
+        bounds = {}
+        # Bounds on created_at itself (not its date) so PostgreSQL can use
+        # indexes and skip monthly partitions outside the range
+        for param, lookup in (('created_after', 'created_at__gte'), ('created_before', 'created_at__lt')):
+            value = request.query_params.get(param)
+            if not value:
+                continue
+            try:
+                day = parse_date(value)
+            except ValueError:
+                day = None
+            if day is None:
+                return Response(
+                    {'error': f'{param} must be a date (YYYY-MM-DD)'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            bounds[param] = value
+            queryset = queryset.filter(**{lookup: make_aware(datetime.combine(day, time.min))})
+        
+        filters = {
+            name: request.query_params[name]
+            for name in self.filterset_fields
+            if name in request.query_params
         }
+        filters.update(bounds)
+        log_admin_action(
+            admin_user=request.user,
+            action='export',
+            resource_type='Report',
+            resource_id='*',
+            details={
+                'format': export_format,
+                'include_description': include_description,
+                'filters': filters,
+            }
+        )
         
-        serializer = self.get_serializer(stats_data)
-        return Response(serializer.data)
+        write = iter_csv if export_format == 'csv' else iter_ndjson
+        return export_response(
+            request,
+            write(queryset, include_description=include_description),
+            export_format,
+            filename=f'reports.{export_format}'
+        )
     
     @action(detail=False, methods=['get'])
     def incident_types(self, request):
@@ -4,14 +4,102 @@ Provides automated responses to common questions.
 In production, this would integrate with an AI service.
 """
 
+import functools
+import hashlib
 import re
-from typing import Dict, List
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+class KeywordMatcher:
+    """
+    Word-level keyword trie, built once from the response tables.
+    
+    Each keyword is split into words and stored as a path in a trie of
+    dicts. A message is tokenized once and the trie is walked from each
+    word, so every keyword is matched on whole words ("hi" does not
+    match "this") and the cost depends on the message length and the
+    longest keyword, not on how many keywords there are.
+    
+    Args:
+        responses: Category -> {'keywords': [...], 'priority': int, ...}
+    """
+    
+    WORD_RE = re.compile(r"[a-z0-9']+")
+    
+    # Marks the end of a keyword in the trie
+    _END = object()
+    
+    def __init__(self, responses: Dict[str, dict]):
+        self.root: dict = {}
+        self.max_words = 0
+        self.priorities = {
+            category: data.get('priority', 0)
+            for category, data in responses.items()
+        }
+        for category, data in responses.items():
+            for keyword in data['keywords']:
+                self.add(keyword, category)
+    
+    def add(self, keyword: str, category: str) -> None:
+        """Add one keyword for a category."""
+        words = self.WORD_RE.findall(keyword.lower())
+        if not words:
+            return
+        node = self.root
+        for word in words:
+            node = node.setdefault(word, {})
+        node.setdefault(self._END, set()).add(category)
+        self.max_words = max(self.max_words, len(words))
+    
+    def find_categories(self, message: str) -> Set[str]:
+        """
+        Find every category with a keyword in the message, in one pass.
+        
+        Args:
+            message: User's message
+        
+        Returns:
+            set: Matched categories
+        """
+        words = self.WORD_RE.findall(message.lower())
+        found = set()
+        for start in range(len(words)):
+            node = self.root
+            for word in words[start:start + self.max_words]:
+                node = node.get(word)
+                if node is None:
+                    break
+                categories = node.get(self._END)
+                if categories:
+                    found.update(categories)
+        return found
+    
+    def best_category(self, message: str) -> Optional[str]:
+        """
+        Get the highest-priority matched category.
+        
+        Returns:
+            str: Category name, or None if nothing matched
+        """
+        found = self.find_categories(message)
+        if not found:
+            return None
+        return max(found, key=lambda category: self.priorities[category])
 
 
 class MockChatbot:
     """
     Simple pattern-matching chatbot for emergency support.
     
+    Keywords are matched on whole words. When a message matches several
+    categories, the one with the highest priority wins, so crisis
+    messages always get the crisis response.
+    
     This is a mock implementation for development. In production, replace with:
     - OpenAI API integration
     - Dialogflow integration
@@ -21,47 +109,63 @@ class MockChatbot:
     # Response patterns
     RESPONSES = {
         'crisis': {
+            'priority': 100,
             'keywords': ['crisis', 'emergency', 'danger', 'help now', 'urgent', 'scared', 'afraid'],
             'response': "If you're in immediate danger, please call 911 or the National Domestic Violence Hotline at 1-800-799-7233 (24/7). They can help you right now."
         },
         'legal': {
+            'priority': 90,
             'keywords': ['legal', 'lawyer', 'attorney', 'court', 'restraining order', 'protection order', 'rights'],
             'response': "For legal assistance, please check our Resources page for legal aid organizations in your area. You can also call the National Domestic Violence Hotline at 1-800-799-7233 for legal referrals."
         },
         'shelter': {
+            'priority': 80,
             'keywords': ['shelter', 'housing', 'place to stay', 'safe place', 'escape', 'leave'],
             'response': "For emergency shelter information, please call the National Domestic Violence Hotline at 1-800-799-7233. They can help you find safe housing options in your area."
         },
         'counseling': {
+            'priority': 70,
             'keywords': ['counseling', 'therapy', 'therapist', 'mental health', 'talk to someone', 'support group'],
             'response': "Mental health support is important. You can find counseling resources on our Resources page, or call the National Domestic Violence Hotline at 1-800-799-7233 for referrals to local counselors."
         },
         'financial': {
+            'priority': 60,
             'keywords': ['money', 'financial', 'funds', 'assistance', 'bills', 'rent'],
             'response': "Financial assistance may be available through local organizations. Check our Resources page for financial aid information, or call 1-800-799-7233 for referrals."
         },
         'safety': {
+            'priority': 50,
             'keywords': ['safety plan', 'safe', 'protect', 'security', 'privacy'],
             'response': "Creating a safety plan is important. Visit our Resources page for safety planning guides, or call the National Domestic Violence Hotline at 1-800-799-7233 to create a personalized safety plan."
         },
         'children': {
+            'priority': 40,
             'keywords': ['children', 'kids', 'child', 'son', 'daughter'],
             'response': "Protecting children is a priority. The National Domestic Violence Hotline (1-800-799-7233) can provide guidance on keeping children safe and accessing resources for families."
         },
         'police': {
+            'priority': 30,
             'keywords': ['police', 'report', 'file report', 'law enforcement'],
             'response': "If you want to report abuse, you can call your local police department or 911 in an emergency. The National Domestic Violence Hotline (1-800-799-7233) can also guide you through the reporting process."
         },
         'greeting': {
+            'priority': 20,
             'keywords': ['hello', 'hi', 'hey', 'greetings'],
             'response': "Hello! I'm here to help you find resources and support. You can ask me about crisis support, legal help, shelters, counseling, or other resources. How can I assist you today?"
         },
         'thanks': {
+            'priority': 10,
             'keywords': ['thank', 'thanks', 'appreciate'],
             'response': "You're welcome. Remember, you're not alone. If you need immediate help, call the National Domestic Violence Hotline at 1-800-799-7233 (24/7)."
         }
     }
     
+    # Sent before anything else when streaming a reply
+    HOTLINE_MESSAGE = (
+        "If you're in immediate danger, call 911 or the National Domestic "
+        "Violence Hotline at 1-800-799-7233 (24/7)."
+    )
+    
     DEFAULT_RESPONSE = (
         "I'm here to help. You can ask me about:\n"
         "• Crisis support and emergency help\n"
@@ -73,6 +177,20 @@ class MockChatbot:
         "For immediate help, call the National Domestic Violence Hotline at 1-800-799-7233 (24/7)."
     )
     
+    @classmethod
+    def get_matcher(cls) -> KeywordMatcher:
+        """
+        Get the keyword matcher for this class's RESPONSES, building it
+        on first use.
+        """
+        # Look in the class's own __dict__ so subclasses that override
+        # RESPONSES get their own matcher
+        matcher = cls.__dict__.get('_matcher')
+        if matcher is None:
+            matcher = KeywordMatcher(cls.RESPONSES)
+            cls._matcher = matcher
+        return matcher
+    
     @classmethod
     def get_response(cls, message: str) -> Dict[str, str]:
         """
@@ -90,20 +208,12 @@ class MockChatbot:
                 'category': 'default'
             }
         
-        # Normalize message
-        message_lower = message.lower().strip()
-        
-        # Check each pattern
-        for category, pattern_data in cls.RESPONSES.items():
-            keywords = pattern_data['keywords']
-            
-            # Check if any keyword matches
-            for keyword in keywords:
-                if keyword in message_lower:
-                    return {
-                        'response': pattern_data['response'],
-                        'category': category
-                    }
+        category = cls.get_matcher().best_category(message)
+        if category:
+            return {
+                'response': cls.RESPONSES[category]['response'],
+                'category': category
+            }
         
         # No match found, return default
         return {
@@ -129,10 +239,102 @@ class MockChatbot:
         ]
 
 
+class ResponseCache:
+    """
+    Bounded, thread-safe LRU cache of chatbot responses.
+    
+    Keys are SHA-256 digests of the normalized message (lowercased words
+    only, which is all the matcher looks at), so message text is never
+    stored, logged or persisted. Messages that differ only in case,
+    spacing or punctuation share an entry.
+    
+    Args:
+        maxsize: Maximum number of cached responses
+    """
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(message: str) -> bytes:
+        """Get the cache key for a message."""
+        normalized = ' '.join(KeywordMatcher.WORD_RE.findall(message.lower()))
+        return hashlib.sha256(normalized.encode('utf-8')).digest()
+    
+    def get_or_compute(self, message: str, compute) -> Dict[str, str]:
+        """
+        Get the cached response for a message, computing it on a miss.
+        
+        Args:
+            message: User's message
+            compute: Called with the message on a miss
+        
+        Returns:
+            dict: Response with message and category
+        """
+        key = self.make_key(message)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(result)
+            self.misses += 1
+        
+        result = compute(message)
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return dict(result)
+    
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters and the current size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+    
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+@functools.lru_cache(maxsize=None)
+def get_response_cache() -> ResponseCache:
+    """
+    Get the process-wide chatbot response cache.
+    
+    Returns:
+        ResponseCache: Sized by settings.CHATBOT_RESPONSE_CACHE_SIZE
+    """
+    return ResponseCache(getattr(settings, 'CHATBOT_RESPONSE_CACHE_SIZE', 1024))
+
+
+@receiver(setting_changed)
+def _reset_response_cache(sender, setting, **kwargs):
+    """Drop the cache when its size setting is overridden."""
+    if setting == 'CHATBOT_RESPONSE_CACHE_SIZE':
+        get_response_cache.cache_clear()
+
+
 # Convenience function for easy import
 def get_chatbot_response(message: str) -> Dict[str, str]:
     """
     Get chatbot response for a message.
+    Repeated messages (suggestion clicks, greetings) are served from
+    the response cache without classifying them again.
     
     Args:
         message: User's message
@@ -140,4 +342,44 @@ def get_chatbot_response(message: str) -> Dict[str, str]:
     Returns:
         dict: Response with message and category
     """
-    return MockChatbot.get_response(message)
+    cache = get_response_cache()
+    if cache.maxsize <= 0:
+        return MockChatbot.get_response(message)
+    return cache.get_or_compute(message, MockChatbot.get_response)
+
+
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+|\n+')
+
+
+def split_response(text: str) -> List[str]:
+    """
+    Split a response into sentence-sized chunks for streaming.
+    
+    Args:
+        text: Response text
+    
+    Returns:
+        list: Non-empty chunks that join back (with spaces) into the text
+    """
+    return [chunk for chunk in _SENTENCE_END_RE.split(text) if chunk.strip()]
+
+
+def get_chatbot_responses(messages: List[str]) -> List[Dict[str, str]]:
+    """
+    Get chatbot responses for several messages in one pass.
+    Messages that normalize to the same text are classified once.
+    
+    Args:
+        messages: User messages
+    
+    Returns:
+        list: One response dict per message, in the same order
+    """
+    results = {}
+    responses = []
+    for message in messages:
+        key = ResponseCache.make_key(message)
+        if key not in results:
+            results[key] = get_chatbot_response(message)
+        responses.append(dict(results[key]))
+    return responses
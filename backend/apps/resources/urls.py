@@ -8,6 +8,8 @@ from .views import (
     HelplineViewSet,
     ResourceViewSet,
     chatbot_message,
+    chatbot_batch,
+    chatbot_stream,
     chatbot_suggestions
 )
 
@@ -20,5 +22,7 @@ router.register(r'resources', ResourceViewSet, basename='resource')
 urlpatterns = [
     path('', include(router.urls)),
     path('chatbot/message/', chatbot_message, name='chatbot-message'),
+    path('chatbot/batch/', chatbot_batch, name='chatbot-batch'),
+    path('chatbot/stream/', chatbot_stream, name='chatbot-stream'),
     path('chatbot/suggestions/', chatbot_suggestions, name='chatbot-suggestions'),
 ]
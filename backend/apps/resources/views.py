@@ -2,10 +2,15 @@
 Views for resources and helplines API.
 """
 
+import asyncio
+import json
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
 from rest_framework import viewsets, filters, status
 from rest_framework.permissions import AllowAny
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
+from rest_framework.throttling import AnonRateThrottle
 from django_filters.rest_framework import DjangoFilterBackend
 from apps.core.permissions import IsAdminUser
 from .models import Helpline, Resource
@@ -16,7 +21,7 @@ from .serializers import (
     ResourceDetailSerializer,
     ResourceCreateSerializer
 )
-from .chatbot import get_chatbot_response, MockChatbot
+from .chatbot import get_chatbot_response, get_chatbot_responses, split_response, MockChatbot
 
 
 class HelplineViewSet(viewsets.ModelViewSet):
@@ -199,6 +204,153 @@ def chatbot_message(request):
     })
 
 
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def chatbot_batch(request):
+    """
+    Process several chatbot messages in one request.
+    POST /api/chatbot/batch/
+    
+    Counts once against the anonymous throttle, so pre-rendering
+    suggestion answers or replaying queued messages doesn't exhaust it.
+    
+    Request body:
+    {
+        "messages": ["hello", "I need a lawyer"]
+    }
+    
+    Response:
+    {
+        "results": [
+            {"response": "...", "category": "greeting"},
+            {"response": "...", "category": "legal"}
+        ],
+        "timestamp": "2024-01-15T10:30:00Z"
+    }
+    """
+    from django.conf import settings
+    from django.utils import timezone
+    
+    messages = request.data.get('messages')
+    max_messages = settings.CHATBOT_BATCH_MAX_MESSAGES
+    
+    if not isinstance(messages, list) or not messages:
+        return Response(
+            {'error': 'messages must be a non-empty list'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if len(messages) > max_messages:
+        return Response(
+            {'error': f'At most {max_messages} messages per request'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    for index, message in enumerate(messages):
+        if not isinstance(message, str) or not message.strip():
+            return Response(
+                {'error': 'Each message must be a non-empty string', 'index': index},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    
+    results = get_chatbot_responses(messages)
+    
+    return Response({
+        'results': [
+            {'response': result['response'], 'category': result['category']}
+            for result in results
+        ],
+        'timestamp': timezone.now().isoformat()
+    })
+
+
+def _sse_event(event, data):
+    """Format one Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def chatbot_stream(request):
+    """
+    Stream a chatbot reply as Server-Sent Events.
+    POST /api/chatbot/stream/
+    
+    Async view: under the ASGI server an open stream does not hold a
+    worker. The hotline message is flushed as the first event, before
+    the message is classified.
+    
+    Request body:
+    {
+        "message": "I need help"
+    }
+    
+    Response (text/event-stream):
+        event: hotline
+        data: {"text": "If you're in immediate danger, ..."}
+        
+        event: message
+        data: {"delta": "..."}
+        
+        event: done
+        data: {"category": "crisis", "timestamp": "2024-01-15T10:30:00Z"}
+    """
+    from django.utils import timezone
+    
+    if request.method != 'POST':
+        return JsonResponse(
+            {'error': 'Method not allowed'},
+            status=status.HTTP_405_METHOD_NOT_ALLOWED
+        )
+    
+    # Same anonymous throttle as the DRF endpoints; it reads the
+    # session-backed user, so run it in a thread
+    throttle = AnonRateThrottle()
+    if not await sync_to_async(throttle.allow_request)(request, None):
+        response = JsonResponse(
+            {'error': 'Request was throttled'},
+            status=status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        wait = throttle.wait()
+        if wait is not None:
+            response['Retry-After'] = str(int(wait))
+        return response
+    
+    try:
+        message = json.loads(request.body or b'{}').get('message', '')
+    except (ValueError, AttributeError):
+        message = None
+    
+    if not isinstance(message, str) or not message.strip():
+        return JsonResponse(
+            {'error': 'Message is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    async def events():
+        yield _sse_event('hotline', {'text': MockChatbot.HOTLINE_MESSAGE})
+        
+        result = get_chatbot_response(message)
+        for chunk in split_response(result['response']):
+            # Hand control back so each chunk is sent as it is produced
+            await asyncio.sleep(0)
+            yield _sse_event('message', {'delta': chunk})
+        
+        yield _sse_event('done', {
+            'category': result['category'],
+            'timestamp': timezone.now().isoformat()
+        })
+    
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop reverse proxies from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+# Anonymous JSON API like the DRF views; csrf_exempt() would wrap the
+# coroutine in a sync function on Django 4.2, so set the flag directly
+chatbot_stream.csrf_exempt = True
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def chatbot_suggestions(request):
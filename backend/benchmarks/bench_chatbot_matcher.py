@@ -0,0 +1,79 @@
+"""
+Microbenchmark for chatbot keyword matching.
+
+Compares the old nested loop (substring search for every keyword of
+every category) with the word-level KeywordMatcher as the keyword tables
+grow from the shipped few dozen to several thousand entries.
+
+Usage:
+    python benchmarks/bench_chatbot_matcher.py [--iterations 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apps.resources.chatbot import KeywordMatcher, MockChatbot
+
+MESSAGES = [
+    'hello, I have a question about this website',
+    'I need to find a lawyer who can help me get a restraining order',
+    'he keeps following me and I am scared to go outside alone at night',
+    'can you tell me where I can find counseling and a support group near me',
+]
+
+
+def legacy_best_category(responses, message):
+    """Match the way get_response did before the matcher: first hit wins."""
+    message_lower = message.lower().strip()
+    for category, data in responses.items():
+        for keyword in data['keywords']:
+            if keyword in message_lower:
+                return category
+    return None
+
+
+def grow_responses(extra_keywords, seed=1):
+    """Copy RESPONSES and add made-up keywords spread over the categories."""
+    rng = random.Random(seed)
+    responses = {
+        category: dict(data, keywords=list(data['keywords']))
+        for category, data in MockChatbot.RESPONSES.items()
+    }
+    categories = list(responses)
+    for _ in range(extra_keywords):
+        keyword = ''.join(rng.choice('bcdfghjklmnpqrstvwxz') for _ in range(rng.randint(6, 10)))
+        responses[rng.choice(categories)]['keywords'].append(keyword)
+    return responses
+
+
+def time_per_call(func, iterations):
+    """Return the mean wall time per message in microseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for message in MESSAGES:
+            func(message)
+    return (time.perf_counter() - start) / (iterations * len(MESSAGES)) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+    
+    print(f"{len(MESSAGES)} messages x {args.iterations} iterations")
+    print(f"  {'keywords':>9} {'legacy us':>10} {'matcher us':>11}")
+    for extra in (0, 100, 1000, 5000):
+        responses = grow_responses(extra)
+        total = sum(len(data['keywords']) for data in responses.values())
+        matcher = KeywordMatcher(responses)
+        legacy = time_per_call(lambda m: legacy_best_category(responses, m), args.iterations)
+        compiled = time_per_call(matcher.best_category, args.iterations)
+        print(f"  {total:>9} {legacy:10.1f} {compiled:11.1f}")
+
+
+if __name__ == '__main__':
+    main()
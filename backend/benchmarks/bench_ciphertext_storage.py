@@ -0,0 +1,121 @@
+"""
+Storage and throughput benchmark for report ciphertext formats.
+
+Compares the text Fernet tokens previously stored in reports.description
+with the compact binary envelope format (AES-GCM and ChaCha20-Poly1305,
+with and without zlib). Reports average bytes per row and encrypt/decrypt
+throughput in MB/s of plaintext.
+
+Runs without a database: data keys are generated in memory.
+
+Usage:
+    python benchmarks/bench_ciphertext_storage.py [--rows 2000] [--seed 1]
+"""
+import argparse
+import base64
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+
+import django
+
+django.setup()
+
+from cryptography.fernet import Fernet
+
+from apps.core.envelope import ENVELOPE_PREFIX, decode_binary, encode_binary
+
+WORDS = (
+    'he keeps sending messages from new accounts after I blocked him and '
+    'posted my photos without consent threatening to share more unless I '
+    'reply he also created a fake profile using my name and pictures and '
+    'contacted my friends and family asking for money and spreading lies '
+    'about me online every day since last month I am scared to go outside'
+).split()
+
+
+def make_descriptions(rows, seed):
+    """Generate report-like descriptions between 200 and 5000 characters."""
+    rng = random.Random(seed)
+    descriptions = []
+    for _ in range(rows):
+        target = rng.randint(200, 5000)
+        words = []
+        length = 0
+        while length < target:
+            word = rng.choice(WORDS)
+            words.append(word)
+            length += len(word) + 1
+        descriptions.append(' '.join(words)[:target])
+    return descriptions
+
+
+def run(label, encrypt, decrypt, plaintexts):
+    """Encrypt and decrypt every plaintext; return a result row."""
+    total_plain = sum(len(p) for p in plaintexts)
+    
+    start = time.perf_counter()
+    tokens = [encrypt(p) for p in plaintexts]
+    encrypt_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for token, plaintext in zip(tokens, plaintexts):
+        assert decrypt(token) == plaintext
+    decrypt_seconds = time.perf_counter() - start
+    
+    return {
+        'format': label,
+        'bytes_per_row': sum(len(t) for t in tokens) / len(tokens),
+        'encrypt_mb_s': total_plain / encrypt_seconds / 1_000_000,
+        'decrypt_mb_s': total_plain / decrypt_seconds / 1_000_000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    
+    plaintexts = [d.encode('utf-8') for d in make_descriptions(args.rows, args.seed)]
+    raw_key = os.urandom(32)
+    fernet = Fernet(base64.urlsafe_b64encode(raw_key))
+    prefix = f'{ENVELOPE_PREFIX}1:'.encode()
+    
+    results = [
+        run('fernet text (legacy)', fernet.encrypt, fernet.decrypt, plaintexts),
+        run(
+            'envelope text (ek1)',
+            lambda p: prefix + fernet.encrypt(p),
+            lambda t: fernet.decrypt(t[len(prefix):]),
+            plaintexts
+        ),
+    ]
+    for algorithm in ('aes-gcm', 'chacha20-poly1305'):
+        for compress in (False, True):
+            label = f"binary {algorithm}{' + zlib' if compress else ''}"
+            results.append(run(
+                label,
+                lambda p, a=algorithm, c=compress: encode_binary(p, 1, raw_key, a, c),
+                lambda t: decode_binary(t, raw_key),
+                plaintexts
+            ))
+    
+    plain_per_row = sum(len(p) for p in plaintexts) / len(plaintexts)
+    baseline = results[0]['bytes_per_row']
+    print(f"{args.rows} rows, mean plaintext {plain_per_row:.0f} bytes")
+    print(f"  {'format':<32} {'bytes/row':>10} {'vs legacy':>10} {'enc MB/s':>9} {'dec MB/s':>9}")
+    for row in results:
+        print(
+            f"  {row['format']:<32} {row['bytes_per_row']:10.0f} "
+            f"{row['bytes_per_row'] / baseline:9.0%} "
+            f"{row['encrypt_mb_s']:9.1f} {row['decrypt_mb_s']:9.1f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
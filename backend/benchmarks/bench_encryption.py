@@ -0,0 +1,76 @@
+"""
+Microbenchmark for field encryption.
+
+Compares the per-call cost of the old approach (validate the key and build
+a new Fernet on every call) with the cached process-wide key ring.
+
+Usage:
+    python benchmarks/bench_encryption.py [--iterations 2000] [--size 5000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+
+import django
+
+django.setup()
+
+from cryptography.fernet import Fernet
+from django.conf import settings
+
+from apps.core.utils import decrypt_field, encrypt_field
+
+
+def legacy_encrypt(value):
+    """Encrypt the way encrypt_field did before the key ring."""
+    key = settings.ENCRYPTION_KEY.encode()
+    Fernet(key)  # validation-only instance
+    return Fernet(key).encrypt(value.encode('utf-8')).decode('utf-8')
+
+
+def legacy_decrypt(token):
+    """Decrypt the way decrypt_field did before the key ring."""
+    key = settings.ENCRYPTION_KEY.encode()
+    Fernet(key)  # validation-only instance
+    return Fernet(key).decrypt(token.encode('utf-8')).decode('utf-8')
+
+
+def time_per_call(func, arg, iterations):
+    """Return the mean wall time per call in microseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(arg)
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--size', type=int, default=5000, help='Description length in characters')
+    args = parser.parse_args()
+    
+    description = ('Someone keeps messaging me from new accounts. ' * 200)[:args.size]
+    token = encrypt_field(description)
+    
+    # Warm up both paths
+    legacy_decrypt(legacy_encrypt(description))
+    decrypt_field(encrypt_field(description))
+    
+    rows = [
+        ('encrypt (legacy)', time_per_call(legacy_encrypt, description, args.iterations)),
+        ('encrypt (key ring)', time_per_call(encrypt_field, description, args.iterations)),
+        ('decrypt (legacy)', time_per_call(legacy_decrypt, token, args.iterations)),
+        ('decrypt (key ring)', time_per_call(decrypt_field, token, args.iterations)),
+    ]
+    
+    print(f"{args.iterations} iterations, {args.size}-character description")
+    for label, micros in rows:
+        print(f"  {label:<20} {micros:8.1f} us/call")
+
+
+if __name__ == '__main__':
+    main()
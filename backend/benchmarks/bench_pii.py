@@ -0,0 +1,271 @@
+"""
+Benchmark and accuracy check for PII detection and redaction.
+
+Compares the single-pass engine in apps.core.pii with the per-pattern
+implementation it replaced in apps.reports.utils:
+
+  * throughput of process_report_text and detect_pii, in texts per
+    second and MB per second, over synthetic report descriptions
+  * per-type false positives and false negatives on a labeled corpus
+    (benchmarks/pii_corpus.json plus the synthetic texts, whose PII is
+    known because the generator inserted it)
+
+Results are written as JSON so runs can be diffed between commits.
+
+Usage:
+    python benchmarks/bench_pii.py [--texts 2000] [--seed 1] [--output results.json]
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apps.core.pii import pii_engine
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pii_corpus.json')
+
+# Patterns used by apps.reports.utils before the single-pass engine
+LEGACY_PII_PATTERNS = {
+    'email': re.compile(
+        r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+        re.IGNORECASE
+    ),
+    'phone': re.compile(
+        r'\b(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b'
+    ),
+    'ssn': re.compile(
+        r'\b\d{3}-\d{2}-\d{4}\b'
+    ),
+    'credit_card': re.compile(
+        r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b'
+    ),
+    'full_name': re.compile(
+        r'\b(my name is|i am|i\'m|called)\s+([A-Z][a-z]+\s+[A-Z][a-z]+)\b',
+        re.IGNORECASE
+    ),
+}
+
+
+def legacy_detect_pii(text):
+    """Detect PII the way apps.reports.utils did: one search per pattern."""
+    if not text:
+        return []
+    return [pii_type for pii_type, pattern in LEGACY_PII_PATTERNS.items() if pattern.search(text)]
+
+
+def legacy_redact_pii(text):
+    """Redact PII the way apps.reports.utils did: one sub per pattern."""
+    if not text:
+        return text
+    redacted = text
+    for pii_type, pattern in LEGACY_PII_PATTERNS.items():
+        if pii_type == 'full_name':
+            redacted = pattern.sub(r'\1 [NAME_REDACTED]', redacted)
+        else:
+            redacted = pattern.sub(f'[{pii_type.upper()}_REDACTED]', redacted)
+    return redacted
+
+
+def legacy_process_report_text(text):
+    """Detect, then redact in a second set of passes, as before."""
+    if not text:
+        return text, False
+    if legacy_detect_pii(text):
+        return legacy_redact_pii(text), True
+    return text, False
+
+
+def engine_process_report_text(text):
+    """process_report_text without its logging call."""
+    if not text:
+        return text, False
+    redacted, spans = pii_engine.process(text)
+    return (redacted, True) if spans else (text, False)
+
+
+IMPLEMENTATIONS = {
+    'legacy': {
+        'process_report_text': legacy_process_report_text,
+        'detect_pii': legacy_detect_pii,
+    },
+    'engine': {
+        'process_report_text': engine_process_report_text,
+        'detect_pii': pii_engine.detect,
+    },
+}
+
+FILLER = (
+    'he keeps sending messages from new accounts after I blocked him and '
+    'posted my photos without consent threatening to share more unless I '
+    'reply he also created a fake profile using my pictures and contacted '
+    'my friends and family asking for money and spreading lies about me '
+    'online every day since last month I am scared to go outside'
+).split()
+
+FIRST_NAMES = ['Maria', 'Ana', 'Rosa', 'Lisa', 'Carla', 'Jessica', 'Grace']
+LAST_NAMES = ['Santos', 'Reyes', 'Cruz', 'Wong', 'Dizon', 'Lim', 'Garcia']
+
+
+def _email(rng):
+    user = rng.choice(['jane', 'maria.s', 'help_me', 'r.cruz+x'])
+    domain = rng.choice(['example.com', 'mail.co.uk', 'company.com.ph'])
+    return f'{user}{rng.randint(1, 99)}@{domain}'
+
+
+def _phone(rng):
+    digits = [rng.randint(0, 9) for _ in range(10)]
+    a, b, c = ''.join(map(str, digits[:3])), ''.join(map(str, digits[3:6])), ''.join(map(str, digits[6:]))
+    return rng.choice([f'{a}-{b}-{c}', f'({a}) {b}-{c}', f'+1 {a} {b} {c}', f'{a}.{b}.{c}'])
+
+
+def _ssn(rng):
+    return f'{rng.randint(100, 899)}-{rng.randint(10, 99)}-{rng.randint(1000, 9999)}'
+
+
+def _card(rng):
+    groups = [f'{rng.randint(0, 9999):04d}' for _ in range(4)]
+    return rng.choice([' ', '-', '']).join(groups)
+
+
+def _full_name(rng):
+    trigger = rng.choice(['My name is', "I'm", 'i am', 'called', 'my name is', 'MY NAME IS'])
+    # Names are not always capitalized: 'maria santos', 'MARIA SANTOS', 'maria Santos'
+    first, last = (
+        rng.choice([str.title, str.lower, str.upper])(name)
+        for name in (rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES))
+    )
+    return f'{trigger} {first} {last}'
+
+
+PII_GENERATORS = {
+    'email': _email,
+    'phone': _phone,
+    'ssn': _ssn,
+    'credit_card': _card,
+    'full_name': _full_name,
+}
+
+
+def make_texts(count, seed, pii_rate=0.3):
+    """
+    Generate report-like descriptions, some with inserted PII.
+    
+    Returns:
+        list: {'text': str, 'pii': [types]} dicts
+    """
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        target = rng.randint(200, 2000)
+        words = []
+        length = 0
+        while length < target:
+            word = rng.choice(FILLER)
+            words.append(word)
+            length += len(word) + 1
+        
+        pii = []
+        if rng.random() < pii_rate:
+            for pii_type in rng.sample(sorted(PII_GENERATORS), rng.randint(1, 2)):
+                words.insert(rng.randint(0, len(words)), PII_GENERATORS[pii_type](rng))
+                pii.append(pii_type)
+        texts.append({'text': ' '.join(words), 'pii': sorted(pii)})
+    return texts
+
+
+def measure_throughput(func, texts, repeats=3):
+    """Return the best texts/s and MB/s over several runs."""
+    total_bytes = sum(len(t.encode('utf-8')) for t in texts)
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return {
+        'texts_per_s': round(len(texts) / best, 1),
+        'mb_per_s': round(total_bytes / best / 1_000_000, 3),
+    }
+
+
+def measure_accuracy(detect, samples):
+    """
+    Count per-type true positives, false positives and false negatives.
+    
+    Returns:
+        dict: Counts and precision/recall per type, plus totals
+    """
+    types = sorted({t for s in samples for t in s['pii']} | set(PII_GENERATORS) | {'address'})
+    counts = {t: {'tp': 0, 'fp': 0, 'fn': 0} for t in types}
+    for sample in samples:
+        expected = set(sample['pii'])
+        found = set(detect(sample['text']))
+        for pii_type in found | expected:
+            if pii_type not in counts:
+                counts[pii_type] = {'tp': 0, 'fp': 0, 'fn': 0}
+            if pii_type in found and pii_type in expected:
+                counts[pii_type]['tp'] += 1
+            elif pii_type in found:
+                counts[pii_type]['fp'] += 1
+            else:
+                counts[pii_type]['fn'] += 1
+    
+    totals = {'tp': 0, 'fp': 0, 'fn': 0}
+    for row in counts.values():
+        for key in totals:
+            totals[key] += row[key]
+    counts['total'] = totals
+    for row in counts.values():
+        found = row['tp'] + row['fp']
+        expected = row['tp'] + row['fn']
+        row['precision'] = round(row['tp'] / found, 3) if found else None
+        row['recall'] = round(row['tp'] / expected, 3) if expected else None
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--texts', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='Write JSON here instead of stdout')
+    args = parser.parse_args()
+    
+    synthetic = make_texts(args.texts, args.seed)
+    with open(CORPUS_PATH, encoding='utf-8') as corpus_file:
+        corpus = json.load(corpus_file)
+    texts = [s['text'] for s in synthetic]
+    
+    results = {
+        'config': {
+            'texts': args.texts,
+            'seed': args.seed,
+            'mean_chars': round(sum(len(t) for t in texts) / len(texts)),
+            'corpus_size': len(corpus),
+        },
+        'throughput': {},
+        'accuracy': {},
+    }
+    for name, funcs in IMPLEMENTATIONS.items():
+        results['throughput'][name] = {
+            op: measure_throughput(func, texts) for op, func in funcs.items()
+        }
+        results['accuracy'][name] = {
+            'corpus': measure_accuracy(funcs['detect_pii'], corpus),
+            'synthetic': measure_accuracy(funcs['detect_pii'], synthetic),
+        }
+    
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            output_file.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
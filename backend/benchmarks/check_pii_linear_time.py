@@ -0,0 +1,70 @@
+"""
+Worst-case input check for the PII engine.
+
+Runs the engine over adversarial report descriptions at 1,250 and 5,000
+characters (the maximum description length) and checks that scan time
+grows linearly. A 4x longer input should take about 4x as long; a
+backtracking blow-up would take about 16x. Exits non-zero on failure so
+it can run in CI.
+
+Usage:
+    python benchmarks/check_pii_linear_time.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apps.core.pii import pii_engine
+
+SMALL = 1250
+LARGE = 5000
+
+# Allowed LARGE/SMALL time ratio (4 is linear, 16 is quadratic)
+MAX_RATIO = 8
+
+# Inputs aimed at each pattern's repetitions
+ADVERSARIAL_INPUTS = {
+    'dotted words (email local part)': lambda n: 'a.' * (n // 2),
+    'domain labels without a TLD': lambda n: 'x@' + 'a.' * (n // 2 - 1),
+    'repeated at-signs': lambda n: 'a@' * (n // 2),
+    'letters only': lambda n: 'a' * n,
+    'digits only': lambda n: '1' * n,
+    'digit groups': lambda n: '1234 ' * (n // 5),
+    'name trigger then spaces': lambda n: 'i am' + ' ' * (n - 4),
+    'name trigger then one long word': lambda n: 'my name is A' + 'a' * (n - 12),
+    'house numbers without street': lambda n: '1 ' * (n // 2),
+    'plus signs and digits': lambda n: '+1 ' * (n // 3),
+}
+
+
+def best_time(text, repeats=7):
+    """Return the best of several scan times, in milliseconds."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        pii_engine.process(text)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    failures = 0
+    for label, make in ADVERSARIAL_INPUTS.items():
+        small = best_time(make(SMALL))
+        large = best_time(make(LARGE))
+        ratio = large / small if small else 0
+        status = 'ok' if ratio <= MAX_RATIO else 'FAIL'
+        if status == 'FAIL':
+            failures += 1
+        print(f"  {status:<4} {label:<34} {small:7.2f} ms -> {large:7.2f} ms  (x{ratio:.1f})")
+    
+    if failures:
+        print(f"{failures} inputs grew faster than linear")
+        sys.exit(1)
+    print("All adversarial inputs scanned in linear time")
+
+
+if __name__ == '__main__':
+    main()
@@ -130,6 +130,7 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',
+        'partner_intake': os.environ.get('PARTNER_INTAKE_RATE', '120/minute'),
     }
 }
 
@@ -162,24 +163,89 @@ CORS_ALLOW_CREDENTIALS = False  # No cookies for anonymous users
 # IMPORTANT: Must be set in production environment variables
 ENCRYPTION_KEY = os.environ.get('ENCRYPTION_KEY', None)
 
-# Generate a key for development if not set
+# Derive a key for development if not set. It comes from SECRET_KEY, so it
+# survives restarts and autoreload and every process of a checkout shares it.
+ENCRYPTION_KEY_DERIVED = False
 if not ENCRYPTION_KEY and os.environ.get('DJANGO_SETTINGS_MODULE', '').endswith('development'):
-    from cryptography.fernet import Fernet
-    ENCRYPTION_KEY = Fernet.generate_key().decode()
-    print(f"⚠️  WARNING: Using auto-generated encryption key for development")
+    import base64
+    import hashlib
+    ENCRYPTION_KEY = base64.urlsafe_b64encode(
+        hashlib.sha256(f'shieldher-development-encryption-key:{SECRET_KEY}'.encode()).digest()
+    ).decode()
+    ENCRYPTION_KEY_DERIVED = True
+    print(f"⚠️  WARNING: Using an encryption key derived from SECRET_KEY for development")
     print(f"   Set ENCRYPTION_KEY environment variable for production!")
 
+# Retired encryption keys, still accepted for decryption after a rotation.
+# Comma-separated, newest first. Move the old ENCRYPTION_KEY here when rotating.
+ENCRYPTION_KEY_FALLBACKS = [
+    key for key in os.environ.get('ENCRYPTION_KEY_FALLBACKS', '').split(',') if key
+]
+
+# Key for the blind keyword index of report descriptions (apps.reports.search)
+# and the evidence link index (apps.reports.links). Keep it separate from
+# ENCRYPTION_KEY; derived from SECRET_KEY when unset. After changing it, run:
+# python manage.py rebuild_report_keywords && python manage.py rebuild_report_links
+SEARCH_INDEX_KEY = os.environ.get('SEARCH_INDEX_KEY', None)
+
+# AEAD used for binary ciphertexts: 'aes-gcm' or 'chacha20-poly1305'
+ENCRYPTION_AEAD = os.environ.get('ENCRYPTION_AEAD', 'aes-gcm')
+
+# Worker pool used for bulk decryption (admin lists, exports): 'thread' or 'process'
+DECRYPTION_POOL = os.environ.get('DECRYPTION_POOL', 'thread')
+DECRYPTION_MAX_WORKERS = int(os.environ.get('DECRYPTION_MAX_WORKERS', min(4, os.cpu_count() or 1)))
+
 # Security settings
 SECURE_BROWSER_XSS_FILTER = True
 X_FRAME_OPTIONS = 'DENY'
 SECURE_CONTENT_TYPE_NOSNIFF = True
 
-# Encryption key for sensitive fields
-ENCRYPTION_KEY = os.environ.get('ENCRYPTION_KEY', 'change-this-to-a-32-byte-fernet-key')
-
 # Rate limiting
 RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'True') == 'True'
 
+# Chatbot responses cached per process, keyed on a hash of the normalized message
+CHATBOT_RESPONSE_CACHE_SIZE = int(os.environ.get('CHATBOT_RESPONSE_CACHE_SIZE', 1024))
+
+# Cache shared by every process (web workers and the report queue worker),
+# so dashboard stats invalidation, the stats recompute lock and throttle
+# counts are seen by all of them. migrate creates the table (apps.core.apps).
+# Set REDIS_URL to use Redis instead (requires: pip install redis).
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
+# Seconds dashboard stats stay cached if no save/delete invalidates them first
+STATS_CACHE_TTL = int(os.environ.get('STATS_CACHE_TTL', 60))
+
+# Maximum messages accepted by POST /api/chatbot/batch/
+CHATBOT_BATCH_MAX_MESSAGES = int(os.environ.get('CHATBOT_BATCH_MAX_MESSAGES', 50))
+
+# 'sync' stores reports within the request; 'async' acknowledges at once and
+# leaves redaction and storage to: python manage.py process_report_queue
+REPORT_PROCESSING = os.environ.get('REPORT_PROCESSING', 'sync')
+
+# Maximum reports accepted per call by POST /api/reports/bulk/ (partner API keys)
+PARTNER_INTAKE_MAX_REPORTS = int(os.environ.get('PARTNER_INTAKE_MAX_REPORTS', 250))
+
+# Audit log entries are buffered and written in batches (apps.core.audit)
+AUDIT_BUFFER_SIZE = int(os.environ.get('AUDIT_BUFFER_SIZE', 50))
+AUDIT_FLUSH_INTERVAL = float(os.environ.get('AUDIT_FLUSH_INTERVAL', 2.0))
+# Actions whose entries are written before the response is sent
+AUDIT_DURABLE_ACTIONS = ['export', 'delete']
+
 # Logging configuration
 LOGGING = {
     'version': 1,
@@ -4,5 +4,5 @@ set -e
 echo "Running database migrations..."
 python manage.py migrate --noinput
 
-echo "Starting Gunicorn server..."
-exec gunicorn config.wsgi:application --bind 0.0.0.0:8000 --workers 2
+echo "Starting Gunicorn server (ASGI, Uvicorn workers)..."
+exec gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:8000 --workers 2